@@ -0,0 +1,289 @@
+"""Benchmark each generation stage over a sweep of portfolio sizes.
+
+Every (scale, stage) measurement runs in a fresh process that loads the
+stage's inputs from a pickle prepared beforehand, so peak RSS reflects that
+stage alone and not whatever ran before it. Results are written as JSON and
+can be compared against a stored baseline to flag regressions::
+
+    python benchmarks/bench_generators.py --scales 100 1000 --output bench.json
+    python benchmarks/bench_generators.py --scales 100 1000 --save-baseline
+    python benchmarks/bench_generators.py --scales 100 1000 --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+DEFAULT_SCALES = [100, 1000]
+SEED = 42
+
+# stage -> (input tables, call)
+STAGES = {
+    "generate_units": (
+        ["properties"],
+        lambda m, t, rng: m.generate_units(t["properties"], rng),
+    ),
+    "generate_tenants": (
+        ["properties", "units"],
+        lambda m, t, rng: m.generate_tenants(t["properties"], t["units"], rng, allow_empty=True),
+    ),
+    "generate_leases": (
+        ["properties", "tenants", "units"],
+        lambda m, t, rng: m.generate_leases(t["properties"], t["tenants"], t["units"], rng),
+    ),
+    "generate_lease_pymnt_sched": (
+        ["leases"],
+        lambda m, t, rng: m.generate_lease_pymnt_sched(t["leases"], months_out=24, rng=rng),
+    ),
+    "generate_cust_invoices": (
+        ["payment_schedule", "leases", "tenants"],
+        lambda m, t, rng: m.generate_cust_invoices(t["payment_schedule"], t["leases"], t["tenants"], rng),
+    ),
+    "generate_vendor_invoices": (
+        ["vendors", "properties", "leases"],
+        lambda m, t, rng: m.generate_vendor_invoices(
+            t["vendors"], t["properties"], t["leases"], m.get_coa(), min_invoices=50, max_invoices=300, rng=rng
+        ),
+    ),
+    "generate_checkreg": (
+        ["vend_invoices"],
+        lambda m, t, rng: m.generate_checkreg(t["vend_invoices"], rng),
+    ),
+    "generate_receipts": (
+        ["cust_invoices"],
+        lambda m, t, rng: m.generate_receipts(t["cust_invoices"], rng),
+    ),
+    "generate_gltran": (
+        ["cust_invoices", "vend_invoices", "receipts", "checkreg"],
+        lambda m, t, rng: m.generate_gltran(
+            t["cust_invoices"], t["vend_invoices"], t["receipts"], t["checkreg"], m.get_coa(), rng
+        )["gltran"],
+    ),
+}
+
+
+OUTPUT_TABLES = {
+    "generate_units": "units",
+    "generate_tenants": "tenants",
+    "generate_leases": "leases",
+    "generate_lease_pymnt_sched": "payment_schedule",
+    "generate_cust_invoices": "cust_invoices",
+    "generate_vendor_invoices": "vend_invoices",
+    "generate_checkreg": "checkreg",
+    "generate_receipts": "receipts",
+    "generate_gltran": "gltran",
+}
+
+
+def _load_generators():
+    os.chdir(ROOT_DIR)
+    sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+    import create_synthetic_sample_data
+
+    return create_synthetic_sample_data
+
+
+def _peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def prepare_inputs(scale, path):
+    """Generate every stage's inputs for ``scale`` properties and pickle them to ``path``."""
+
+    m = _load_generators()
+    rng = np.random.default_rng(SEED)
+    t = {"properties": m.load_portfolio(scale, rng)}
+    t["vendors"] = m.generate_vendors(m.generate_user(rng=rng), num_vendors=60, rng=rng)
+    for stage in ["generate_units", "generate_tenants", "generate_leases", "generate_lease_pymnt_sched",
+                  "generate_cust_invoices", "generate_vendor_invoices", "generate_checkreg", "generate_receipts"]:
+        name = OUTPUT_TABLES[stage]
+        t[name] = STAGES[stage][1](m, t, rng)
+    t["vend_invoices"] = m.apply_payment_dates(t["vend_invoices"], t["checkreg"], "check_date")
+    t["cust_invoices"] = m.apply_payment_dates(t["cust_invoices"], t["receipts"], "receipt_date")
+    with open(path, "wb") as f:
+        pickle.dump(t, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def run_stage(stage, scale, inputs_path, repeat):
+    """Time ``stage`` on the pickled inputs; runs in its own process."""
+
+    m = _load_generators()
+    m.get_coa()
+    names, call = STAGES[stage]
+    with open(inputs_path, "rb") as f:
+        tables = pickle.load(f)
+    tables = {name: tables[name] for name in names}
+    rows_in = sum(len(df) for df in tables.values())
+    rss_before = _peak_rss_mb()
+
+    timings = []
+    for i in range(repeat):
+        rng = np.random.default_rng(SEED + i)
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        out = call(m, tables, rng)
+        timings.append((time.perf_counter() - start, time.process_time() - cpu_start))
+        rows_out = len(out)
+        del out
+
+    wall, cpu = min(timings)
+    peak = _peak_rss_mb()
+    return {
+        "stage": stage,
+        "scale": scale,
+        "rows_in": rows_in,
+        "rows_out": rows_out,
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "rows_per_s": round(rows_out / wall, 1) if wall > 0 else None,
+        "peak_rss_mb": round(peak, 1),
+        "stage_rss_mb": round(peak - rss_before, 1),
+    }
+
+
+def _in_fresh_process(fn, *args):
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+        return executor.submit(fn, *args).result()
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scales, stages, repeat=1):
+    """Run every stage for every scale and return the results document."""
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # Faker pools are filled while preparing inputs and reloaded from disk
+        # by the stage processes, so pool generation is not timed as a stage
+        os.environ.setdefault("FAKER_POOL_CACHE_DIR", os.path.join(tmp, "faker"))
+        for scale in scales:
+            inputs_path = os.path.join(tmp, f"inputs-{scale}.pkl")
+            _in_fresh_process(prepare_inputs, scale, inputs_path)
+            for stage in stages:
+                result = _in_fresh_process(run_stage, stage, scale, inputs_path, repeat)
+                results.append(result)
+                print(
+                    f"{stage:28} scale={scale:<7} rows={result['rows_out']:<9} "
+                    f"{result['wall_s']:>8.3f}s {result['rows_per_s'] or 0:>12,.0f} rows/s "
+                    f"peak={result['peak_rss_mb']:>7.1f}MB stage={result['stage_rss_mb']:>7.1f}MB"
+                )
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, max_slowdown=1.25, max_memory_growth=1.25):
+    """Return regressions of ``results`` against ``baseline``.
+
+    A stage regresses when its wall time or its own RSS growth exceeds the
+    baseline for the same scale by more than the given factors. Stages or
+    scales missing from the baseline are ignored.
+    """
+
+    reference = {(r["stage"], r["scale"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results["results"]:
+        base = reference.get((result["stage"], result["scale"]))
+        if base is None:
+            continue
+        checks = [
+            ("wall_s", max_slowdown),
+            ("stage_rss_mb", max_memory_growth),
+        ]
+        for metric, limit in checks:
+            # Tiny measurements are dominated by noise
+            if base[metric] is None or base[metric] <= 0.01:
+                continue
+            ratio = result[metric] / base[metric]
+            if ratio > limit:
+                regressions.append({
+                    "stage": result["stage"],
+                    "scale": result["scale"],
+                    "metric": metric,
+                    "baseline": base[metric],
+                    "current": result[metric],
+                    "ratio": round(ratio, 2),
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the synthetic data generators.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help=f"portfolio sizes to sweep (default: {DEFAULT_SCALES})")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES),
+                        help="stages to benchmark (default: all)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="runs per measurement; the fastest is kept (default: 1)")
+    parser.add_argument("--output", default=None,
+                        help="write results JSON to this path")
+    parser.add_argument("--baseline", default=None,
+                        help="compare against this results JSON and exit 1 on regressions")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"store the results as the baseline ({os.path.relpath(DEFAULT_BASELINE, ROOT_DIR)})")
+    parser.add_argument("--max-slowdown", type=float, default=1.25,
+                        help="allowed wall-time ratio against the baseline (default: 1.25)")
+    parser.add_argument("--max-memory-growth", type=float, default=1.25,
+                        help="allowed stage RSS ratio against the baseline (default: 1.25)")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.scales, args.stages, args.repeat)
+
+    paths = [args.output] if args.output else []
+    if args.save_baseline:
+        paths.append(DEFAULT_BASELINE)
+    for path in paths:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_slowdown, args.max_memory_growth)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['stage']} scale={r['scale']} {r['metric']}: "
+                f"{r['baseline']} -> {r['current']} ({r['ratio']}x)"
+            )
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,86 +1,319 @@
+import argparse
 import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
 import pandas as pd
-import random
-from datetime import date
 
+from create_historical_data import HISTORY_MONTHS, hist_dir
 from create_synthetic_sample_data import (
-    coa_df,
-    generate_lease_pymnt_sched,
+    get_coa,
+    generate_rent_escalations,
+    lease_pymnt_sched_between,
     generate_cust_invoices,
     generate_vendor_invoices,
     generate_checkreg,
     generate_receipts,
+    apply_payment_dates,
     generate_gltran,
 )
+from schemas import apply_schema
+from writers import (
+    DailyPartitionWriter,
+    get_writer,
+    read_daily_manifest,
+    read_open_items,
+    read_table,
+    table_format,
+)
 
+# Tables produced for every simulated day, in the order they are written
+DAILY_TABLES = ["cust_invoices", "vend_invoices", "checkreg", "receipts", "gltran"]
+# Tables held as open items until their payment date, and the column holding it
+OPEN_ITEM_DATES = {"checkreg": "check_date", "receipts": "receipt_date", "gltran": "date"}
+# Invoices are settled as of this day, i.e. whenever they are eventually paid
+OPEN_ENDED = pd.Timestamp.max.date()
+# Seed of the daily runs; every simulated day draws from its own stream
+DAILY_SEED = 42
 
-def main():
-    hist_dir = os.path.join("data/raw/synthetic/historical", "yardi")
-    os.makedirs(hist_dir, exist_ok=True)
 
-    properties = pd.read_csv(os.path.join(hist_dir, "properties.csv"))
-    vendors = pd.read_csv(os.path.join(hist_dir, "vendors.csv"))
-    leases = pd.read_csv(os.path.join(hist_dir, "leases.csv"), parse_dates=["lease_start", "lease_end", "rent_start"])
-    tenants = pd.read_csv(os.path.join(hist_dir, "tenants.csv"))
-
-    sched_all = generate_lease_pymnt_sched(leases, months_out=120)
-    sched = sched_all[sched_all["schd_dt"].dt.date == date.today()]
-
-    if not sched.empty:
-        cust_inv_new = generate_cust_invoices(sched, leases, tenants)
-    else:
-        cust_inv_new = pd.DataFrame(columns=[
-            "id",
-            "invoice_date",
-            "due_date",
-            "tenant_id",
-            "property_id",
-            "unit_id",
-            "lease_id",
-            "billing_period_start",
-            "billing_period_end",
-            "amount_due",
-            "status",
-            "payment_date",
-            "description",
-        ])
-
-    vend_inv_new = generate_vendor_invoices(
-        vendors, properties, leases, coa_df, min_invoices=5, max_invoices=15
-    )
-    vend_inv_new["invoice_date"] = date.today()
-    vend_inv_new["due_date"] = vend_inv_new["invoice_date"] + pd.to_timedelta(
-        [random.choice([15, 30]) for _ in range(len(vend_inv_new))], unit="d"
+def day_rng(seed, day):
+    """Return the generator for ``day``, the same whichever run simulates it."""
+
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(day.toordinal(),)))
+
+
+class OpenItems:
+    """Receipts, checks and GL entries of issued invoices, held until their payment date.
+
+    Whether and when an invoice is paid is drawn when it is issued. The rows
+    settling it are kept here, grouped by payment date, until the run for
+    that day releases them. Rows are keyed by ``id``, so adding rows that
+    are already held is a no-op.
+
+    Args:
+        tables (dict, optional): Table name -> rows to hold, e.g. as
+            committed by an earlier run.
+    """
+
+    def __init__(self, tables=None):
+        self._days = {}
+        self._ids = set()
+        self.add(tables or {})
+
+    def add(self, tables):
+        """Hold the rows of ``tables`` (name -> DataFrame) until their payment date."""
+
+        for name, column in OPEN_ITEM_DATES.items():
+            df = tables.get(name)
+            if df is None or df.empty:
+                continue
+            ids = df["id"].astype(str)
+            df = df[~ids.isin(self._ids).to_numpy()]
+            self._ids.update(ids)
+            paid_on = pd.to_datetime(df[column]).dt.normalize().to_numpy()
+            for day, rows in df.groupby(paid_on, sort=False):
+                self._days.setdefault(pd.Timestamp(day).date(), {}).setdefault(name, []).append(rows)
+
+    def release(self, through):
+        """Remove and return the rows paid on or before ``through``.
+
+        Returns:
+            dict: Payment day -> table name -> DataFrame.
+        """
+
+        released = {}
+        for day in sorted(d for d in self._days if d <= through):
+            tables = {
+                name: apply_schema(pd.concat(frames, ignore_index=True), name)
+                for name, frames in self._days.pop(day).items()
+            }
+            for df in tables.values():
+                self._ids.difference_update(df["id"].astype(str))
+            released[day] = tables
+        return released
+
+    def tables(self):
+        """Return every held row as table name -> DataFrame."""
+
+        frames = {name: [] for name in OPEN_ITEM_DATES}
+        for tables in self._days.values():
+            for name, parts in tables.items():
+                frames[name].extend(parts)
+        return {
+            name: apply_schema(pd.concat(parts, ignore_index=True), name)
+            for name, parts in frames.items() if parts
+        }
+
+    def counts(self):
+        """Number of held rows per table."""
+
+        counts = {name: 0 for name in OPEN_ITEM_DATES}
+        for tables in self._days.values():
+            for name, parts in tables.items():
+                counts[name] += sum(len(df) for df in parts)
+        return counts
+
+
+def load_escalations(writer, leases):
+    """Read the escalation state persisted by the historical run.
+
+    Outputs generated before the state was persisted do not have it, so it
+    is drawn once and saved, keeping later daily runs consistent with each
+    other.
+    """
+
+    if table_format(writer.directory, "rent_escalations") is not None:
+        return read_table(writer.directory, "rent_escalations")
+    escalations = generate_rent_escalations(leases)
+    writer.write("rent_escalations", escalations)
+    return escalations
+
+
+def load_state(directory=hist_dir):
+    """Read the portfolio the daily transactions are generated for.
+
+    Returns:
+        dict: ``properties``, ``vendors``, ``leases``, ``tenants``,
+        ``escalations``, the ``format`` the historical tables use, the
+        ``open_items`` committed by the last daily run and the last day a
+        run covered (``settled_through``, None before the first run).
+    """
+
+    # Write in the format the historical tables were generated in
+    fmt = table_format(directory, "leases")
+    writer = get_writer(fmt, directory)
+    leases = read_table(directory, "leases", parse_dates=["lease_start", "lease_end", "rent_start_date"])
+    manifest = read_daily_manifest(directory)
+    open_items = {name: apply_schema(df, name) for name, df in read_open_items(directory, manifest).items()}
+    return {
+        "properties": read_table(directory, "properties"),
+        "vendors": read_table(directory, "vendors"),
+        "leases": leases,
+        "tenants": read_table(directory, "tenants"),
+        # Only the bills due in the simulated range are evaluated, with the rents the historical run drew
+        "escalations": load_escalations(writer, leases),
+        "format": fmt,
+        "open_items": OpenItems(open_items),
+        "settled_through": date.fromisoformat(max(manifest["days"])) if manifest["days"] else None,
+    }
+
+
+def _settlement_days(tables):
+    """Return the payment day of every GL entry in ``tables``.
+
+    Documents are only posted to the GL once paid, so each entry belongs to
+    the payment date of its receipt or check, or of the payment of its
+    invoice.
+    """
+
+    settled_on = {}
+    for name, column in [("checkreg", "check_date"), ("receipts", "receipt_date")]:
+        payments = tables[name]
+        paid_on = pd.to_datetime(payments[column]).dt.normalize().to_numpy()
+        settled_on.update(zip(payments["id"].astype(str), paid_on))
+        settled_on.update(zip(payments["invoice_id"].astype(str), paid_on))
+    return pd.to_datetime(tables["gltran"]["source_document"].astype(str).map(settled_on))
+
+
+def issue_day(state, day, min_vendor_invoices=5, max_vendor_invoices=15, rng=None):
+    """Issue ``day``'s invoices and draw whether and when each is paid.
+
+    Rent bills come from the schedule rows due on ``day``, and each property
+    gets ``min_vendor_invoices`` to ``max_vendor_invoices`` vendor invoices.
+
+    Returns:
+        tuple: The invoices as issued on ``day``, i.e. unpaid and not yet
+        posted (name -> DataFrame), and the receipts, checks and GL entries
+        settling them, each dated on its payment date.
+    """
+
+    properties, leases = state["properties"], state["leases"]
+
+    sched = lease_pymnt_sched_between(leases, state["escalations"], day, day, months_out=HISTORY_MONTHS, rng=rng)
+    cust_inv = generate_cust_invoices(sched, leases, state["tenants"], rng, as_of=OPEN_ENDED)
+    vend_inv = generate_vendor_invoices(
+        state["vendors"], properties, leases, get_coa(), min_invoices=min_vendor_invoices,
+        max_invoices=max_vendor_invoices, rng=rng, invoice_dates=[pd.Timestamp(day)] * len(properties),
+        as_of=OPEN_ENDED,
     )
 
-    checkreg_new = generate_checkreg(vend_inv_new)
-    receipts_new = generate_receipts(cust_inv_new)
+    checkreg = generate_checkreg(vend_inv, rng, as_of=OPEN_ENDED)
+    receipts = generate_receipts(cust_inv, rng, as_of=OPEN_ENDED)
+    vend_inv = apply_payment_dates(vend_inv, checkreg, "check_date")
+    cust_inv = apply_payment_dates(cust_inv, receipts, "receipt_date")
+    tables = generate_gltran(cust_inv, vend_inv, receipts, checkreg, get_coa(), rng)
+    # GL entries are dated on the day the run that posts them ran
+    tables["gltran"]["date"] = _settlement_days(tables).to_numpy()
+
+    issued = {
+        name: apply_schema(tables[name].assign(status="Unpaid", payment_date=pd.NaT, gltran_id=None), name)
+        for name in ["cust_invoices", "vend_invoices"]
+    }
+    return issued, {name: tables[name] for name in OPEN_ITEM_DATES}
+
+
+def simulate_days(state, start, end=None, min_vendor_invoices=5, max_vendor_invoices=15, rng=None,
+                  seed=DAILY_SEED):
+    """Generate every day's transactions from ``start`` to ``end``.
+
+    Each day is simulated exactly as a single-day run would: it draws from
+    its own generator (:func:`day_rng`, unless ``rng`` is given), its
+    invoices are written as issued, and the receipts, checks and GL entries
+    settling them are added to ``state["open_items"]``. Every day then
+    releases the open items paid that day, so a range produces the same
+    rows as one run per day. Items paid after ``end`` stay open for later
+    runs.
 
-    gl_data = generate_gltran(cust_inv_new, vend_inv_new, receipts_new, checkreg_new, coa_df)
+    Open items paid before ``start`` but after ``state["settled_through"]``
+    fall on days no run covered and are written on their own day; older ones
+    were written by the run for their day.
 
-    gltran_new = gl_data["gltran"]
-    cust_inv_new = gl_data["cust_invoices"]
-    vend_inv_new = gl_data["vend_invoices"]
-    receipts_new = gl_data["receipts"]
-    checkreg_new = gl_data["checkreg"]
+    Args:
+        state (dict): Portfolio from :func:`load_state`; its open items and
+            ``settled_through`` are updated.
+        start (date): First day to simulate.
+        end (date, optional): Last day to simulate. Defaults to ``start``.
+        rng (np.random.Generator, optional): Draw every day from this
+            generator instead of the per-day ones.
+        seed (int): Seed of the per-day generators.
 
-    def append_csv(name, new_df):
-        path = os.path.join(hist_dir, f"{name}.csv")
-        if os.path.exists(path):
-            existing = pd.read_csv(path)
-            combined = pd.concat([existing, new_df], ignore_index=True)
-        else:
-            combined = new_df
-        combined.to_csv(path, index=False)
+    Returns:
+        dict: Day -> table name -> DataFrame, with an entry for every day in
+        the range and for every skipped day with settlements.
 
-    append_csv("cust_invoices", cust_inv_new)
-    append_csv("vend_invoices", vend_inv_new)
-    append_csv("checkreg", checkreg_new)
-    append_csv("receipts", receipts_new)
-    append_csv("gltran", gltran_new)
+    Raises:
+        ValueError: If ``end`` is before ``start``.
+    """
 
-    print("\u2713 Daily transactions generated")
+    end = start if end is None else end
+    if end < start:
+        raise ValueError(f"end ({end}) is before start ({start})")
+    open_items = state.setdefault("open_items", OpenItems())
+    settled_through = state.get("settled_through")
+
+    by_day = {
+        day: tables for day, tables in open_items.release(start - timedelta(days=1)).items()
+        if settled_through is None or day > settled_through
+    }
+    for day in pd.date_range(start, end, freq="D").date:
+        issued, settlements = issue_day(
+            state, day, min_vendor_invoices, max_vendor_invoices, day_rng(seed, day) if rng is None else rng
+        )
+        open_items.add(settlements)
+        by_day[day] = {**issued, **open_items.release(day).get(day, {})}
+    state["settled_through"] = end if settled_through is None else max(end, settled_through)
+
+    empty = {**issued, **settlements}
+    return {
+        day: {name: tables.get(name, empty[name].iloc[:0]) for name in DAILY_TABLES}
+        for day, tables in sorted(by_day.items())
+    }
+
+
+def backfill(start, end=None, directory=hist_dir):
+    """Simulate ``start`` to ``end`` and commit every day in one bulk write.
+
+    The open items left at ``end`` are committed with the days, so the
+    next run settles them on their payment date.
+
+    Returns:
+        dict: The committed daily manifest.
+
+    Raises:
+        ValueError: If ``end`` is before ``start``.
+    """
+
+    end = start if end is None else end
+    if end < start:
+        raise ValueError(f"end ({end}) is before start ({start})")
+    state = load_state(directory)
+    by_day = simulate_days(state, start, end)
+    return DailyPartitionWriter(directory, state["format"]).write_days(
+        by_day, open_items=state["open_items"].tables()
+    )
+
+
+def main(start=None, end=None):
+    """Generate the daily transactions for ``start`` to ``end`` (default: today)."""
+
+    os.makedirs(hist_dir, exist_ok=True)
+    start = start or date.today()
+    end = end or start
+    began = time.perf_counter()
+    backfill(start, end)
+    days = (end - start).days + 1
+    print(f"✓ Daily transactions generated for {days} day(s) in {time.perf_counter() - began:.1f}s")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate daily CRE transactions on top of the historical data.")
+    parser.add_argument("--start", type=date.fromisoformat, default=None,
+                        help="first day to generate, YYYY-MM-DD (default: today)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None,
+                        help="last day to backfill, YYYY-MM-DD (default: --start)")
+    args = parser.parse_args()
+    if args.end is not None and args.end < (args.start or date.today()):
+        parser.error("--end must not be before --start")
+    main(args.start, args.end)
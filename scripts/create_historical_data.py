@@ -1,66 +1,69 @@
+import argparse
 import os
-import pandas as pd
 from datetime import date
 
-from create_synthetic_sample_data import (
-    coa_df,
-    properties_df,
-    generate_user,
-    generate_vendors,
-    generate_units,
-    generate_tenants,
-    generate_leases,
-    generate_lease_pymnt_sched,
-    generate_cust_invoices,
-    generate_vendor_invoices,
-    generate_checkreg,
-    generate_receipts,
-    generate_gltran,
-)
+from create_synthetic_sample_data import DEFAULT_PARTITION_SIZE, generate_portfolio
+from writers import CsvWriter, add_output_arguments, writer_from_args
 
+hist_dir = os.path.join("data/raw/synthetic/historical", "yardi")
+# Months of payment schedule generated per lease
+HISTORY_MONTHS = 120
 
-def main():
-    hist_dir = os.path.join("data/raw/synthetic/historical", "yardi")
-    os.makedirs(hist_dir, exist_ok=True)
 
-    user = generate_user()
-    vendors = generate_vendors(user, num_vendors=60)
-    units = generate_units(properties_df)
-    tenants = generate_tenants(properties_df, units)
-    leases = generate_leases(properties_df, tenants, units)
+def main(scale=None, partition_size=DEFAULT_PARTITION_SIZE, workers=None, writer=None, profile_dir=None,
+         cache_dir=None, stage_threads=1):
+    """Generate the historical tables under ``data/raw/synthetic/historical``.
 
-    sched_all = generate_lease_pymnt_sched(leases, months_out=120)
-    sched = sched_all[sched_all["schd_dt"].dt.date < date.today()]
+    Args:
+        scale (int, optional): Number of synthetic properties to generate.
+            Defaults to the properties in the listing.
+        partition_size (int): Generate and write this many properties at a
+            time to bound memory use.
+        workers (int, optional): Number of processes generating partitions.
+        writer (CsvWriter | ParquetWriter, optional): Output backend.
+            Defaults to CSVs.
+        profile_dir (str, optional): Dump cProfile stats per stage here.
+        cache_dir (str, optional): Reuse stage outputs cached here.
+        stage_threads (int): Run up to this many independent stages at once.
+    """
 
-    cust_invoices = generate_cust_invoices(sched, leases, tenants)
-    vend_invoices = generate_vendor_invoices(
-        vendors, properties_df, leases, coa_df, min_invoices=50, max_invoices=300
+    generate_portfolio(
+        writer or CsvWriter(hist_dir),
+        scale=scale,
+        partition_size=partition_size,
+        months_out=HISTORY_MONTHS,
+        billed_before=date.today(),
+        workers=workers,
+        profile_dir=profile_dir,
+        cache_dir=cache_dir,
+        stage_threads=stage_threads,
     )
-    checkreg = generate_checkreg(vend_invoices)
-    receipts = generate_receipts(cust_invoices)
-
-    gl_data = generate_gltran(cust_invoices, vend_invoices, receipts, checkreg, coa_df)
-
-    gltran = gl_data["gltran"]
-    cust_invoices = gl_data["cust_invoices"]
-    vend_invoices = gl_data["vend_invoices"]
-    receipts = gl_data["receipts"]
-    checkreg = gl_data["checkreg"]
-
-    tenants.to_csv(os.path.join(hist_dir, "tenants.csv"), index=False)
-    units.to_csv(os.path.join(hist_dir, "units.csv"), index=False)
-    leases.to_csv(os.path.join(hist_dir, "leases.csv"), index=False)
-    sched.to_csv(os.path.join(hist_dir, "payment_schedule.csv"), index=False)
-    vendors.to_csv(os.path.join(hist_dir, "vendors.csv"), index=False)
-    cust_invoices.to_csv(os.path.join(hist_dir, "cust_invoices.csv"), index=False)
-    vend_invoices.to_csv(os.path.join(hist_dir, "vend_invoices.csv"), index=False)
-    checkreg.to_csv(os.path.join(hist_dir, "checkreg.csv"), index=False)
-    receipts.to_csv(os.path.join(hist_dir, "receipts.csv"), index=False)
-    gltran.to_csv(os.path.join(hist_dir, "gltran.csv"), index=False)
-    properties_df.to_csv(os.path.join(hist_dir, "properties.csv"), index=False)
 
     print("\u2713 Historical synthetic data generated")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate historical synthetic CRE data.")
+    parser.add_argument("--scale", type=int, default=None,
+                        help="number of synthetic properties (default: the property listing)")
+    parser.add_argument("--partition-size", type=int, default=DEFAULT_PARTITION_SIZE,
+                        help=f"properties generated and written at a time (default: {DEFAULT_PARTITION_SIZE})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes generating partitions (default: 1)")
+    parser.add_argument("--profile-dir", default=None,
+                        help="dump cProfile stats for every stage to this directory")
+    parser.add_argument("--cache-dir", default=None,
+                        help="cache stage outputs here and reuse them when inputs are unchanged")
+    parser.add_argument("--stage-threads", type=int, default=1,
+                        help="independent stages of a partition run at once (default: 1)")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    main(
+        scale=args.scale,
+        partition_size=args.partition_size,
+        workers=args.workers,
+        writer=writer_from_args(args, hist_dir),
+        profile_dir=args.profile_dir,
+        cache_dir=args.cache_dir,
+        stage_threads=args.stage_threads,
+    )
@@ -1,85 +1,156 @@
+import argparse
+import numpy as np
 import pandas as pd
-import uuid
 import random
 import os
 import sys
 import calendar
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from dateutil.relativedelta import relativedelta
 
 
-from faker import Faker
 from datetime import datetime, timedelta, date
 
+from faker_pool import FakerPool, random_dates_between, random_datetimes_between
+from ids import hex_ids
+from property_synth import synthesize_properties
+from reference_data import read_cached
+from pipeline import Pipeline, Stage, StageCache, content_hash
+from profiling import StageProfiler
+from schemas import apply_schema
+from writers import CsvWriter, add_output_arguments, writer_from_args
+
 # ------------ Setup ------------
-fake = Faker()
 random.seed(42)
+rng = np.random.default_rng(42)
+faker_pool = FakerPool(
+    seed=42,
+    size=int(os.getenv("FAKER_POOL_SIZE", "1000")),
+    cache_dir=os.getenv("FAKER_POOL_CACHE_DIR"),
+)
 output_dir = "data/raw/synthetic/simulated"
-os.makedirs(os.path.join(output_dir, "yardi"), exist_ok=True)
-os.makedirs(os.path.join(output_dir, "banking"), exist_ok=True)
+DEFAULT_PARTITION_SIZE = 1000
+
+@lru_cache(maxsize=None)
+def get_faker():
+    """Return the shared Faker instance, created on first use.
+
+    Importing Faker is slow and only the budget and banking generators
+    still call it per row; everything else samples from ``faker_pool``.
+    """
+    from faker import Faker
+    return Faker()
 
 # ------------ Helper Functions ------------
 def random_bool(): return random.choice([True, False])
 def random_date(start_days_ago=180, end_days_ago=0):
     return datetime.now() - timedelta(days=random.randint(end_days_ago, start_days_ago))
 
+def _get_rng(generator=None):
+    """Return ``generator`` or fall back to the module-level NumPy generator."""
+    return generator if generator is not None else rng
+
+def _column(df, name, default):
+    """Return ``df[name]`` or a Series filled with ``default`` when missing."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+def _month_index(dates):
+    """Convert datetime64 values to a running month count (year * 12 + month - 1)."""
+    dates = pd.DatetimeIndex(dates)
+    return np.asarray(dates.year * 12 + dates.month - 1, dtype=np.int64)
+
+def _month_start(month_idx):
+    """Convert running month counts back to first-of-month datetime64 values."""
+    months = np.asarray(month_idx, dtype=np.int64) - 1970 * 12
+    return months.astype("datetime64[M]").astype("datetime64[ns]")
+
 # ------------ File Paths ------------
 coa_path = "data/raw/synthetic/Structured_Chart_of_Accounts.csv"
 prop_listing_path = "data/raw/synthetic/Enhanced_Property_Listing.xlsx"
 
-coa_df = pd.read_csv(coa_path)
-properties_df = pd.read_excel(prop_listing_path)
+@lru_cache(maxsize=None)
+def get_coa():
+    """Return the chart of accounts, read on first use."""
+    return read_cached(coa_path, pd.read_csv)
+
+@lru_cache(maxsize=None)
+def get_properties():
+    """Return the property listing, read on first use, with a ``property_id`` per row.
+
+    IDs come from their own generator seeded like the module one, so they
+    do not depend on what has been drawn before the listing is first used.
+    """
+    properties = read_cached(prop_listing_path, pd.read_excel)
+    if "property_id" not in properties.columns:
+        properties["property_id"] = uids(len(properties), np.random.default_rng(42))
+    return properties
+
+def __getattr__(name):
+    # ``coa_df``, ``properties_df`` and ``fake`` stay importable but are only
+    # loaded when first accessed
+    if name == "coa_df":
+        return get_coa()
+    if name == "properties_df":
+        return get_properties()
+    if name == "fake":
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ------------ Utilities ------------
-def uid(): return uuid.uuid4().hex
+def uids(n, rng=None):
+    """Return ``n`` hex IDs drawn from ``rng`` (the module generator by default).
+
+    IDs are reproducible for a seeded generator, unlike ``uuid.uuid4()``.
+    """
+    return hex_ids(n, _get_rng(rng))
+def uid(): return uids(1)[0]
 today = datetime.today().date()
 
-# Add property_id if missing
-if "property_id" not in properties_df.columns:
-    properties_df["property_id"] = [uid() for _ in range(len(properties_df))]
+def _as_of(as_of):
+    """Return ``as_of`` as a date, defaulting to ``today``."""
+    return today if as_of is None else pd.Timestamp(as_of).date()
 
 # ------------ Simulate Users ------------
-def generate_user(count=None):
+def generate_user(count=None, rng=None):
     """Return a DataFrame of fake user records.
 
     Args:
         count (int, optional): Number of users to generate. If omitted a
             random number between 5 and 10 is used.
+        rng (np.random.Generator, optional): Source of randomness. Defaults
+            to the module-level generator.
 
     Raises:
         ValueError: If ``count`` is negative.
     """
 
+    rng = _get_rng(rng)
+
     if count is None:
-        count = random.randint(5, 10)
+        count = int(rng.integers(5, 11))
     elif count < 0:
         raise ValueError("count must be non-negative")
 
-    users = []
-
-    def generate_unique_user_ids(count, id_length=6):
-        user_ids = set()
-        while len(user_ids) < count:
-            rand_num = random.randint(0, 10**id_length - 1)
-            padded_id = f"U{rand_num:0{id_length}d}"
-            user_ids.add(padded_id)
-        return list(user_ids)
+    # Six-digit user numbers drawn without replacement are unique by construction
+    id_length = 6
+    user_numbers = rng.choice(10**id_length, size=count, replace=False)
 
-    user_ids = generate_unique_user_ids(count)
-
-    for i in range(count):
-        users.append(
-            {
-                "id": uid(),
-                "user_id": user_ids[i],
-                "user_name": fake.name(),
-            }
-        )
-
-    return pd.DataFrame(users)
+    return pd.DataFrame({
+        "id": uids(count, rng),
+        "user_id": [f"U{n:0{id_length}d}" for n in user_numbers],
+        "user_name": faker_pool.sample("name", count, rng),
+    })
 
 # ------------ Simulate Vendors ------------
-def generate_vendors(user, num_vendors):  # Make vendor count configurable
-    """Generate synthetic vendor records."""
+def generate_vendors(user, num_vendors, rng=None):  # Make vendor count configurable
+    """Generate synthetic vendor records.
+
+    Names, contacts and addresses are drawn in bulk from ``faker_pool``.
+    """
 
     vendor_categories = [
         ("Legal & Regulatory Counsel", ["LLP", "Law Group", "Counsel"], 0.08),
@@ -103,112 +174,152 @@ def generate_vendors(user, num_vendors):  # Make vendor count configurable
         ("Landscaping & Outdoor Services", ["Landscaping", "Outdoor Services", "GreenScape"], 0.05),
     ]
 
-    vendors = []
+    rng = _get_rng(rng)
+
+    # Select vendor categories and name suffixes
+    categories, suffix_lists, category_weights = zip(*vendor_categories)
+    category_idx = rng.choice(len(categories), size=num_vendors, p=np.array(category_weights) / sum(category_weights))
+    suffix_counts = np.array([len(suffixes) for suffixes in suffix_lists])
+    suffix_table = np.array([suffixes + [""] * (suffix_counts.max() - len(suffixes)) for suffixes in suffix_lists], dtype=object)
+    suffix_idx = np.floor(rng.random(num_vendors) * suffix_counts[category_idx]).astype(int)
+    suffix = suffix_table[category_idx, suffix_idx]
+
+    vendor_name = np.where(
+        rng.random(num_vendors) < 0.75,
+        faker_pool.sample("last_name", num_vendors, rng) + " " + suffix,
+        faker_pool.sample("company", num_vendors, rng),
+    )
+
+    # Generate creator and modifier user_ids
+    user_ids = user["user_id"].to_numpy()
+    creator = rng.choice(user_ids, size=num_vendors)
+    modifier = np.where(rng.random(num_vendors) < 0.7, creator, rng.choice(user_ids, size=num_vendors))
+
+    # Generate creator and modifier dates
+    now = pd.Timestamp(datetime.now()).floor("s")
+    created_at = random_datetimes_between(now - pd.DateOffset(years=10), now, rng, size=num_vendors)
+    modified_at = random_datetimes_between(created_at, now, rng)
+
+    return pd.DataFrame({
+        "id": uids(num_vendors, rng),
+        "name": vendor_name,
+        "service_type": np.array(categories, dtype=object)[category_idx],
+        "address": pd.Series(faker_pool.sample("address", num_vendors, rng)).str.replace("\n", ", "),  # Flatten line breaks
+        "contact_name": faker_pool.sample("name", num_vendors, rng),
+        "contact_email": faker_pool.sample("email", num_vendors, rng),
+        "phone": faker_pool.sample("phone_number", num_vendors, rng),
+        "tax_id": faker_pool.sample("ssn", num_vendors, rng),
+        "vendor_status": np.where(rng.random(num_vendors) < 0.9, "Active", "Inactive"),
+        "approved_vendor": rng.random(num_vendors) < 0.5,
+        "created_by": creator,
+        "created_at": created_at,
+        "modified_by": modifier,
+        "modified_at": modified_at
+    })
 
-    for _ in range(num_vendors):
-        # Select a vendor category
-        categories, suffix_lists, category_weights = zip(*vendor_categories)
-        idx = random.choices(range(len(categories)), weights=category_weights, k=1)[0]
-        vendor_category = categories[idx]
-        suffix = random.choice(suffix_lists[idx])
-        vendor_name = random.choices(
-            population=[f"{fake.last_name()} {suffix}", fake.company()],
-            weights=[0.75, 0.25],
-            k=1
-        )[0]
+# ------------ Simulate Units ------------
+def generate_units(properties, rng=None, as_of=None):
+    """Generate the units for each property.
 
+    Every unit of every property is drawn in one batch; each property gets
+    exactly ``round(Occupancy * Units)`` occupied units. Creation,
+    renovation and occupancy dates fall before ``as_of`` (default: today).
+    """
 
-        # Generate creator and modifier user_ids
-        creator = random.choice(user["user_id"].tolist())
-        modifier = creator if random.random() < 0.7 else random.choice(user["user_id"].tolist())
-        
-        # Generate creator and modifier dates
-        created_at = fake.date_time_between(start_date="-10y", end_date="now")
-        modified_at = fake.date_time_between(start_date=created_at, end_date="now")
+    rng = _get_rng(rng)
+    as_of = _as_of(as_of)
+    properties = properties.reset_index(drop=True)
+
+    num_units = pd.to_numeric(_column(properties, "Units", 0)).fillna(0).to_numpy(dtype=np.int64)
+    num_floors = np.maximum(pd.to_numeric(_column(properties, "Floors", 1)).to_numpy(dtype=np.int64), 1)
+    total_sq_ft = pd.to_numeric(_column(properties, "Total Sq Ft", 0)).to_numpy(dtype=float)
+    avg_sq_ft = (total_sq_ft / np.maximum(num_units, 1)).astype(np.int64)
+    occupancy_rate = pd.to_numeric(_column(properties, "Occupancy", 0)).to_numpy(dtype=float)
+    year_built = pd.to_numeric(_column(properties, "Year Built", 1980)).to_numpy(dtype=np.int64)
+
+    # Calculate exact number of occupied units
+    num_occupied = np.round(occupancy_rate * num_units).astype(np.int64)
+
+    # One row per unit; unit_pos numbers the units within their property
+    prop_idx = np.repeat(np.arange(len(properties)), num_units)
+    group_start = np.repeat(np.cumsum(num_units) - num_units, num_units)
+    unit_pos = np.arange(len(prop_idx)) - group_start
+
+    # Rank units within each property by a random key; the lowest ranks are occupied
+    order = np.lexsort((rng.random(len(prop_idx)), prop_idx))
+    occupancy_rank = np.empty(len(prop_idx), dtype=np.int64)
+    occupancy_rank[order] = np.arange(len(prop_idx)) - group_start[order]
+    is_occupied = occupancy_rank < num_occupied[prop_idx]
+
+    floor_number = rng.integers(1, num_floors[prop_idx] + 1)
+    unit_number = (  # e.g., 03001 = floor 3, unit 1
+        pd.Series(floor_number).astype(str).str.zfill(2) + pd.Series(unit_pos + 1).astype(str).str.zfill(3)
+    )
+
+    created_date = random_dates_between(
+        as_of - relativedelta(years=10), as_of - relativedelta(years=1), rng, size=len(prop_idx)
+    )
+    modified_date = random_dates_between(created_date, as_of, rng)
+
+    # Ensure last_renovated is after Year Built
+    start_renovation_date = (year_built - 1970).astype("datetime64[Y]")[prop_idx]
+    last_renovated = random_dates_between(start_renovation_date, as_of, rng)
+
+    five_years_ago = as_of - relativedelta(years=5)
+    last_occupied = random_dates_between(five_years_ago, as_of, rng, size=len(prop_idx)).dt.date.to_numpy()
+    last_vacated = random_dates_between(five_years_ago, as_of, rng, size=len(prop_idx)).dt.date.to_numpy()
+
+    return apply_schema(pd.DataFrame({
+        "id": uids(len(prop_idx), rng),
+        "property_id": properties["property_id"].to_numpy()[prop_idx],
+        "unit_number": unit_number.to_numpy(),
+        "floor_number": floor_number,
+        "sq_ft": avg_sq_ft[prop_idx],
+        "occupancy_status": np.where(is_occupied, "Occupied", "Vacant"),
+        "last_renovated": last_renovated.dt.date,
+        "last_occupied": np.where(is_occupied, None, last_occupied),
+        "last_vacated": np.where(is_occupied, last_vacated, None),
+        "created_at": created_date.dt.date,
+        "modified_at": modified_date.dt.date
+    }), "units")
 
-        vendors.append({
-            "id": uid(),
-            "name": vendor_name,
-            "service_type": vendor_category,
-            "address": fake.address().replace("\n", ", "),  # Flatten line breaks
-            "contact_name": fake.name(),
-            "contact_email": fake.email(),
-            "phone": fake.phone_number(),
-            "tax_id": fake.ssn(),
-            "vendor_status": random.choices(population=["Active", "Inactive"], weights=[0.9, 0.1], k=1)[0],
-            "approved_vendor": random.choice([True, False]),
-            "created_by": creator,
-            "created_at": created_at,
-            "modified_by": modifier,
-            "modified_at": modified_at
-        })
-    return pd.DataFrame(vendors)
+# ------------ Simulate Tenants ------------
+def _choose_by_key(keys, options_by_key, default, rng):
+    """Pick one option per row, uniformly from the options mapped to its key."""
 
-# ------------ Simulate Units ------------
-def generate_units(properties):
-    units = []
-
-    for _, row in properties.iterrows():
-        num_units = int(row.get("Units", 0))
-        num_floors = int(row.get("Floors", 1))
-        total_sq_ft = row.get("Total Sq Ft", 0)
-        avg_sq_ft = int(total_sq_ft / num_units) if num_units > 0 else 0
-        occupancy_rate = float(row.get("Occupancy", 0)) 
-        year_built = int(row.get("Year Built", 1980))
-
-        # Safe fallback if the property has no usable year
-        start_renovation_date = datetime(year=year_built, month=1, day=1)
-
-        # Calculate exact number of occupied units
-        num_occupied = int(round(occupancy_rate * num_units))
-        occupied_indices = set(random.sample(range(num_units), num_occupied))
-
-        for i in range(num_units):
-            created_date = fake.date_between(start_date="-10y", end_date="-1y")
-            modified_date = fake.date_between(start_date=created_date, end_date="today")
-            floor_number = random.randint(1, max(1, num_floors))
-            unit_number = f"{floor_number:02d}{i+1:03d}"  # e.g., 03001 = floor 3, unit 1
-
-            is_occupied = i in occupied_indices
-            occupancy_status = "Occupied" if is_occupied else "Vacant"
-
-            # Ensure last_renovated is after Year Built and at least a year ago
-            last_renovated = fake.date_between(
-                start_date=start_renovation_date,
-                end_date=datetime.now()
-            )
-            
-            last_occupied = fake.date_between(start_date="-5y", end_date="today") if occupancy_status == "Vacant" else None
-            last_vacated = fake.date_between(start_date="-5y", end_date="today") if occupancy_status == "Occupied" else None
-
-            units.append({
-                "id": uid(),
-                "property_id": row["property_id"],
-                "unit_number": unit_number,
-                "floor_number": floor_number,
-                "sq_ft": avg_sq_ft,
-                "occupancy_status": occupancy_status,
-                "last_renovated": last_renovated,
-                "last_occupied": last_occupied,
-                "last_vacated": last_vacated,
-                "created_at": created_date,
-                "modified_at": modified_date
-            })
-            
-    return pd.DataFrame(units)
+    keys = pd.Series(keys, dtype=object).to_numpy()
+    chosen = np.empty(len(keys), dtype=object)
+    for key in pd.unique(keys):
+        rows = keys == key
+        options = np.asarray(options_by_key.get(key, default), dtype=object)
+        chosen[rows] = options[rng.integers(0, len(options), size=rows.sum())]
+    return chosen
 
-# ------------ Simulate Tenants ------------
-def generate_tenants(properties_df, units_df):
-    tenants = []
+
+def generate_tenants(properties_df, units_df, rng=None, allow_empty=False):
+    """Assign one tenant to every occupied unit.
+
+    Property attributes are joined through a property-indexed frame and
+    all tenant attributes are drawn in batches. With ``allow_empty`` an
+    empty tenant table is returned when no unit is occupied instead of
+    exiting, which partitioned runs rely on.
+    """
+
+    rng = _get_rng(rng)
 
     # Prepare unit-level lookup for assigning tenants only to occupied units
     
     occupied_units = units_df[units_df["occupancy_status"] == "Occupied"]
-    if occupied_units.empty:
+    if occupied_units.empty and not allow_empty:
         print("No occupied units available across all properties — cannot assign tenants. Exiting program.")
         sys.exit(1)
     
-    available_units = occupied_units.sample(frac=1).reset_index(drop=True)  # Shuffle to randomize
+    available_units = occupied_units.iloc[rng.permutation(len(occupied_units))]  # Shuffle to randomize
+
+    # Units whose property is not in the listing get no tenant
+    property_index = properties_df.drop_duplicates("property_id").set_index("property_id")
+    available_units = available_units[available_units["property_id"].isin(property_index.index)].reset_index(drop=True)
+    num_tenants = len(available_units)
     
     # Define mapping logic
     # Mapping subtypes to broader categories
@@ -289,42 +400,56 @@ def generate_tenants(properties_df, units_df):
     ]
 }
 
-    # Iterate through available units and assign 1 tenant per occupied unit
-    for _, unit in available_units.iterrows():
-        property_row = properties_df[properties_df["property_id"] == unit["property_id"]]
-        if property_row.empty:
-            continue
+    # Contact details drawn in bulk from the Faker pools
+    business_names = faker_pool.sample("company", len(available_units), rng)
+    contact_names = faker_pool.sample("name", len(available_units), rng)
+    emails = faker_pool.sample("company_email", len(available_units), rng)
+    phones = faker_pool.sample("phone_number", len(available_units), rng)
+
+    subtype = available_units["property_id"].map(_column(property_index, "Subtype", "Office")).astype(str).to_numpy()
+
+    # Employee headcount ranges by subtype
+    employee_count = np.select(
+        [subtype == "Retail", subtype == "Office"],
+        [rng.integers(5, 31, size=num_tenants), rng.integers(20, 201, size=num_tenants)],
+        default=rng.integers(50, 501, size=num_tenants),
+    )
+
+    return apply_schema(pd.DataFrame({
+        "id": uids(num_tenants, rng),
+        "property_id": available_units["property_id"].to_numpy(),
+        "unit_id": available_units["id"].to_numpy(),
+        "business_name": business_names,
+        "primary_contact": contact_names,
+        "email": emails,
+        "phone": phones,
+        "industry": _choose_by_key(subtype, industry_map, ["General Business"], rng),
+        "annual_revenue": rng.choice(["<1M", "1M–5M", "5M–25M", "25M+"], size=num_tenants),
+        "employee_count": employee_count,
+        "lease_start_date": available_units["last_vacated"].to_numpy(),
+        "move_in_reason": _choose_by_key(subtype, move_in_reason_map, ["Expansion", "Relocation"], rng)
+    }), "tenants")
 
-        property_data = property_row.iloc[0]
-        subtype = str(property_data.get("Subtype", "Office"))
-        industry_options = industry_map.get(subtype, ["General Business"])
-        move_in_reasons = move_in_reason_map.get(subtype, ["Expansion", "Relocation"])
+# ------------ Simulate Leases ------------
+def _add_months(dates, months):
+    """Add whole months to dates, clamping the day like ``relativedelta``."""
 
-        industry = random.choice(industry_options)
-        tenants.append({
-            "id": uid(),
-            "property_id": unit["property_id"],
-            "unit_id": unit["id"],
-            "business_name": fake.company(),
-            "primary_contact": fake.name(),
-            "email": fake.company_email(),
-            "phone": fake.phone_number(),
-            "industry": industry,
-            "annual_revenue": random.choice(["<1M", "1M–5M", "5M–25M", "25M+"]),
-            "employee_count": (
-                random.randint(5, 30) if subtype == "Retail" else
-                random.randint(20, 200) if subtype == "Office" else
-                random.randint(50, 500)
-            ),
-            "lease_start_date": unit["last_vacated"],
-            "move_in_reason": random.choice(move_in_reasons)
-        })
+    dates = pd.DatetimeIndex(dates)
+    month_start = pd.DatetimeIndex(_month_start(_month_index(dates) + np.asarray(months)))
+    day = np.minimum(dates.day, month_start.days_in_month)
+    return month_start + pd.to_timedelta(day - 1, unit="D")
 
-    return pd.DataFrame(tenants)
 
-# ------------ Simulate Leases ------------
-def generate_leases(properties, tenants, units):
-    leases = []
+def generate_leases(properties, tenants, units, rng=None, as_of=None):
+    """Create a lease for every occupied unit.
+
+    Lease terms, rents, deposits and rent commencement flags are drawn in
+    batches per property type from a property-indexed frame. Lease status
+    is evaluated on ``as_of`` (default: today).
+    """
+
+    rng = _get_rng(rng)
+    as_of = pd.Timestamp(_as_of(as_of))
 
     lease_term_dict = {
         "Office": ([1, 3, 5, 10], [0.2, 0.3, 0.3, 0.2]),
@@ -358,93 +483,97 @@ def generate_leases(properties, tenants, units):
         "Commercial": 1.25
     }
 
+    property_index = properties.drop_duplicates("property_id").set_index("property_id")
     occupied_units = units[units["occupancy_status"] == "Occupied"]
-
-    for _, unit in occupied_units.iterrows():
-        tenant = tenants.sample(1).iloc[0]
-        credit_score = tenant.get("credit_score", 700)
-
-        # Dates
-        start_date = pd.to_datetime(unit.get("last_vacated", today)).date()
-        if pd.isna(start_date):
-            start_date = today.date()
-
-        property_row = properties[properties["property_id"] == unit["property_id"]]
-        if property_row.empty:
-            continue
-
-        property = property_row.iloc[0]
-        property_type = property.get("Type", "Commercial")
-        terms, weights = lease_term_dict.get(property_type, ([1, 3, 5, 10], [0.25, 0.35, 0.25, 0.15]))
-
-        lease_term_years = random.choices(terms, weights)[0]
-        end_date = start_date + timedelta(days=lease_term_years * 365)
-
-        # Base rent
-        low, high = rent_per_sqft_by_category.get(property_type, (20, 40))
-        base_rate = random.uniform(low, high)
-        base_rent = (unit["sq_ft"] * base_rate) / 12
-        cam_charges = unit["sq_ft"] * 1.5
-        monthly_rent = round(base_rent + cam_charges, 2)
-
-        # Deposit
-        risk_multiplier = 1 if credit_score >= 750 else 2 if credit_score >= 650 else 3
-        category_multiplier = category_multiplier_map.get(property_type, 1.5)
-        blended_multiplier = risk_multiplier * category_multiplier
-        deposit_by_multiplier = monthly_rent * blended_multiplier
-        deposit_by_annual_percent = monthly_rent * 12 * 0.10
-        deposit = round(max(deposit_by_multiplier, deposit_by_annual_percent), 2)
-
-        # Lease logic
-        lease_status = "Terminated" if end_date < today else "Pending" if start_date > today else "Active"
-        auto_renew = random.choices([True, False], weights=auto_renew_weights_by_type.get(property_type, [0.35, 0.65]))[0]
-        payment_timing = "In Advance" if property_type in ["Office", "Retail", "Mixed-Use"] else "In Arrears"
-
-        # Escalation
-        escalation_type = random.choice(["Fixed %", "CPI", None])
-        escalation_rate = 0.03 if escalation_type == "Fixed %" else None
-
-        # NEW: rent logic flags
-        fixed_rent_commencement = random.choice([True, False])
-        rent_deferral_months = random.choice([0, 0, 1, 2])  # weighted toward 0
-        free_rent_months = random.choice([0, 0, 1, 2, 3])   # common options
-        pro_rated_start = start_date.day > 1
-
-        # Calculate rent_start_date
-        if fixed_rent_commencement:
-            rent_start_date = (start_date + relativedelta(months=1)).replace(day=1)
-        else:
-            rent_start_date = start_date
-
-        rent_start_date += relativedelta(months=rent_deferral_months)
-
-        leases.append({
-            "id": uid(),
-            "tenant_id": tenant["id"],
-            "unit_id": unit["id"],
-            "property_id": unit["property_id"],
-            "lease_start": start_date,
-            "lease_end": end_date,
-            "rent_start_date": rent_start_date,
-            "deposit_amount": deposit,
-            "monthly_rent": monthly_rent,
-            "payment_timing": payment_timing,
-            "lease_status": lease_status,
-            "auto_renew": auto_renew,
-            "lease_type": "Commercial",
-            "late_fee_terms": "5% after 5 days",
-            "early_termination_clause": "2 months rent",
-            "pro_rated_start": pro_rated_start,
-            "escalation_clause": random.choice([True, False]),
-            "expense_reimbursement_clause": random.choice([True, False]),
-            "escalation_type": escalation_type,
-            "escalation_rate": escalation_rate,
-            "fixed_rent_commencement": fixed_rent_commencement,
-            "rent_deferral_months": rent_deferral_months,
-            "free_rent_months": free_rent_months
-        })
-
-    return pd.DataFrame(leases)
+    occupied_units = occupied_units[occupied_units["property_id"].isin(property_index.index)].reset_index(drop=True)
+    num_leases = len(occupied_units)
+
+    # Each lease is signed by a randomly sampled tenant
+    tenant_idx = rng.integers(0, len(tenants), size=num_leases)
+    credit_score = pd.to_numeric(_column(tenants, "credit_score", 700)).to_numpy(dtype=float)[tenant_idx]
+
+    # Dates
+    start_date = pd.to_datetime(occupied_units["last_vacated"]).fillna(as_of)
+
+    property_type = occupied_units["property_id"].map(_column(property_index, "Type", "Commercial")).to_numpy(dtype=object)
+
+    lease_term_years = np.empty(num_leases, dtype=np.int64)
+    for ptype in pd.unique(property_type):
+        rows = property_type == ptype
+        terms, weights = lease_term_dict.get(ptype, ([1, 3, 5, 10], [0.25, 0.35, 0.25, 0.15]))
+        lease_term_years[rows] = rng.choice(terms, size=rows.sum(), p=np.array(weights) / sum(weights))
+    end_date = start_date + pd.to_timedelta(lease_term_years * 365, unit="D")
+
+    # Base rent
+    rent_range = np.array([rent_per_sqft_by_category.get(ptype, (20, 40)) for ptype in property_type], dtype=float).reshape(-1, 2)
+    base_rate = rng.uniform(rent_range[:, 0], rent_range[:, 1])
+    sq_ft = occupied_units["sq_ft"].to_numpy(dtype=float)
+    base_rent = (sq_ft * base_rate) / 12
+    cam_charges = sq_ft * 1.5
+    monthly_rent = np.round(base_rent + cam_charges, 2)
+
+    # Deposit
+    risk_multiplier = np.select([credit_score >= 750, credit_score >= 650], [1, 2], default=3)
+    category_multiplier = np.array([category_multiplier_map.get(ptype, 1.5) for ptype in property_type], dtype=float)
+    blended_multiplier = risk_multiplier * category_multiplier
+    deposit_by_multiplier = monthly_rent * blended_multiplier
+    deposit_by_annual_percent = monthly_rent * 12 * 0.10
+    deposit = np.round(np.maximum(deposit_by_multiplier, deposit_by_annual_percent), 2)
+
+    # Lease logic
+    lease_status = np.where(
+        end_date < as_of, "Terminated",
+        np.where(start_date > as_of, "Pending", "Active"),
+    )
+    auto_renew_true = np.array([auto_renew_weights_by_type.get(ptype, [0.35, 0.65])[0] for ptype in property_type], dtype=float)
+    auto_renew = rng.random(num_leases) < auto_renew_true
+    payment_timing = np.where(
+        np.isin(property_type, ["Office", "Retail", "Mixed-Use"]), "In Advance", "In Arrears"
+    )
+
+    # Escalation
+    escalation_type = np.array(["Fixed %", "CPI", None], dtype=object)[rng.integers(0, 3, size=num_leases)]
+    escalation_rate = np.where(escalation_type == "Fixed %", 0.03, np.nan)
+
+    # NEW: rent logic flags
+    fixed_rent_commencement = rng.random(num_leases) < 0.5
+    rent_deferral_months = rng.choice([0, 0, 1, 2], size=num_leases)  # weighted toward 0
+    free_rent_months = rng.choice([0, 0, 1, 2, 3], size=num_leases)   # common options
+    pro_rated_start = (start_date.dt.day > 1).to_numpy()
+
+    # Calculate rent_start_date
+    commencement = np.where(
+        fixed_rent_commencement,
+        _month_start(_month_index(start_date) + 1),
+        start_date.to_numpy(dtype="datetime64[ns]"),
+    )
+    rent_start_date = _add_months(commencement, rent_deferral_months)
+
+    return apply_schema(pd.DataFrame({
+        "id": uids(num_leases, rng),
+        "tenant_id": tenants["id"].to_numpy()[tenant_idx],
+        "unit_id": occupied_units["id"].to_numpy(),
+        "property_id": occupied_units["property_id"].to_numpy(),
+        "lease_start": start_date.dt.date,
+        "lease_end": end_date.dt.date,
+        "rent_start_date": rent_start_date.date,
+        "deposit_amount": deposit,
+        "monthly_rent": monthly_rent,
+        "payment_timing": payment_timing,
+        "lease_status": lease_status,
+        "auto_renew": auto_renew,
+        "lease_type": "Commercial",
+        "late_fee_terms": "5% after 5 days",
+        "early_termination_clause": "2 months rent",
+        "pro_rated_start": pro_rated_start,
+        "escalation_clause": rng.random(num_leases) < 0.5,
+        "expense_reimbursement_clause": rng.random(num_leases) < 0.5,
+        "escalation_type": escalation_type,
+        "escalation_rate": escalation_rate,
+        "fixed_rent_commencement": fixed_rent_commencement,
+        "rent_deferral_months": rent_deferral_months,
+        "free_rent_months": free_rent_months
+    }), "leases")
 
 # ------------ Simulate Rent Roll ------------ 
 """
@@ -518,157 +647,291 @@ def generate_rentroll(properties_df, leases_df):
     return pd.DataFrame(rentroll)
 """
 
-def generate_lease_pymnt_sched(leases_df, months_out):
+def _schedule_terms(leases_df):
+    """Normalise the lease columns the payment schedule depends on.
+
+    Missing columns fall back to the same defaults the per-lease loop used, so
+    hand-built lease frames (as in the tests) keep working.
+    """
+
+    lease_start = pd.to_datetime(_column(leases_df, "lease_start", today)).fillna(pd.Timestamp(today))
+    rent_start = pd.to_datetime(_column(leases_df, "rent_start_date", None)).fillna(lease_start)
+    lease_end = pd.to_datetime(_column(leases_df, "lease_end", None)).fillna(
+        lease_start + pd.Timedelta(days=730)
+    )
+
+    escalation_type = _column(leases_df, "escalation_type", None)
+    escalation_type = escalation_type.astype(object).where(escalation_type.notna(), None).to_numpy()
+    escalation_rate = pd.to_numeric(_column(leases_df, "escalation_rate", np.nan)).to_numpy(dtype=float)
+    escalation_rate = np.where(
+        (escalation_type == "Fixed %") & np.isnan(escalation_rate), 0.03, escalation_rate
+    )
+
+    first_month = _month_index(rent_start)
+    lease_start_idx = pd.DatetimeIndex(lease_start)
+
+    return {
+        "lease_start_day": np.asarray(lease_start_idx.day, dtype=np.int64),
+        "lease_start_days_in_month": np.asarray(lease_start_idx.days_in_month, dtype=np.int64),
+        "first_month": first_month,
+        "term_months": _month_index(lease_end) - first_month,
+        "monthly_rent": pd.to_numeric(_column(leases_df, "monthly_rent", 10000)).to_numpy(dtype=float),
+        "escalation_type": escalation_type,
+        "escalation_rate": escalation_rate,
+        "in_advance": (_column(leases_df, "payment_timing", "In Advance") == "In Advance").to_numpy(),
+        "free_rent_months": pd.to_numeric(_column(leases_df, "free_rent_months", 0)).fillna(0).to_numpy(dtype=np.int64),
+        "pro_rated_start": _column(leases_df, "pro_rated_start", False).fillna(False).astype(bool).to_numpy(),
+    }
+
+
+def _escalated_rents(terms, num_years, rng):
+    """Return a ``(lease, lease year)`` matrix of monthly rent.
+
+    Year ``y`` is year ``y - 1`` times the lease's escalation factor (a fixed
+    rate or a CPI draw), rounded to whole dollars each year as the original
+    schedule did, so the cumulative product is taken one column at a time.
+    Escalation is skipped for years whose anniversary month falls inside the
+    free rent period, matching the per-row loop.
+    """
+
+    num_years = max(int(num_years), 1)
+    rents = np.empty((len(terms["monthly_rent"]), num_years))
+    rents[:, 0] = terms["monthly_rent"]
+
+    fixed = terms["escalation_type"] == "Fixed %"
+    cpi = terms["escalation_type"] == "CPI"
+    cpi_factors = rng.uniform(1.01, 1.04, size=(len(rents), num_years - 1))
+    factors = np.where(fixed[:, None], 1 + terms["escalation_rate"][:, None], cpi_factors)
+
+    for year in range(1, num_years):
+        escalates = (fixed | cpi) & (year * 12 >= terms["free_rent_months"])
+        rents[:, year] = np.where(
+            escalates, np.rint(rents[:, year - 1] * factors[:, year - 1]), rents[:, year - 1]
+        )
+    return rents
+
+
+def _schedule_rows(leases_df, terms, lease_idx, month_offset, rents, rng):
+    """Build payment schedule rows for ``(lease, month offset)`` pairs.
+
+    ``month_offset`` counts months from each lease's first billing month.
+    Offsets inside the free rent period are dropped.
+    """
+
+    keep = month_offset >= terms["free_rent_months"][lease_idx]
+    lease_idx = lease_idx[keep]
+    month_offset = month_offset[keep]
+
+    bill_month = terms["first_month"][lease_idx] + month_offset
+    in_advance = terms["in_advance"][lease_idx]
+
+    amount = rents[lease_idx, month_offset // 12].copy()
+
+    # Proration only for the first month, based on the lease start date
+    is_prorated = (month_offset == 0) & terms["pro_rated_start"][lease_idx]
+    days_in_month = terms["lease_start_days_in_month"][lease_idx][is_prorated]
+    start_day = terms["lease_start_day"][lease_idx][is_prorated]
+    amount[is_prorated] = np.round(
+        amount[is_prorated] * (days_in_month - start_day + 1) / days_in_month, 2
+    )
+
+    bill_period_start = _month_start(bill_month)
+    escal_type = terms["escalation_type"][lease_idx]
+
+    return pd.DataFrame({
+        "id": uids(len(lease_idx), rng),
+        "lease_id": leases_df["id"].to_numpy()[lease_idx],
+        "property_id": leases_df["property_id"].to_numpy()[lease_idx],
+        "unit_id": leases_df["unit_id"].to_numpy()[lease_idx],
+        "tenant_id": leases_df["tenant_id"].to_numpy()[lease_idx],
+        "schd_dt": _month_start(bill_month + np.where(in_advance, 0, 1)),
+        "pymnt_amt": amount,
+        "escal_type": escal_type,
+        "is_prorated": is_prorated,
+        "bill_period_start": bill_period_start,
+        "bill_period_end": _month_start(bill_month + 1) - np.timedelta64(1, "D"),
+        "billing_basis": np.where(in_advance, "Advance", "Arrears"),
+        "yr": bill_month // 12,
+        "mo_txt": pd.DatetimeIndex(bill_period_start).month_name(),
+    })
+
+
+def generate_rent_escalations(leases_df, rng=None):
+    """Draw each lease's monthly rent for every year of its term.
+
+    This is the escalation state behind the payment schedule: fixed
+    escalations are deterministic but CPI escalations are random, so the
+    drawn rents are persisted (one row per lease and lease year) and reused
+    when later runs bill the same leases.
+    """
+
+    rng = _get_rng(rng)
+    terms = _schedule_terms(leases_df)
+    num_years = np.clip(terms["term_months"], 0, None) // 12 + 1
+    rents = _escalated_rents(terms, num_years.max() if len(num_years) else 1, rng)
+
+    lease_idx = np.repeat(np.arange(len(leases_df)), num_years)
+    lease_year = np.arange(len(lease_idx)) - np.repeat(np.cumsum(num_years) - num_years, num_years)
+    return apply_schema(pd.DataFrame({
+        "lease_id": leases_df["id"].to_numpy()[lease_idx],
+        "property_id": leases_df["property_id"].to_numpy()[lease_idx],
+        "lease_year": lease_year,
+        "monthly_rent": rents[lease_idx, lease_year],
+    }), "rent_escalations")
+
+
+def _rent_matrix(leases_df, terms, escalations, num_years):
+    """Lay ``escalations`` out as the ``(lease, lease year)`` matrix ``_schedule_rows`` reads.
+
+    Years missing from the table (or leases missing entirely) carry the
+    last known rent forward, starting from the lease's monthly rent.
+    """
+
+    num_years = max(int(num_years), 1)
+    rents = np.full((len(leases_df), num_years), np.nan)
+    rents[:, 0] = terms["monthly_rent"]
+
+    lease_pos = pd.Index(leases_df["id"].astype(str)).get_indexer(escalations["lease_id"].astype(str))
+    year = escalations["lease_year"].to_numpy(dtype=np.int64)
+    found = (lease_pos >= 0) & (year < num_years)
+    rents[lease_pos[found], year[found]] = escalations["monthly_rent"].to_numpy(dtype=float)[found]
+    return pd.DataFrame(rents).ffill(axis=1).to_numpy()
+
+
+def generate_lease_pymnt_sched(leases_df, months_out, rng=None, escalations=None):
     """Create a payment schedule for each lease.
 
     Handles annual rent escalations and optional proration of the first
-    month's rent.
+    month's rent. The full lease x month grid is built at once with NumPy
+    rather than walking each lease month by month. Rents come from
+    ``escalations`` (see :func:`generate_rent_escalations`) when given and
+    are drawn otherwise.
     """
 
-    schedule = []
+    rng = _get_rng(rng)
+    terms = _schedule_terms(leases_df)
 
-    for _, lease in leases_df.iterrows():
-        lease_id = lease["id"]
-        property_id = lease["property_id"]
-        unit_id = lease["unit_id"]
-        tenant_id = lease["tenant_id"]
-
-        lease_start = pd.to_datetime(lease.get("lease_start", today))
-        rent_start = pd.to_datetime(lease.get("rent_start_date", lease_start))
-        lease_end = pd.to_datetime(lease.get("lease_end", lease_start + timedelta(days=730)))
-
-        monthly_rent = lease.get("monthly_rent", 10000)
-        escalation_type = lease.get("escalation_type")
-        escalation_rate = lease.get(
-            "escalation_rate", 0.03 if escalation_type == "Fixed %" else 0
-        )
-        pay_in_advance = lease.get("payment_timing", "In Advance") == "In Advance"
-        free_rent_months = lease.get("free_rent_months", 0)
-        pro_rated_start = lease.get("pro_rated_start", False)
+    num_months = np.clip(np.minimum(months_out, terms["term_months"] + 1), 0, None)
+    lease_idx = np.repeat(np.arange(len(leases_df)), num_months)
+    group_start = np.repeat(np.cumsum(num_months) - num_months, num_months)
+    month_offset = np.arange(len(lease_idx)) - group_start
 
-        first_bill_month = rent_start.replace(day=1)
-        lease_term_months = (lease_end.year - first_bill_month.year) * 12 + (
-            lease_end.month - first_bill_month.month
-        )
+    num_years = -(-num_months.max() // 12) if len(num_months) else 1
+    if escalations is None:
+        rents = _escalated_rents(terms, num_years, rng)
+    else:
+        rents = _rent_matrix(leases_df, terms, escalations, num_years)
 
-        current_rent = monthly_rent
-
-        for i in range(min(months_out, lease_term_months + 1)):
-            bill_month = first_bill_month + relativedelta(months=i)
-            bill_period_start = bill_month
-            bill_period_end = (bill_month + relativedelta(months=1)) - timedelta(days=1)
-
-            # Check if this is within free rent period
-            if i < free_rent_months:
-                continue
-
-            # Escalate rent annually
-            if i > 0 and i % 12 == 0:
-                if escalation_type == "Fixed %":
-                    current_rent = round(current_rent * (1 + escalation_rate))
-                elif escalation_type == "CPI":
-                    current_rent = round(
-                        current_rent * random.uniform(1.01, 1.04)
-                    )
-
-            effective_rent = current_rent
-
-            # Proration only for the first month
-            is_prorated = False
-            if i == 0 and pro_rated_start:
-                days_in_month = calendar.monthrange(
-                    lease_start.year, lease_start.month
-                )[1]
-                proration_factor = (
-                    days_in_month - lease_start.day + 1
-                ) / days_in_month
-                effective_rent = round(effective_rent * proration_factor, 2)
-                is_prorated = True
-
-            # Billing date logic
-            bill_date = (
-                bill_month if pay_in_advance else bill_month + relativedelta(months=1)
-            )
-
-            schedule.append({
-                "id": uid(),
-                "lease_id": lease_id,
-                "property_id": property_id,
-                "unit_id": unit_id,
-                "tenant_id": tenant_id,
-                "schd_dt": bill_date,
-                "pymnt_amt": effective_rent,
-                "escal_type": escalation_type,
-                "is_prorated": is_prorated,
-                "bill_period_start": bill_period_start,
-                "bill_period_end": bill_period_end,
-                "billing_basis": "Advance" if pay_in_advance else "Arrears",
-                "yr": bill_month.year,
-                "mo_txt": bill_month.strftime("%B")
-            })
+    return apply_schema(_schedule_rows(leases_df, terms, lease_idx, month_offset, rents, rng), "payment_schedule")
+
+
+def lease_pymnt_sched_between(leases_df, escalations, start, end=None, months_out=None, rng=None):
+    """Return only the payment schedule rows due from ``start`` to ``end`` inclusive.
 
-    return pd.DataFrame(schedule)
+    Payments fall on the first of a month, so the due months in the range
+    are enumerated and each lease's month offset is computed directly from
+    its terms. The cost is proportional to leases x due months in the range
+    rather than to the length of every lease, and amounts come from the
+    persisted ``escalations``, so they match the schedule generated for the
+    same leases by :func:`generate_lease_pymnt_sched`.
+
+    Args:
+        leases_df (pd.DataFrame): Leases to bill.
+        escalations (pd.DataFrame): Escalation state from
+            :func:`generate_rent_escalations`.
+        start (date): First due date to include.
+        end (date, optional): Last due date to include. Defaults to ``start``.
+        months_out (int, optional): Only the first ``months_out`` months of
+            each lease are billed, as with ``generate_lease_pymnt_sched``.
+    """
+
+    rng = _get_rng(rng)
+    start = pd.Timestamp(start)
+    end = start if end is None else pd.Timestamp(end)
+    terms = _schedule_terms(leases_df)
+
+    first_due = _month_index([start])[0] + (start.day > 1)
+    due_month = np.arange(first_due, _month_index([end])[0] + 1)
+    # Arrears leases are billed the month after the period
+    month_offset = due_month[None, :] - terms["first_month"][:, None] - (~terms["in_advance"])[:, None]
+    last_offset = terms["term_months"] if months_out is None else np.minimum(terms["term_months"], months_out - 1)
+    valid = (month_offset >= 0) & (month_offset <= last_offset[:, None])
+    lease_idx, due_idx = np.nonzero(valid)
+    month_offset = month_offset[lease_idx, due_idx]
+
+    num_years = month_offset.max() // 12 + 1 if len(month_offset) else 1
+    rents = _rent_matrix(leases_df, terms, escalations, num_years)
+    return apply_schema(_schedule_rows(leases_df, terms, lease_idx, month_offset, rents, rng), "payment_schedule")
 
 # ------------ Simulate Customer Invoices ------------
-def generate_cust_invoices(payment_schedule, leases, tenants):
-    cust_invoices = []
-
-    for _, payment in payment_schedule.iterrows():
-        lease_id = payment["lease_id"]
-        tenant_id = payment.get("tenant_id")
-        property_id = payment.get("property_id")
-        unit_id = payment.get("unit_id")
-        invoice_date = payment["schd_dt"].date()
-        amount_due = payment["pymnt_amt"]
-        billing_start = payment["bill_period_start"]
-        billing_end = payment["bill_period_end"]
-        billing_basis = payment["billing_basis"]
-        is_prorated = payment["is_prorated"]
-
-        due_date = invoice_date + timedelta(days=random.choice([5, 7, 10]))
-
-        days_past_due = (today - due_date).days
-        if days_past_due <= 0:
-            status = "Unpaid"
-        elif days_past_due <= 30:
-            status = random.choices(["Unpaid", "Paid"], weights=[0.7, 0.3])[0]
-        else:
-            status = random.choices(["Paid", "Overdue"], weights=[0.7, 0.3])[0]
+def _invoice_status(days_past_due, rng):
+    """Simulate invoice status from the number of days past the due date.
 
-        lease_row = leases[leases["id"] == lease_id]
-        tenant_row = tenants[tenants["id"] == tenant_id]
+    Invoices not yet due stay unpaid, recently due invoices are mostly
+    unpaid and older invoices are mostly paid.
+    """
 
-        lease_type = lease_row.iloc[0]["lease_type"] if not lease_row.empty else "Commercial"
-        tenant_name = tenant_row.iloc[0]["business_name"] if not tenant_row.empty else "Tenant"
+    days_past_due = np.asarray(days_past_due)
+    draw = rng.random(len(days_past_due))
+    status = np.where(draw < 0.7, "Paid", "Overdue")
+    status = np.where(days_past_due <= 30, np.where(draw < 0.7, "Unpaid", "Paid"), status)
+    return np.where(days_past_due <= 0, "Unpaid", status)
 
-        description = f"{lease_type} rent due for {tenant_name} covering {billing_start.strftime('%b %Y')}"
-        if is_prorated:
-            description += " (prorated)"
-        if billing_basis == "Advance":
-            description += " — billed in advance"
-        elif billing_basis == "Arrears":
-            description += " — billed in arrears"
 
-        cust_invoices.append({
-            "id": uid(),
-            "invoice_date": invoice_date,
-            "due_date": due_date,
-            "tenant_id": tenant_id,
-            "property_id": property_id,
-            "unit_id": unit_id,
-            "lease_id": lease_id,
-            "billing_period_start": billing_start,
-            "billing_period_end": billing_end,
-            "amount_due": amount_due,
-            "status": status,
-            "payment_date": None,
-            "description": description
-        })
+def generate_cust_invoices(payment_schedule, leases, tenants, rng=None, as_of=None):
+    """Create one customer invoice per payment schedule row.
+
+    Lease types and tenant names are joined through keyed lookups instead of
+    filtering ``leases`` and ``tenants`` for every schedule row. Invoice
+    status is evaluated on ``as_of`` (default: today).
+    """
 
-    return pd.DataFrame(cust_invoices)
+    rng = _get_rng(rng)
+    sched = payment_schedule.reset_index(drop=True)
+
+    invoice_date = pd.to_datetime(sched["schd_dt"]).dt.normalize()
+    due_date = invoice_date + pd.to_timedelta(rng.choice([5, 7, 10], size=len(sched)), unit="D")
+    days_past_due = (pd.Timestamp(_as_of(as_of)) - due_date).dt.days
+    status = _invoice_status(days_past_due, rng)
+
+    lease_types = leases.drop_duplicates("id").set_index("id")["lease_type"]
+    tenant_names = tenants.drop_duplicates("id").set_index("id")["business_name"]
+    lease_type = sched["lease_id"].map(lease_types).fillna("Commercial").astype(str)
+    tenant_name = sched["tenant_id"].map(tenant_names).fillna("Tenant").astype(str)
+
+    # Billing periods repeat across leases, so only format each month once
+    billing_start = pd.to_datetime(sched["bill_period_start"])
+    periods, period_idx = np.unique(billing_start.to_numpy(), return_inverse=True)
+    billing_label = pd.Series(pd.DatetimeIndex(periods).strftime("%b %Y").to_numpy()[period_idx]).astype(str)
+    billing_suffix = sched["billing_basis"].astype(str).map({
+        "Advance": " — billed in advance",
+        "Arrears": " — billed in arrears",
+    }).fillna("")
+    description = (
+        lease_type + " rent due for " + tenant_name + " covering " + billing_label
+        + np.where(sched["is_prorated"].astype(bool), " (prorated)", "")
+        + billing_suffix
+    )
+
+    return apply_schema(pd.DataFrame({
+        "id": uids(len(sched), rng),
+        "invoice_date": invoice_date.dt.date,
+        "due_date": due_date.dt.date,
+        "tenant_id": sched["tenant_id"],
+        "property_id": sched["property_id"],
+        "unit_id": sched["unit_id"],
+        "lease_id": sched["lease_id"],
+        "billing_period_start": sched["bill_period_start"],
+        "billing_period_end": sched["bill_period_end"],
+        "amount_due": sched["pymnt_amt"],
+        "status": status,
+        "payment_date": None,
+        "description": description,
+    }), "cust_invoices")
 
 # ------------ Simulate Vendor Invoices ------------
-def generate_vendor_invoices(vendors, properties_df, leases, coa, min_invoices, max_invoices):
+def generate_vendor_invoices(vendors, properties_df, leases, coa, min_invoices, max_invoices, rng=None,
+                             invoice_dates=None, as_of=None):
     """Generate vendor invoices for each property.
 
     Each property receives a random number of invoices between ``min_invoices``
@@ -676,9 +939,16 @@ def generate_vendor_invoices(vendors, properties_df, leases, coa, min_invoices,
     could be reassigned inside the loop, which led to some properties receiving
     no invoices at all. The sampling now consistently uses the outer loop's
     property.
-    """
 
-    vend_invoices = []
+    The chart of accounts, each property's earliest lease start and the
+    vendor -> GL weights are turned into lookup arrays up front, and every
+    invoice is then drawn in a single batch.
+
+    Invoices are dated between the property's earliest lease start and
+    ``as_of`` (default: today), unless ``invoice_dates`` (one date per row
+    of ``properties_df``) fixes the date of each property's invoices.
+    Invoice status is evaluated on ``as_of``.
+    """
 
     vendor_gl_mapping = {
         "Legal & Regulatory Counsel": (["60220", "60230", "60325", "60415", "60520", "60530", "60615", "60715"], [0.02, 0.02, 0.02, 0.04, 0.05, 0.15, 0.5, 0.15]),
@@ -702,199 +972,266 @@ def generate_vendor_invoices(vendors, properties_df, leases, coa, min_invoices,
         "Landscaping & Outdoor Services": (["50120", "50210"], [0.8, 0.2]),
     }
 
-    for _, property_row in properties_df.iterrows():
-        num_invoices = random.randint(min_invoices, max_invoices)
-
-        for _ in range(num_invoices):
-            vendor_row = vendors.sample(1).iloc[0]
-            vendor_category = vendor_row["service_type"]
-            gls, gl_weights = vendor_gl_mapping.get(vendor_category, ([], []))
-            chosen_gl = random.choices(gls, weights=gl_weights, k=1)[0] if gls else None
-
-            coa_info = coa[coa["acct_number"].astype(str) == chosen_gl]
-            coa_info = coa_info.iloc[0].to_dict() if not coa_info.empty else {
-                "acct_number": chosen_gl,
-                "acct_name": "Unknown",
-                "acct_class": "Unclassified",
-                "acct_type": "Unknown"
-            }
-
-            lease_start = leases[leases["property_id"] == property_row["property_id"]]["lease_start"].min()
-            lease_start = lease_start if pd.notna(lease_start) else date.today() - relativedelta(years=2)
-            invoice_date = fake.date_between(start_date=lease_start, end_date="today")
-            due_date = invoice_date + timedelta(days=random.choice([15, 30]))
-            amount_due = round(random.uniform(500, 10000), 2)
-
-            # Simulate payment status
-            days_past_due = (today - due_date).days
-            if days_past_due <= 0:
-                status = "Unpaid"
-            elif days_past_due <= 30:
-                status = random.choices(["Unpaid", "Paid"], [0.7, 0.3])[0]
-            else:
-                status = random.choices(["Paid", "Overdue"], [0.7, 0.3])[0]
+    rng = _get_rng(rng)
+    as_of = _as_of(as_of)
+
+    # Lookup tables built once per call rather than once per invoice
+    coa_lookup = coa.drop_duplicates("acct_number").astype({"acct_number": object})
+    coa_lookup = coa_lookup.set_index(coa_lookup["acct_number"].astype(str))
+    earliest_lease_start = pd.to_datetime(leases["lease_start"]).groupby(leases["property_id"]).min()
+
+    # Weighted vendor -> GL sampling arrays: one row of cumulative weights per vendor
+    categories = vendors["service_type"].to_numpy()
+    max_gls = max(len(gls) for gls, _ in vendor_gl_mapping.values())
+    vendor_gls = np.full((len(vendors), max_gls), None, dtype=object)
+    vendor_cum_weights = np.full((len(vendors), max_gls), np.inf)
+    for i, category in enumerate(categories):
+        gls, gl_weights = vendor_gl_mapping.get(category, ([], []))
+        if gls:
+            cum_weights = np.cumsum(gl_weights) / np.sum(gl_weights)
+            cum_weights[-1] = 1.0
+            vendor_gls[i, :len(gls)] = gls
+            vendor_cum_weights[i, :len(gls)] = cum_weights
+
+    # Expand properties into one row per invoice and draw every invoice at once
+    num_invoices = rng.integers(min_invoices, max_invoices + 1, size=len(properties_df))
+    prop_idx = np.repeat(np.arange(len(properties_df)), num_invoices)
+    property_ids = properties_df["property_id"].to_numpy()[prop_idx]
+    property_names = _column(properties_df, "property_name", "Property").to_numpy()[prop_idx]
+
+    vendor_idx = rng.integers(0, len(vendors), size=len(prop_idx))
+    gl_draw = rng.random(len(prop_idx))
+    gl_choice = (gl_draw[:, None] >= vendor_cum_weights[vendor_idx]).sum(axis=1)
+    chosen_gl = vendor_gls[vendor_idx, np.minimum(gl_choice, max_gls - 1)]
+
+    coa_info = coa_lookup.reindex(chosen_gl.astype(str))
+    gl_account = coa_info["acct_number"].where(coa_info["acct_number"].notna(), chosen_gl).infer_objects()
+
+    if invoice_dates is None:
+        fallback_start = pd.Timestamp(as_of - relativedelta(years=2))
+        lease_start = earliest_lease_start.reindex(property_ids).fillna(fallback_start).reset_index(drop=True)
+        invoice_date = random_dates_between(lease_start, as_of, rng)
+    else:
+        invoice_date = pd.Series(pd.to_datetime(np.asarray(invoice_dates)[prop_idx])).dt.normalize()
+    due_date = invoice_date + pd.to_timedelta(rng.choice([15, 30], size=len(prop_idx)), unit="D")
+    amount_due = np.round(rng.uniform(500, 10000, size=len(prop_idx)), 2)
+
+    # Simulate payment status
+    days_past_due = (pd.Timestamp(as_of) - due_date).dt.days
+    status = _invoice_status(days_past_due, rng)
+
+    vendor_category = pd.Series(categories[vendor_idx], dtype=object)
+    description = vendor_category + " invoice for " + pd.Series(property_names, dtype=object).astype(str)
+
+    return apply_schema(pd.DataFrame({
+        "id": uids(len(prop_idx), rng),
+        "invoice_date": invoice_date.dt.date,
+        "due_date": due_date.dt.date,
+        "property_id": property_ids,
+        "vendor_id": vendors["id"].to_numpy()[vendor_idx],
+        "vendor_name": vendors["name"].to_numpy()[vendor_idx],
+        "amount_due": amount_due,
+        "status": status,
+        "payment_date": None,
+        "description": description,
+        "gl_account": gl_account.to_numpy(),
+        "gl_account_name": coa_info["acct_name"].fillna("Unknown").to_numpy(),
+        "gl_class": coa_info["acct_class"].fillna("Unclassified").to_numpy(),
+        "gl_type": coa_info["acct_type"].fillna("Unknown").to_numpy(),
+    }), "vend_invoices")
+
+# ------------ Simulate Payments ------------
+def settle_invoices(invoices, rng=None, as_of=None):
+    """Return the paid invoices with a simulated ``payment_date`` column.
+
+    Payment lag is drawn for every paid invoice at once: 70% are paid
+    within the invoice terms, 15% 1-30 days late, 10% 31-60 days late and
+    5% 90-120 days late. Invoices whose payment falls after ``as_of``
+    (default: today) are still open then and left out. The input frame is
+    not modified.
+    """
 
-            description = f"{vendor_category} invoice for {property_row.get('property_name', 'Property')}"
+    rng = _get_rng(rng)
+    as_of = pd.Timestamp(_as_of(as_of))
+    paid = invoices[invoices["status"] == "Paid"]
+    due_date = pd.to_datetime(paid["due_date"])
+    terms_days = (due_date - pd.to_datetime(paid["invoice_date"])).dt.days.clip(lower=0).to_numpy(dtype=np.int64)
 
-            vend_invoices.append({
-                "id": uid(),
-                "invoice_date": invoice_date,
-                "due_date": due_date,
-                "property_id": property_row["property_id"],
-                "vendor_id": vendor_row["id"],
-                "vendor_name": vendor_row["name"],
-                "amount_due": amount_due,
-                "status": status,
-                "payment_date": None,
-                "description": description,
-                "gl_account": coa_info["acct_number"],
-                "gl_account_name": coa_info["acct_name"],
-                "gl_class": coa_info["acct_class"],
-                "gl_type": coa_info["acct_type"]
-            })
+    bucket = rng.choice(4, size=len(paid), p=[0.70, 0.15, 0.10, 0.05])
+    low = np.array([0, 1, 31, 90])[bucket]
+    high = np.where(bucket == 0, terms_days, np.array([0, 30, 60, 120])[bucket])
+    lag_days = rng.integers(low, high + 1)
+
+    payment_date = due_date + pd.to_timedelta(lag_days, unit="D")
+    return paid.assign(payment_date=payment_date)[payment_date <= as_of]
+
+
+def apply_payment_dates(invoices, payments, date_col):
+    """Return ``invoices`` with ``payment_date`` taken from ``payments[date_col]``.
 
-    return pd.DataFrame(vend_invoices)
+    Payments are matched on ``invoice_id``; invoices without a payment keep
+    an empty payment date, and those marked Paid without one (paid after
+    the as-of date) are still open, so they become Unpaid.
+    """
+
+    paid_on = payments.drop_duplicates("invoice_id").set_index("invoice_id")[date_col]
+    payment_date = paid_on.reindex(invoices["id"]).to_numpy()
+    status = np.where((invoices["status"] == "Paid") & pd.isna(payment_date), "Unpaid", invoices["status"])
+    return invoices.assign(payment_date=payment_date, status=status)
 
 # ------------ Simulate Check Register ------------ (based on invoices that are marked "Paid")
-def generate_checkreg(vend_invoices):
-    checkreg = []
-    paid_invoices = vend_invoices[vend_invoices["status"] == "Paid"]
-    for idx, inv in paid_invoices.iterrows():
-        lag_choice = random.choices(
-            ["on_time", "late_30", "late_60", "late_90"],
-            weights=[0.70, 0.15, 0.10, 0.05],
-        )[0]
-        if lag_choice == "on_time":
-            lag_days = random.randint(0, max(0, (inv["due_date"] - inv["invoice_date"]).days))
-        elif lag_choice == "late_30":
-            lag_days = random.randint(1, 30)
-        elif lag_choice == "late_60":
-            lag_days = random.randint(31, 60)
-        else:
-            lag_days = random.randint(90, 120)
-        check_date = inv["due_date"] + timedelta(days=lag_days)
-        vend_invoices.at[idx, "payment_date"] = check_date
-        checkreg.append({
-            "id": uid(),
-            "invoice_id": inv["id"],
-            "vendor_id": inv["vendor_id"],
-            "check_number": str(random.randint(10000, 99999)),
-            "check_date": check_date,
-            "amount": inv["amount_due"],
-            "property_id": inv["property_id"],
-            "gltran_id": None,
-            "created_by": "system",
-            "created_at": datetime.now(),
-            "modified_by": "system",
-            "modified_at": datetime.now()
-        })
-    return pd.DataFrame(checkreg)
+def generate_checkreg(vend_invoices, rng=None, as_of=None):
+    """Issue one check per paid vendor invoice, dated no later than ``as_of``.
+
+    The invoice frame is left untouched; use :func:`apply_payment_dates`
+    to carry ``check_date`` back onto the invoices.
+    """
+
+    rng = _get_rng(rng)
+    paid = settle_invoices(vend_invoices, rng, as_of)
+    now = datetime.now()
+    return apply_schema(pd.DataFrame({
+        "id": uids(len(paid), rng),
+        "invoice_id": paid["id"].to_numpy(),
+        "vendor_id": paid["vendor_id"].to_numpy(),
+        "check_number": rng.integers(10000, 100000, size=len(paid)).astype(str),
+        "check_date": paid["payment_date"].to_numpy(),
+        "amount": paid["amount_due"].to_numpy(),
+        "property_id": paid["property_id"].to_numpy(),
+        "gltran_id": None,
+        "created_by": "system",
+        "created_at": now,
+        "modified_by": "system",
+        "modified_at": now
+    }), "checkreg")
 
 # ------------ Simulate Receipts ------------ (simulate receipts from leases)
-def generate_receipts(cust_invoices):
-    receipts = []
-    paid_invoices = cust_invoices[cust_invoices["status"] == "Paid"]
-    for idx, inv in paid_invoices.iterrows():
-        lag_choice = random.choices(
-            ["on_time", "late_30", "late_60", "late_90"],
-            weights=[0.70, 0.15, 0.10, 0.05],
-        )[0]
-        if lag_choice == "on_time":
-            lag_days = random.randint(0, max(0, (inv["due_date"] - inv["invoice_date"]).days))
-        elif lag_choice == "late_30":
-            lag_days = random.randint(1, 30)
-        elif lag_choice == "late_60":
-            lag_days = random.randint(31, 60)
-        else:
-            lag_days = random.randint(90, 120)
-        receipt_date = inv["due_date"] + timedelta(days=lag_days)
-        cust_invoices.at[idx, "payment_date"] = receipt_date
-        receipts.append({
-            "id": uid(),
-            "invoice_id": inv["id"],
-            "tenant_id": inv["tenant_id"],
-            "receipt_id": str(random.randint(10000,99999)),
-            "receipt_date": receipt_date,
-            "amount": inv["amount_due"],
-            "payment_method": random.choice(["ACH", "Check", "Credit Card"]),
-            "property_id": inv["property_id"],
-            "gltran_id": None,
-            "created_by": "system",
-            "created_at": datetime.now(),
-            "modified_by": "system",
-            "modified_at": datetime.now()
-        })
-    return pd.DataFrame(receipts)
+def generate_receipts(cust_invoices, rng=None, as_of=None):
+    """Record one receipt per paid customer invoice, dated no later than ``as_of``.
 
-# ------------ Simulate GL Transactions ------------
-def generate_gltran(cust_invoices, vend_invoices, receipts, checkreg, coa_df):
-    gl_entries = []
+    The invoice frame is left untouched; use :func:`apply_payment_dates`
+    to carry ``receipt_date`` back onto the invoices.
+    """
 
-    def resolve_account(name):
-        match = coa_df[coa_df["acct_name"].str.contains(name, case=False, na=False)]
-        return match.iloc[0]["acct_name"] if not match.empty else name
+    rng = _get_rng(rng)
+    paid = settle_invoices(cust_invoices, rng, as_of)
+    now = datetime.now()
+    return apply_schema(pd.DataFrame({
+        "id": uids(len(paid), rng),
+        "invoice_id": paid["id"].to_numpy(),
+        "tenant_id": paid["tenant_id"].to_numpy(),
+        "receipt_id": rng.integers(10000, 100000, size=len(paid)).astype(str),
+        "receipt_date": paid["payment_date"].to_numpy(),
+        "amount": paid["amount_due"].to_numpy(),
+        "payment_method": rng.choice(["ACH", "Check", "Credit Card"], size=len(paid)),
+        "property_id": paid["property_id"].to_numpy(),
+        "gltran_id": None,
+        "created_by": "system",
+        "created_at": now,
+        "modified_by": "system",
+        "modified_at": now
+    }), "receipts")
 
-    def create_entry(source, source_id, property_id, amount, debit_acct, credit_acct, tenant_id=None, vendor_id=None):
-        batch_id = uid()
-        timestamp = datetime.now()
-        cleared = random_bool()
+# ------------ Simulate GL Transactions ------------
+def _resolve_accounts(names, coa_df):
+    """Map GL account names onto the first matching chart of accounts name.
 
-        for entry_type, acct in [("Debit", debit_acct), ("Credit", credit_acct)]:
-            gl_entries.append({
-                "id": uid(),
-                "date": timestamp.date(),
-                "amount": amount,
-                "debit_credit": entry_type,
-                "account_id": resolve_account(acct),
-                "property_id": property_id,
-                "tenant_id": tenant_id,
-                "vendor_id": vendor_id,
-                "transaction_type": source,
-                "source_document": source_id,
-                "batch_id": batch_id,
-                "cleared_in_bank": cleared,
-                "created_by": "system",
-                "created_at": timestamp,
-                "modified_by": "system",
-                "modified_at": timestamp
-            })
-        return batch_id
-
-    for i, row in cust_invoices.iterrows():
-        if row["status"] == "Paid":
-            gl_id = create_entry("Customer Invoice", row["id"], row["property_id"], row["amount_due"],
-                                 "Tenant Receivable", "Rent Revenue", tenant_id=row["tenant_id"])
-            cust_invoices.at[i, "gltran_id"] = gl_id
-
-    for i, row in vend_invoices.iterrows():
-        if row["status"] == "Paid":
-            gl_id = create_entry("Vendor Invoice", row["id"], row["property_id"], row["amount_due"],
-                                 row["gl_account_name"], "Accounts Payable", vendor_id=row["vendor_id"])
-            vend_invoices.at[i, "gltran_id"] = gl_id
-
-    for i, row in receipts.iterrows():
-        gl_id = create_entry(
-            "Receipt",
-            row["id"],
-            row["property_id"],
-            row["amount"],
-            "Cash",
-            "Tenant Receivable",
-            tenant_id=row["tenant_id"],
-        )
-        receipts.at[i, "gltran_id"] = gl_id
+    Each distinct name is matched against the chart once; names without a
+    match are kept as-is.
+    """
 
-    for i, row in checkreg.iterrows():
-        gl_id = create_entry("Check", row["id"], row["property_id"], row["amount"],
-                                "Accounts Payable", "Cash", vendor_id=row["vendor_id"])
-        checkreg.at[i, "gltran_id"] = gl_id
+    resolved = {}
+    for name in pd.unique(pd.Series(names, dtype=object).dropna()):
+        match = coa_df[coa_df["acct_name"].str.contains(name, case=False, na=False)]
+        resolved[name] = match.iloc[0]["acct_name"] if not match.empty else name
+    return resolved
+
+
+def _gl_documents(source, docs, amount_col, debit_acct, credit_acct, tenant_col=None, vendor_col=None):
+    """Describe one double-entry posting per source document."""
+
+    if docs.empty:
+        return pd.DataFrame(columns=[
+            "transaction_type", "source_document", "property_id", "amount",
+            "debit_acct", "credit_acct", "tenant_id", "vendor_id",
+        ])
+    return pd.DataFrame({
+        "transaction_type": source,
+        "source_document": docs["id"].to_numpy(),
+        "property_id": docs["property_id"].to_numpy(),
+        "amount": docs[amount_col].to_numpy(),
+        "debit_acct": debit_acct if np.isscalar(debit_acct) else np.asarray(debit_acct),
+        "credit_acct": credit_acct,
+        "tenant_id": docs[tenant_col].to_numpy() if tenant_col else None,
+        "vendor_id": docs[vendor_col].to_numpy() if vendor_col else None,
+    })
+
+
+def generate_gltran(cust_invoices, vend_invoices, receipts, checkreg, coa_df, rng=None):
+    """Post double-entry GL transactions for paid documents.
+
+    Paid customer and vendor invoices, receipts and checks each produce a
+    debit/credit pair sharing a ``batch_id``. The pairs are built as columns
+    for all documents at once, and each source frame is returned with its
+    ``gltran_id`` set to the batch that posted it.
+    """
+
+    rng = _get_rng(rng)
+
+    paid_cust = cust_invoices[cust_invoices["status"] == "Paid"]
+    paid_vend = vend_invoices[vend_invoices["status"] == "Paid"]
+    docs = pd.concat([
+        _gl_documents("Customer Invoice", paid_cust, "amount_due", "Tenant Receivable", "Rent Revenue",
+                      tenant_col="tenant_id"),
+        _gl_documents("Vendor Invoice", paid_vend, "amount_due", paid_vend["gl_account_name"],
+                      "Accounts Payable", vendor_col="vendor_id"),
+        _gl_documents("Receipt", receipts, "amount", "Cash", "Tenant Receivable", tenant_col="tenant_id"),
+        _gl_documents("Check", checkreg, "amount", "Accounts Payable", "Cash", vendor_col="vendor_id"),
+    ], ignore_index=True)
+
+    batch_ids = uids(len(docs), rng)
+    cleared = rng.random(len(docs)) < 0.5
+    timestamp = datetime.now()
+
+    # Each document becomes a Debit row followed by its Credit row
+    doc_idx = np.repeat(np.arange(len(docs)), 2)
+    is_debit = np.tile([True, False], len(docs))
+    accounts = _resolve_accounts(pd.concat([docs["debit_acct"], docs["credit_acct"]]), coa_df)
+    account_name = np.where(is_debit, docs["debit_acct"].to_numpy()[doc_idx], docs["credit_acct"].to_numpy()[doc_idx])
+
+    gltran = pd.DataFrame({
+        "id": uids(len(doc_idx), rng),
+        "date": timestamp.date(),
+        "amount": docs["amount"].to_numpy()[doc_idx],
+        "debit_credit": np.where(is_debit, "Debit", "Credit"),
+        "account_id": pd.Series(account_name, dtype=object).map(accounts).to_numpy(),
+        "property_id": docs["property_id"].to_numpy()[doc_idx],
+        "tenant_id": docs["tenant_id"].to_numpy()[doc_idx],
+        "vendor_id": docs["vendor_id"].to_numpy()[doc_idx],
+        "transaction_type": docs["transaction_type"].to_numpy()[doc_idx],
+        "source_document": docs["source_document"].to_numpy()[doc_idx],
+        "batch_id": batch_ids[doc_idx],
+        "cleared_in_bank": cleared[doc_idx],
+        "created_by": "system",
+        "created_at": timestamp,
+        "modified_by": "system",
+        "modified_at": timestamp,
+    })
+
+    def with_gltran_id(frame, source):
+        if "id" not in frame.columns:
+            return frame
+        posted = docs["transaction_type"] == source
+        batch_by_doc = pd.Series(batch_ids[posted.to_numpy()], index=docs.loc[posted, "source_document"])
+        batch_by_doc = batch_by_doc[~batch_by_doc.index.duplicated()]
+        return frame.assign(gltran_id=frame["id"].map(batch_by_doc))
 
     return {
-        "gltran": pd.DataFrame(gl_entries),
-        "cust_invoices": cust_invoices,
-        "vend_invoices": vend_invoices,
-        "receipts": receipts,
-        "checkreg": checkreg
+        "gltran": apply_schema(gltran, "gltran"),
+        "cust_invoices": apply_schema(with_gltran_id(cust_invoices, "Customer Invoice"), "cust_invoices"),
+        "vend_invoices": apply_schema(with_gltran_id(vend_invoices, "Vendor Invoice"), "vend_invoices"),
+        "receipts": apply_schema(with_gltran_id(receipts, "Receipt"), "receipts"),
+        "checkreg": apply_schema(with_gltran_id(checkreg, "Check"), "checkreg")
     }
 
 # ------------ Simulate Budget & Budget Line ------------ (per property x COA x month)
@@ -950,7 +1287,7 @@ def generate_bank_transactions(bank_accounts):
                 "id": uid(),
                 "bank_account_id": acct["id"],
                 "transaction_date": random_date().date(),
-                "description": fake.sentence(),
+                "description": get_faker().sentence(),
                 "amount": amt,
                 "type": "Credit" if amt > 0 else "Debit",
                 "balance_after": round(balance, 2),
@@ -985,9 +1322,9 @@ def generate_reconciliations(properties, bank_accounts):
             "property_id": prop["property_id"],
             "bank_account_id": acct["id"],
             "reconciliation_date": datetime.now().date(),
-            "reconciled_by": fake.name(),
+            "reconciled_by": get_faker().name(),
             "variance": round(random.uniform(-500, 500), 2),
-            "note": fake.sentence(),
+            "note": get_faker().sentence(),
             "created_by": "system",
             "created_at": datetime.now(),
             "modified_by": "system",
@@ -995,47 +1332,309 @@ def generate_reconciliations(properties, bank_accounts):
         })
     return pd.DataFrame(recs)
 
-# Once all tables are generated, we'll save them in the next step
+# ------------ Portfolio ------------
+def load_portfolio(scale=None, rng=None):
+    """Return the properties to generate data for.
+
+    Args:
+        scale (int, optional): Number of synthetic properties to generate
+            from the distributions of the property listing. When omitted the
+            listing itself is used.
+    """
+
+    if scale is None:
+        return get_properties()
+    return synthesize_properties(get_properties(), scale, _get_rng(rng), faker_pool)
+
+def portfolio_partitions(scale=None, partition_size=DEFAULT_PARTITION_SIZE):
+    """Split the portfolio into ``(start, stop)`` ranges of at most ``partition_size`` properties.
+
+    Partition boundaries only depend on the portfolio size and
+    ``partition_size``, never on how many workers generate them.
+
+    Raises:
+        ValueError: If ``partition_size`` is not positive.
+    """
+
+    if partition_size <= 0:
+        raise ValueError("partition_size must be positive")
+    total = len(get_properties()) if scale is None else scale
+    return [(start, min(start + partition_size, total)) for start in range(0, total, partition_size)]
+
+def partition_rng(seed, index):
+    """Return the generator for partition ``index`` of a run seeded with ``seed``.
+
+    Each partition gets an independent stream spawned from ``seed``, so its
+    output is the same whichever process generates it and in whatever order.
+    """
 
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
 
 # ------------ Run All ------------
-def generate_all():
-    user = generate_user()
-    vendors = generate_vendors(user, num_vendors=60)
-    units = generate_units(properties_df)
-    tenants = generate_tenants(properties_df, units)
-    leases = generate_leases(properties_df, tenants, units)
-    pmnt_sched = generate_lease_pymnt_sched(leases, months_out=24)
-    cust_invoices = generate_cust_invoices(pmnt_sched, leases, tenants)
-    vend_invoices = generate_vendor_invoices(vendors, properties_df, leases, coa_df, min_invoices=50, max_invoices=300)
-    checkreg = generate_checkreg(vend_invoices)
-    receipts = generate_receipts(cust_invoices)
-    # budget, budgetline = generate_budget(properties_df, coa_df)
-    # bank_accounts = generate_bank_accounts(properties_df)
-    # bank_transactions = generate_bank_transactions(bank_accounts)
-    # bank_balances = generate_bank_balances(bank_accounts)
-    # reconciliations = generate_reconciliations(properties_df, bank_accounts)
-
-    gl_data = generate_gltran(cust_invoices, vend_invoices, receipts, checkreg, coa_df)
-    gltran = gl_data["gltran"]
-    cust_invoices = gl_data["cust_invoices"]
-    vend_invoices = gl_data["vend_invoices"]
-    receipts = gl_data["receipts"]
-    checkreg = gl_data["checkreg"]
-
-    tenants.to_csv(os.path.join(output_dir, "yardi/tenants.csv"), index=False)
-    units.to_csv(os.path.join(output_dir, "yardi/units.csv"), index=False)
-    leases.to_csv(os.path.join(output_dir, "yardi/leases.csv"), index=False)
-    pmnt_sched.to_csv(os.path.join(output_dir, "yardi/payment_schedule.csv"), index=False)
-    vendors.to_csv(os.path.join(output_dir, "yardi/vendors.csv"), index=False)
-    cust_invoices.to_csv(os.path.join(output_dir, "yardi/cust_invoices.csv"), index=False)
-    vend_invoices.to_csv(os.path.join(output_dir, "yardi/vend_invoices.csv"), index=False)
-    checkreg.to_csv(os.path.join(output_dir, "yardi/checkreg.csv"), index=False)
-    receipts.to_csv(os.path.join(output_dir, "yardi/receipts.csv"), index=False)
-    gltran.to_csv(os.path.join(output_dir, "yardi/gltran.csv"), index=False)
-    # budget.to_csv(os.path.join(output_dir, "yardi/budget.csv"), index=False)
-    # budgetline.to_csv(os.path.join(output_dir, "yardi/budgetline.csv"), index=False)
-    properties_df.to_csv(os.path.join(output_dir, "yardi/properties.csv"), index=False)
+def _billed_schedule(leases, escalations, rng=None, months_out=24, billed_before=None):
+    """Payment schedule limited to the rows due before ``billed_before``."""
+
+    schedule = generate_lease_pymnt_sched(leases, months_out=months_out, rng=rng, escalations=escalations)
+    if billed_before is not None:
+        schedule = schedule[schedule["schd_dt"].dt.date < billed_before]
+    return schedule
+
+def _post_to_gl(cust_invoices, vend_invoices, checkreg, receipts, coa, rng=None):
+    """Record payment dates on the invoices, then post every document to the GL."""
+
+    vend_invoices = apply_payment_dates(vend_invoices, checkreg, "check_date")
+    cust_invoices = apply_payment_dates(cust_invoices, receipts, "receipt_date")
+    return generate_gltran(cust_invoices, vend_invoices, receipts, checkreg, coa, rng)
+
+# Columns stamped relative to the current time, ignored when keying cached stages
+AUDIT_COLUMNS = ["created_at", "modified_at"]
+
+# Partition table -> pipeline node it is read from, in the order tables are written
+PARTITION_TABLES = {
+    "tenants": "tenants",
+    "units": "units",
+    "leases": "leases",
+    "rent_escalations": "rent_escalations",
+    "payment_schedule": "payment_schedule",
+    "cust_invoices": "gltran.cust_invoices",
+    "vend_invoices": "gltran.vend_invoices",
+    "checkreg": "gltran.checkreg",
+    "receipts": "gltran.receipts",
+    "gltran": "gltran.gltran",
+    # "budget": "budget",
+    # "budgetline": "budgetline",
+    "properties": "properties",
+}
+
+def build_pipeline(months_out=24, billed_before=None, min_vendor_invoices=50, max_vendor_invoices=300,
+                   as_of=None):
+    """Return the stage DAG generating one partition's tables.
+
+    The pipeline reads three inputs: the partition's ``properties``, the
+    shared ``vendors`` and the chart of accounts ``coa``. Vendor invoices and
+    checks only depend on properties, vendors and leases, and receipts only
+    on customer invoices, so those branches can run concurrently, and
+    changing e.g. the vendor invoice range only re-runs that branch and GL
+    posting when a stage cache is used.
+
+    Stages that date or age rows relative to ``as_of`` (default: today)
+    take it as a parameter, so cached outputs are not reused on a later day.
+    """
+
+    as_of = _as_of(as_of)
+    return Pipeline([
+        Stage("units", generate_units, ["properties"], {"as_of": as_of}),
+        Stage("tenants", generate_tenants, ["properties", "units"], {"allow_empty": True}),
+        Stage("leases", generate_leases, ["properties", "tenants", "units"], {"as_of": as_of}),
+        Stage("rent_escalations", generate_rent_escalations, ["leases"]),
+        Stage("payment_schedule", _billed_schedule, ["leases", "rent_escalations"],
+              {"months_out": months_out, "billed_before": billed_before}),
+        Stage("cust_invoices", generate_cust_invoices, ["payment_schedule", "leases", "tenants"],
+              {"as_of": as_of}),
+        Stage("vend_invoices", generate_vendor_invoices, ["vendors", "properties", "leases", "coa"],
+              {"min_invoices": min_vendor_invoices, "max_invoices": max_vendor_invoices, "as_of": as_of}),
+        Stage("checkreg", generate_checkreg, ["vend_invoices"], {"as_of": as_of}),
+        Stage("receipts", generate_receipts, ["cust_invoices"], {"as_of": as_of}),
+        Stage("gltran", _post_to_gl, ["cust_invoices", "vend_invoices", "checkreg", "receipts", "coa"],
+              outputs=["cust_invoices", "vend_invoices", "checkreg", "receipts", "gltran"]),
+        # Stage("budget", generate_budget, ["properties", "coa"], outputs=["budget", "budgetline"]),
+        # bank_accounts = generate_bank_accounts(properties)
+        # bank_transactions = generate_bank_transactions(bank_accounts)
+        # bank_balances = generate_bank_balances(bank_accounts)
+        # reconciliations = generate_reconciliations(properties, bank_accounts)
+    ])
+
+def generate_partition(properties, vendors, months_out=24, billed_before=None, seed=42, partition=0,
+                       profiler=None, cache=None, threads=1, as_of=None):
+    """Generate every property-scoped table for one partition of properties.
+
+    Tenants, leases, schedules, invoices, payments and GL entries only
+    reference properties in ``properties`` (and the shared ``vendors``), so
+    partitions can be generated and written independently. The tables are
+    produced by the stage DAG from :func:`build_pipeline`.
+
+    Args:
+        properties (pd.DataFrame): Properties in this partition.
+        vendors (pd.DataFrame): Vendors shared by every partition.
+        months_out (int): Months of payment schedule to generate per lease.
+        billed_before (date, optional): Only schedule rows due before this
+            date are kept and invoiced.
+        seed (int): Run seed; every stage draws from its own generator
+            spawned from ``seed``, ``partition`` and the stage name.
+        partition (int): Index of this partition within the portfolio.
+        profiler (StageProfiler, optional): Records time, memory and row
+            counts for every stage.
+        cache (StageCache, optional): Reuse stage outputs computed earlier
+            from the same inputs, parameters and seed.
+        threads (int): Number of independent stages run at once.
+        as_of (date, optional): Day the portfolio is generated as of; lease
+            and invoice statuses are evaluated on it. Defaults to today.
+
+    Returns:
+        dict: Table name -> DataFrame, in the order they are written.
+    """
+
+    pipeline = build_pipeline(months_out=months_out, billed_before=billed_before, as_of=as_of)
+    outputs = pipeline.run(
+        [node for node in PARTITION_TABLES.values() if node != "properties"],
+        inputs={"properties": properties, "vendors": vendors, "coa": get_coa()},
+        seed=seed,
+        spawn_key=(partition,),
+        cache=cache,
+        threads=threads,
+        profiler=profiler,
+        input_keys={"vendors": content_hash(vendors.drop(columns=AUDIT_COLUMNS, errors="ignore"))},
+    )
+    outputs["properties"] = properties
+    return {name: outputs[node] for name, node in PARTITION_TABLES.items()}
+
+def _generate_shard(task):
+    """Build one partition's tables and stage records; runs in worker processes."""
+
+    index, (start, stop), scale, vendors, months_out, billed_before, seed, options = task
+    rng = partition_rng(seed, index)
+    profiler = StageProfiler(label=f"partition-{index:05d}", profile_dir=options["profile_dir"])
+    with profiler.stage("properties", rows_in=stop - start) as stage:
+        if scale is None:
+            properties = get_properties().iloc[start:stop].reset_index(drop=True)
+        else:
+            properties = load_portfolio(stop - start, rng)
+        stage.rows_out = len(properties)
+    cache = StageCache(options["cache_dir"]) if options["cache_dir"] else None
+    tables = generate_partition(
+        properties, vendors, months_out, billed_before, seed, index, profiler, cache, options["threads"],
+        options["as_of"],
+    )
+    profiler.close()
+    return tables, profiler.records
+
+def _ordered_map(fn, tasks, workers):
+    """Yield ``fn(task)`` for each task in order using up to ``workers`` processes.
+
+    Only a few tasks per worker are in flight at a time, so finished
+    partitions do not pile up in memory while earlier ones are written.
+    """
+
+    if workers is None or workers <= 1:
+        yield from map(fn, tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(fn, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def generate_portfolio(writer, scale=None, partition_size=DEFAULT_PARTITION_SIZE, months_out=24,
+                       billed_before=None, workers=None, seed=42, profile_dir=None, cache_dir=None,
+                       stage_threads=1, as_of=None):
+    """Generate the portfolio partition by partition and stream it to ``writer``.
+
+    Users and vendors are generated once and shared by every partition.
+    Each partition's tables are appended to the outputs and released before
+    the next one is built, so peak memory depends on ``partition_size``
+    rather than the portfolio size.
+
+    Partitions are sharded across ``workers`` processes. Every partition
+    draws from its own generator spawned from ``seed`` and results are
+    written in partition order, so the output is identical for any number
+    of workers (apart from ``created_at``-style audit timestamps).
+
+    Wall time, CPU time, peak RSS and row counts of every stage are written
+    to ``run_manifest.json`` next to the outputs.
+
+    Args:
+        writer (CsvWriter | ParquetWriter): Output backend, see ``writers``.
+        scale (int, optional): Number of synthetic properties to generate.
+            Defaults to the properties in the listing.
+        partition_size (int): Properties generated per partition.
+        months_out (int): Months of payment schedule to generate per lease.
+        billed_before (date, optional): Only schedule rows due before this
+            date are kept and invoiced.
+        workers (int, optional): Number of worker processes. Defaults to
+            generating every partition in the current process.
+        seed (int): Master seed the partition generators are derived from.
+        profile_dir (str, optional): Also dump cProfile stats for every
+            stage and partition to this directory.
+        cache_dir (str, optional): Cache stage outputs here and reuse them
+            in later runs with the same inputs, parameters and seed.
+        stage_threads (int): Independent stages of a partition run on this
+            many threads.
+        as_of (date, optional): Day the portfolio is generated as of.
+            Defaults to today.
+
+    Returns:
+        str: Path of the run manifest.
+    """
+
+    profiler = StageProfiler(profile_dir=profile_dir)
+    shared_rng = np.random.default_rng(seed)
+    with profiler.stage("vendors") as stage:
+        user = generate_user(rng=shared_rng)
+        vendors = generate_vendors(user, num_vendors=60, rng=shared_rng)
+        writer.write("vendors", vendors)
+        stage.rows_out = len(vendors)
+
+    partitions = portfolio_partitions(scale, partition_size)
+    as_of = _as_of(as_of)
+    options = {"profile_dir": profile_dir, "cache_dir": cache_dir, "threads": stage_threads, "as_of": as_of}
+    tasks = (
+        (i, bounds, scale, vendors, months_out, billed_before, seed, options)
+        for i, bounds in enumerate(partitions)
+    )
+    for i, (tables, records) in enumerate(_ordered_map(_generate_shard, tasks, workers)):
+        profiler.extend(records)
+        rows = sum(len(df) for df in tables.values())
+        with profiler.stage("write", rows_in=rows) as stage:
+            for name, df in tables.items():
+                writer.write(name, df, append=i > 0)
+            stage.rows_out = rows
+        del tables
+
+    return profiler.write_manifest(writer.directory, parameters={
+        "scale": scale,
+        "partition_size": partition_size,
+        "partitions": len(partitions),
+        "months_out": months_out,
+        "billed_before": billed_before,
+        "as_of": as_of,
+        "workers": workers,
+        "seed": seed,
+        "format": writer.format,
+        "cache_dir": cache_dir,
+        "stage_threads": stage_threads,
+    })
+
+def generate_all(scale=None, partition_size=DEFAULT_PARTITION_SIZE, workers=None, writer=None, profile_dir=None,
+                 cache_dir=None, stage_threads=1):
+    """Generate every table and write them under ``output_dir``.
+
+    Args:
+        scale (int, optional): Number of synthetic properties to generate.
+            Defaults to the properties in the listing.
+        partition_size (int): Generate and write this many properties at a
+            time to bound memory use.
+        workers (int, optional): Number of processes generating partitions.
+        writer (CsvWriter | ParquetWriter, optional): Output backend.
+            Defaults to CSVs in ``output_dir/yardi``.
+        profile_dir (str, optional): Dump cProfile stats per stage here.
+        cache_dir (str, optional): Reuse stage outputs cached here.
+        stage_threads (int): Run up to this many independent stages at once.
+    """
+
+    generate_portfolio(
+        writer or CsvWriter(os.path.join(output_dir, "yardi")),
+        scale=scale,
+        partition_size=partition_size,
+        months_out=24,
+        workers=workers,
+        profile_dir=profile_dir,
+        cache_dir=cache_dir,
+        stage_threads=stage_threads,
+    )
     # bank_accounts.to_csv(os.path.join(output_dir, "banking/bank_accounts.csv"), index=False)
     # bank_transactions.to_csv(os.path.join(output_dir, "banking/bank_transactions.csv"), index=False)
     # bank_balances.to_csv(os.path.join(output_dir, "banking/bank_balances.csv"), index=False)
@@ -1045,4 +1644,27 @@ def generate_all():
 
 # Execute the script when called directly
 if __name__ == "__main__":
-    generate_all()
+    parser = argparse.ArgumentParser(description="Generate synthetic CRE data.")
+    parser.add_argument("--scale", type=int, default=None,
+                        help="number of synthetic properties (default: the property listing)")
+    parser.add_argument("--partition-size", type=int, default=DEFAULT_PARTITION_SIZE,
+                        help=f"properties generated and written at a time (default: {DEFAULT_PARTITION_SIZE})")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes generating partitions (default: 1)")
+    parser.add_argument("--profile-dir", default=None,
+                        help="dump cProfile stats for every stage to this directory")
+    parser.add_argument("--cache-dir", default=None,
+                        help="cache stage outputs here and reuse them when inputs are unchanged")
+    parser.add_argument("--stage-threads", type=int, default=1,
+                        help="independent stages of a partition run at once (default: 1)")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    generate_all(
+        scale=args.scale,
+        partition_size=args.partition_size,
+        workers=args.workers,
+        writer=writer_from_args(args, os.path.join(output_dir, "yardi")),
+        profile_dir=args.profile_dir,
+        cache_dir=args.cache_dir,
+        stage_threads=args.stage_threads,
+    )
@@ -0,0 +1,105 @@
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_POOL_SIZE = 1000
+
+
+class FakerPool:
+    """Sample Faker values in bulk from pools generated once per run.
+
+    Calling Faker once per row is far slower than NumPy sampling, so each
+    field (``"company"``, ``"name"``, ``"address"``...) is filled with
+    ``size`` values the first time it is requested and rows are then drawn
+    from that pool with a NumPy generator.
+
+    Each field's pool comes from its own Faker instance seeded from ``seed``
+    and the field name, so pool contents do not depend on the order fields
+    are requested in.
+
+    Args:
+        seed (int): Seed for the Faker instances that fill the pools.
+        size (int): Number of values kept per field.
+        cache_dir (str, optional): Directory where pools are saved as ``.npy``
+            files and reloaded on later runs, skipping Faker entirely.
+    """
+
+    def __init__(self, seed=42, size=DEFAULT_POOL_SIZE, cache_dir=None):
+        if size <= 0:
+            raise ValueError("size must be positive")
+        self.seed = seed
+        self.size = size
+        self.cache_dir = cache_dir
+        self._pools = {}
+
+    def _cache_path(self, field):
+        import faker
+
+        name = f"{field}-{self.seed}-{self.size}-faker{faker.VERSION}.npy"
+        return os.path.join(self.cache_dir, name)
+
+    def _generate(self, field):
+        # Faker is slow to import and not needed when pools come from the cache
+        from faker import Faker
+
+        fake = Faker()
+        fake.seed_instance(self.seed + zlib.crc32(field.encode()))
+        method = getattr(fake, field)
+        return np.array([method() for _ in range(self.size)], dtype=str)
+
+    def pool(self, field):
+        """Return the array of pre-generated values for ``field``."""
+
+        if field not in self._pools:
+            values = None
+            if self.cache_dir:
+                path = self._cache_path(field)
+                if os.path.exists(path):
+                    values = np.load(path, allow_pickle=False)
+            if values is None:
+                values = self._generate(field)
+                if self.cache_dir:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    np.save(self._cache_path(field), values, allow_pickle=False)
+            self._pools[field] = values.astype(object)
+        return self._pools[field]
+
+    def sample(self, field, n, rng):
+        """Draw ``n`` values of ``field`` with replacement using ``rng``."""
+
+        values = self.pool(field)
+        return values[rng.integers(0, len(values), size=n)]
+
+
+def random_dates_between(start, end, rng, size=None):
+    """Draw dates uniformly between ``start`` and ``end`` (inclusive).
+
+    Vectorized replacement for ``Faker.date_between``. ``start`` and ``end``
+    may be scalars or equal-length array-likes; ``size`` is only needed when
+    both are scalars. Empty ranges collapse to ``start``.
+    """
+
+    start = np.asarray(pd.to_datetime(start), dtype="datetime64[D]")
+    end = np.asarray(pd.to_datetime(end), dtype="datetime64[D]")
+    span = np.clip((end - start).astype(np.int64), 0, None)
+    shape = np.broadcast(start, end).shape if size is None else size
+    offset = np.floor(rng.random(shape) * (span + 1)).astype(np.int64)
+    return pd.Series((start + offset).astype("datetime64[ns]"))
+
+
+def random_datetimes_between(start, end, rng, size=None):
+    """Draw timestamps (to the second) uniformly between ``start`` and ``end``.
+
+    Vectorized replacement for ``Faker.date_time_between`` with the same
+    argument handling as :func:`random_dates_between`.
+    """
+
+    start = np.asarray(pd.to_datetime(start), dtype="datetime64[s]")
+    end = np.asarray(pd.to_datetime(end), dtype="datetime64[s]")
+    span = np.clip((end - start).astype(np.int64), 0, None)
+    shape = np.broadcast(start, end).shape if size is None else size
+    offset = np.floor(rng.random(shape) * (span + 1)).astype(np.int64)
+    return pd.Series((start + offset).astype("datetime64[ns]"))
@@ -1,7 +1,28 @@
+import argparse
+import csv
+import io
+import json
 import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import pandas as pd
 from sqlalchemy import create_engine
 
+from pg_schemas import (
+    TABLES,
+    create_table_sql,
+    delete_missing_sql,
+    drop_foreign_key_sql,
+    foreign_key_sql,
+    key_sql,
+    quote,
+    upsert_sql,
+)
+from writers import read_daily_manifest, read_table, table_files
+
 # Define connection parameters from environment variables with defaults
 DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASS = os.getenv("DB_PASS", "postgres")
@@ -9,10 +30,7 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "54322")
 DB_NAME = os.getenv("DB_NAME", "postgres")
 
-# Create SQLAlchemy engine
-engine = create_engine(f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
-
-# Base path to your CSVs
+# Base path to the generated tables (CSV or Parquet)
 base_path = "data/raw/synthetic/simulated/yardi"
 
 # List of tables to load
@@ -21,11 +39,534 @@ tables = [
     "cust_invoices", "vend_invoices", "checkreg", "receipts", "gltran", "properties"
 ]
 
-for table in tables:
-    csv_path = os.path.join(base_path, f"{table}.csv")
-    print(f"Loading: {table} from {csv_path}")
-    df = pd.read_csv(csv_path)
-    df.to_sql(table, con=engine, if_exists="replace", index=False)
-    print(f"✓ Loaded {table} into database.")
+# Rows per COPY chunk for Parquet sources; CSV files are streamed in blocks of COPY_BLOCK_BYTES
+DEFAULT_CHUNK_ROWS = 100_000
+COPY_BLOCK_BYTES = 8 * 1024 * 1024
+
+# Per-table record of the files each table was last loaded from
+WATERMARKS_TABLE = "_load_watermarks"
+WATERMARKS_DDL = (
+    f"CREATE TABLE IF NOT EXISTS {WATERMARKS_TABLE} ("
+    "table_name TEXT PRIMARY KEY, manifest_version INTEGER, files JSONB NOT NULL, loaded_at TIMESTAMP)"
+)
+
+
+def get_engine(pool_size=5):
+    """Return an engine whose pool holds at most ``pool_size`` connections."""
+
+    return create_engine(
+        f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}", pool_size=pool_size, max_overflow=0
+    )
+
+
+def _sample(path, rows=1000):
+    if path.endswith(".csv"):
+        return pd.read_csv(path, nrows=rows)
+    import pyarrow.parquet as pq
+
+    batch = next(pq.ParquetFile(path).iter_batches(batch_size=rows), None)
+    if batch is None:
+        return pq.read_schema(path).empty_table().to_pandas()
+    return batch.to_pandas()
+
+
+def _inferred_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return "BOOLEAN"
+    if pd.api.types.is_integer_dtype(dtype):
+        # Integer columns with gaps further down are written as "1.0"
+        return "NUMERIC"
+    if pd.api.types.is_float_dtype(dtype):
+        return "DOUBLE PRECISION"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def column_types(name, files):
+    """Return column -> Postgres type for table ``name`` stored in ``files``.
+
+    Every column declared in ``pg_schemas.TABLES`` is created; columns the
+    files hold beyond those are inferred from a sample of the first file.
+    """
+
+    declared = dict(TABLES.get(name, {}).get("columns", {}))
+    sample = _sample(files[0])
+    return declared | {
+        column: _inferred_type(dtype) for column, dtype in sample.dtypes.items() if column not in declared
+    }
+
+
+class _CopySource:
+    """File-like object COPY reads from, reporting progress as blocks are read.
+
+    Wraps either a binary file or an iterator of CSV byte blocks.
+    """
+
+    def __init__(self, source, on_read=None):
+        self._file = source if hasattr(source, "read") else None
+        self._blocks = None if self._file else iter(source)
+        self._buffer = b""
+        self._on_read = on_read
+        self.rows = 0
+
+    def _next_block(self, size):
+        if self._file:
+            return self._file.read(size)
+        while len(self._buffer) < size:
+            block = next(self._blocks, None)
+            if block is None:
+                break
+            self._buffer += block
+        block, self._buffer = self._buffer[:size], self._buffer[size:]
+        return block
+
+    def read(self, size=-1):
+        block = self._next_block(COPY_BLOCK_BYTES if size is None or size < 0 else size)
+        self.rows += block.count(b"\n")
+        if self._on_read:
+            self._on_read(self.rows)
+        return block
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def _parquet_csv_blocks(path, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Yield ``path`` as CSV bytes (header first), ``chunk_rows`` rows at a time."""
+
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+
+    header = True
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+        # Categorical columns are stored as dictionaries, which the CSV writer cannot encode
+        batch = pa.RecordBatch.from_arrays(
+            [column.cast(column.type.value_type) if pa.types.is_dictionary(column.type) else column
+             for column in batch.columns],
+            names=batch.schema.names,
+        )
+        buffer = io.BytesIO()
+        pacsv.write_csv(batch, buffer, write_options=pacsv.WriteOptions(include_header=header))
+        header = False
+        yield buffer.getvalue()
+
+
+def _file_columns(path):
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            return next(csv.reader(f), [])
+    import pyarrow.parquet as pq
+
+    return pq.read_schema(path).names
+
+
+def copy_file(cursor, name, path, chunk_rows=DEFAULT_CHUNK_ROWS, on_read=None):
+    """Stream one CSV or Parquet file into table ``name`` with ``COPY FROM STDIN``.
+
+    Returns:
+        int: Rows copied.
+    """
+
+    columns = ", ".join(quote(column) for column in _file_columns(path))
+    statement = f"COPY {quote(name)} ({columns}) FROM STDIN WITH (FORMAT csv, HEADER true)"
+    if path.endswith(".csv"):
+        with open(path, "rb") as f:
+            source = _CopySource(f, on_read)
+            cursor.copy_expert(statement, source, size=COPY_BLOCK_BYTES)
+    else:
+        source = _CopySource(_parquet_csv_blocks(path, chunk_rows), on_read)
+        cursor.copy_expert(statement, source, size=COPY_BLOCK_BYTES)
+    # COPY reports its row count; the newline count includes the header
+    return cursor.rowcount if cursor.rowcount >= 0 else max(source.rows - 1, 0)
+
+
+def _stats(name, rows, began, indexed):
+    seconds = time.perf_counter() - began
+    return {"table": name, "rows": rows, "seconds": round(seconds, 3),
+            "index_seconds": round(time.perf_counter() - indexed, 3),
+            "rows_per_s": round(rows / seconds, 1) if seconds > 0 else None}
+
+
+def copy_table(conn, directory, name, manifest=None, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    """Recreate table ``name`` with its declared column types and bulk load it with COPY.
+
+    Every file of the table (base table and committed daily partitions) is
+    streamed to Postgres without being loaded as a DataFrame. The primary
+    key and indexes are built once the rows are in, and the table is
+    replaced in one transaction.
+
+    Args:
+        progress (LoadProgress, optional): Told the rows copied so far.
+
+    Returns:
+        dict: ``table``, ``rows``, ``seconds``, ``index_seconds`` (part of
+        ``seconds`` spent building keys and statistics) and ``rows_per_s``.
+    """
+
+    manifest = read_daily_manifest(directory) if manifest is None else manifest
+    files = table_files(directory, name, manifest)
+    began = time.perf_counter()
+    copied = 0
+
+    def report(rows_in_file):
+        if progress:
+            progress.update(name, copied + rows_in_file)
+
+    with conn.cursor() as cursor:
+        # CASCADE also drops the foreign keys other tables hold on this one
+        cursor.execute(f"DROP TABLE IF EXISTS {quote(name)} CASCADE")
+        cursor.execute(create_table_sql(name, column_types(name, files)))
+        for path in files:
+            copied += copy_file(cursor, name, path, chunk_rows, report)
+        indexed = time.perf_counter()
+        for statement in key_sql(name):
+            cursor.execute(statement)
+        cursor.execute(f"ANALYZE {quote(name)}")
+        save_watermark(cursor, name, manifest, file_signatures(directory, files))
+    conn.commit()
+    return _stats(name, copied, began, indexed)
+
+
+def file_signatures(directory, files):
+    """Return path relative to ``directory`` -> ``"<size>:<mtime_ns>"`` for ``files``.
+
+    Daily partition files are immutable, so a changed signature means a
+    base table was regenerated.
+    """
+
+    signatures = {}
+    for path in files:
+        stat = os.stat(path)
+        signatures[os.path.relpath(path, directory)] = f"{stat.st_size}:{stat.st_mtime_ns}"
+    return signatures
+
+
+def read_watermark(cursor, name):
+    """Return the file signatures ``name`` was last loaded from, or None.
+
+    None is also returned when the table itself no longer exists.
+    """
+
+    cursor.execute(WATERMARKS_DDL)
+    cursor.execute(
+        f"SELECT files FROM {WATERMARKS_TABLE} WHERE table_name = %s AND to_regclass(%s) IS NOT NULL",
+        (name, quote(name)),
+    )
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def save_watermark(cursor, name, manifest, signatures):
+    """Record that ``name`` now holds the rows of the files in ``signatures``.
+
+    Runs in the caller's transaction, so the watermark only moves if the
+    rows are committed with it.
+    """
+
+    cursor.execute(WATERMARKS_DDL)
+    cursor.execute(
+        f"INSERT INTO {WATERMARKS_TABLE} (table_name, manifest_version, files, loaded_at) "
+        "VALUES (%s, %s, %s::jsonb, now()) ON CONFLICT (table_name) DO UPDATE SET "
+        "manifest_version = EXCLUDED.manifest_version, files = EXCLUDED.files, loaded_at = EXCLUDED.loaded_at",
+        (name, (manifest or {}).get("version"), json.dumps(signatures)),
+    )
+
+
+def sync_table(conn, directory, name, manifest=None, chunk_rows=DEFAULT_CHUNK_ROWS, progress=None):
+    """Upsert the rows of ``name`` added since its watermark, keeping the table online.
+
+    The watermark is the set of files the table was last loaded from.
+    Files not in it (normally the daily partitions committed since) are
+    copied into a temporary staging table and upserted on the primary key,
+    so a nightly load costs O(rows added) rather than O(history). If a
+    loaded file was since rewritten or removed, which rows it held is no
+    longer known: every current file is staged, upserted, and rows missing
+    from them are deleted. Either way the change is one transaction of row
+    level writes, so readers keep seeing the previous rows until it commits.
+
+    Tables without a watermark or a primary key are loaded with
+    :func:`copy_table`.
+
+    Returns:
+        dict: The :func:`copy_table` statistics plus ``mode`` (``"full"``,
+        ``"delta"`` or ``"sync"``), ``upserted`` and ``deleted``.
+    """
+
+    manifest = read_daily_manifest(directory) if manifest is None else manifest
+    files = table_files(directory, name, manifest)
+    signatures = file_signatures(directory, files)
+    with conn.cursor() as cursor:
+        loaded = read_watermark(cursor, name)
+    if loaded is None or not TABLES.get(name, {}).get("primary_key"):
+        return copy_table(conn, directory, name, manifest, chunk_rows, progress) | {"mode": "full"}
+
+    changed = [relpath for relpath, signature in loaded.items() if signatures.get(relpath) != signature]
+    staged = files if changed else [path for path, relpath in zip(files, signatures) if relpath not in loaded]
+    began = time.perf_counter()
+    copied = upserted = deleted = 0
+    stage = f"_stage_{name}"
+
+    def report(rows_in_file):
+        if progress:
+            progress.update(name, copied + rows_in_file)
+
+    with conn.cursor() as cursor:
+        if staged:
+            cursor.execute(f"CREATE TEMP TABLE {quote(stage)} (LIKE {quote(name)}) ON COMMIT DROP")
+            for path in staged:
+                copied += copy_file(cursor, stage, path, chunk_rows, report)
+            columns = list(dict.fromkeys(column for path in staged for column in _file_columns(path)))
+            cursor.execute(upsert_sql(name, stage, columns))
+            upserted = max(cursor.rowcount, 0)
+        if changed:
+            cursor.execute(delete_missing_sql(name, stage))
+            deleted = max(cursor.rowcount, 0)
+        save_watermark(cursor, name, manifest, signatures)
+    conn.commit()
+
+    mode = "sync" if changed else "delta"
+    # No keys are rebuilt; the existing indexes are maintained row by row
+    return _stats(name, copied, began, time.perf_counter()) | {
+        "mode": mode, "upserted": upserted, "deleted": deleted,
+    }
+
+
+def insert_table(engine, directory, name, manifest=None):
+    """Load table ``name`` through ``DataFrame.to_sql``; kept to benchmark against COPY.
+
+    The table gets the same column types, keys and indexes as with COPY.
+    """
+
+    began = time.perf_counter()
+    files = table_files(directory, name, manifest)
+    df = read_table(directory, name, manifest=manifest)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {quote(name)} CASCADE")
+        conn.exec_driver_sql(create_table_sql(name, column_types(name, files)))
+        df.to_sql(name, con=conn, if_exists="append", index=False)
+        indexed = time.perf_counter()
+        for statement in key_sql(name):
+            conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(f"ANALYZE {quote(name)}")
+    return _stats(name, len(df), began, indexed)
+
+
+def add_foreign_keys(conn, names):
+    """Add the foreign keys between the tables in ``names``; returns how many were added.
+
+    Every referenced table must have been loaded with its primary key.
+    Keys that survived the load (tables upserted rather than recreated)
+    are left in place.
+    """
+
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT conname FROM pg_constraint WHERE contype = 'f'")
+        existing = [row[0] for row in cursor.fetchall()]
+        statements = [
+            statement for name in names for statement in foreign_key_sql(name, referenced=names, existing=existing)
+        ]
+        for statement in statements:
+            cursor.execute(statement)
+    conn.commit()
+    return len(statements)
+
+
+class LoadProgress:
+    """Print one line of aggregate progress for tables loading concurrently.
+
+    Loaders report the rows copied into each table so far; the line shows
+    the tables finished, the rows copied across all tables and the
+    throughput since the load began. Safe to call from several threads.
+    """
+
+    def __init__(self, tables, stream=sys.stdout):
+        self.tables = tables
+        self.stream = stream
+        self.rows = {}
+        self.finished = 0
+        self.began = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _write(self):
+        rows = sum(self.rows.values())
+        elapsed = time.perf_counter() - self.began
+        line = (f"  [{self.finished}/{self.tables} tables] {rows:,} rows "
+                f"{rows / elapsed if elapsed > 0 else 0:,.0f} rows/s")
+        # Pad so a shorter line fully overwrites the previous one
+        self.stream.write(f"\r{line:<72}")
+        self.stream.flush()
+
+    def update(self, name, rows):
+        with self._lock:
+            self.rows[name] = rows
+            self._write()
+
+    def finish(self, result):
+        with self._lock:
+            self.rows[result["table"]] = result["rows"]
+            self.finished += 1
+            mode = f" [{result['mode']}]" if "mode" in result else ""
+            self.stream.write(
+                f"\r✓ {result['table']:18} {result['rows']:>10,} rows {result['seconds']:>8.2f}s "
+                f"(keys {result['index_seconds']:.2f}s) {result['rows_per_s'] or 0:>12,.0f} rows/s{mode}\n"
+            )
+            self._write()
+
+    def close(self):
+        self.stream.write("\n")
+
+
+def load_dependencies(names, foreign_keys=False):
+    """Return table -> the tables in ``names`` that must be loaded before it.
+
+    With foreign keys, a table waits for the tables it references, so
+    dimensions are in place before the facts pointing at them. Without,
+    every table is independent.
+    """
+
+    if not foreign_keys:
+        return {name: set() for name in names}
+    return {
+        name: {
+            target for target, _ in TABLES.get(name, {}).get("foreign_keys", {}).values()
+            if target in names and target != name
+        }
+        for name in names
+    }
+
+
+def _table_bytes(directory, name, manifest):
+    return sum(os.path.getsize(path) for path in table_files(directory, name, manifest))
+
+
+def load_tables(names, directory=base_path, method="copy", chunk_rows=DEFAULT_CHUNK_ROWS, engine=None,
+                foreign_keys=False, jobs=1, table_chunk_rows=None, stream=sys.stdout):
+    """Load ``names`` from ``directory`` over up to ``jobs`` connections.
+
+    ``method`` is ``"copy"`` (recreate every table), ``"incremental"``
+    (upsert what was added since the last load, see :func:`sync_table`) or
+    ``"insert"`` (``DataFrame.to_sql``, for comparison).
+
+    Tables load concurrently, each in its own transaction on a connection
+    from the engine's pool, and the largest tables start first so the
+    whole load takes about as long as the largest table. With
+    ``foreign_keys``, a table only starts once the tables it references are
+    loaded (see :func:`load_dependencies`), and the foreign keys between
+    the loaded tables are added and validated after all of them are in.
+
+    Args:
+        jobs (int): Tables loaded at once.
+        table_chunk_rows (dict, optional): Table -> rows per COPY chunk,
+            overriding ``chunk_rows``.
+
+    Returns:
+        list[dict]: Per-table statistics, in the order of ``names``.
+
+    Raises:
+        ValueError: If the tables' foreign keys form a cycle.
+    """
+
+    names = list(names)
+    jobs = max(1, jobs)
+    engine = engine or get_engine(pool_size=jobs)
+    table_chunk_rows = dict(table_chunk_rows or {})
+    # Read every table as of the same daily partition commit
+    snapshot = read_daily_manifest(directory)
+    waits = load_dependencies(names, foreign_keys)
+    sizes = {name: _table_bytes(directory, name, snapshot) for name in names}
+    progress = LoadProgress(len(names), stream)
+
+    if method != "insert":
+        conn = engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                # Concurrent loaders would race to create it
+                cursor.execute(WATERMARKS_DDL)
+                if method == "copy":
+                    for statement in drop_foreign_key_sql(names):
+                        cursor.execute(statement)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def load(name):
+        if method == "insert":
+            return insert_table(engine, directory, name, snapshot)
+        conn = engine.raw_connection()
+        try:
+            loader = sync_table if method == "incremental" else copy_table
+            return loader(conn, directory, name, snapshot, table_chunk_rows.get(name, chunk_rows), progress)
+        finally:
+            conn.close()
+
+    results = {}
+    pending = sorted(names, key=lambda name: -sizes[name])
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running = {}
+        while pending or running:
+            for name in list(pending):
+                if waits[name] <= results.keys():
+                    pending.remove(name)
+                    running[executor.submit(load, name)] = name
+            if not running:
+                raise ValueError(f"foreign keys form a cycle through {pending}")
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                results[name] = future.result()
+                progress.finish(results[name])
+    progress.close()
+
+    if foreign_keys:
+        conn = engine.raw_connection()
+        try:
+            stream.write(f"Added {add_foreign_keys(conn, names)} foreign keys\n")
+        finally:
+            conn.close()
+    return [results[name] for name in names]
+
+
+def _table_rows(value):
+    name, _, rows = value.partition("=")
+    if not rows.isdigit():
+        raise argparse.ArgumentTypeError(f"expected TABLE=ROWS, got {value!r}")
+    return name, int(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the generated tables into PostgreSQL.")
+    parser.add_argument("--data-dir", default=base_path,
+                        help=f"directory holding the tables (default: {base_path})")
+    parser.add_argument("--tables", nargs="+", default=tables,
+                        help="tables to load (default: all)")
+    parser.add_argument("--method", choices=["copy", "incremental", "insert"], default="copy",
+                        help="recreate tables with COPY FROM STDIN, upsert only the rows added since the "
+                             "last load, or pandas to_sql INSERTs for comparison (default: copy)")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="tables loaded at once, each on its own connection (default: 1)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"rows per COPY chunk for Parquet files (default: {DEFAULT_CHUNK_ROWS})")
+    parser.add_argument("--table-chunk-rows", type=_table_rows, nargs="+", default=[], metavar="TABLE=ROWS",
+                        help="rows per COPY chunk for individual tables, e.g. gltran=500000")
+    parser.add_argument("--foreign-keys", action="store_true",
+                        help="load referenced tables first, then add and validate the foreign keys "
+                             "between the loaded tables")
+    args = parser.parse_args(argv)
+
+    began = time.perf_counter()
+    results = load_tables(
+        args.tables, args.data_dir, args.method, args.chunk_rows, foreign_keys=args.foreign_keys,
+        jobs=args.jobs, table_chunk_rows=dict(args.table_chunk_rows),
+    )
+    total_rows = sum(result["rows"] for result in results)
+    seconds = time.perf_counter() - began
+    slowest = max(results, key=lambda result: result["seconds"])
+    print(f"All tables loaded into PostgreSQL: {total_rows:,} rows in {seconds:.1f}s "
+          f"({total_rows / seconds if seconds > 0 else 0:,.0f} rows/s); "
+          f"slowest table {slowest['table']} took {slowest['seconds']:.1f}s.")
+
 
-print("All tables loaded into PostgreSQL.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+# Postgres column types, keys and indexes of the tables load_to_postgres.py loads.
+#
+# Every ID the generators produce is a 32-digit hex string, which Postgres
+# reads as a UUID: 16 bytes compared as integers instead of 33-byte text.
+# Dates without a time of day are DATE and money is NUMERIC(14, 2).
+#
+# Tables are created without keys or indexes; ``key_sql`` builds them once
+# the rows are loaded, which is much faster than maintaining them row by
+# row during COPY. Foreign keys are only added on request, as validating
+# them scans both tables.
+MONEY = "NUMERIC(14, 2)"
+
+TABLES = {
+    "properties": {
+        "columns": {
+            "Address": "TEXT",
+            "City": "TEXT",
+            "State": "TEXT",
+            "Type": "TEXT",
+            "Status": "TEXT",
+            "Subtype": "TEXT",
+            "Market": "TEXT",
+            "Legal Entity": "TEXT",
+            "Floors": "SMALLINT",
+            "Units": "INTEGER",
+            "Total Sq Ft": "INTEGER",
+            "Reserve Requirement": MONEY,
+            "Year Built": "SMALLINT",
+            "Last Renovated": "SMALLINT",
+            "Occupancy": "NUMERIC(5, 4)",
+            "property_id": "UUID",
+        },
+        "primary_key": ["property_id"],
+        "indexes": [],
+        "foreign_keys": {},
+    },
+    "vendors": {
+        "columns": {
+            "id": "UUID",
+            "name": "TEXT",
+            "service_type": "TEXT",
+            "address": "TEXT",
+            "contact_name": "TEXT",
+            "contact_email": "TEXT",
+            "phone": "TEXT",
+            "tax_id": "TEXT",
+            "vendor_status": "TEXT",
+            "approved_vendor": "BOOLEAN",
+            "created_by": "TEXT",
+            "created_at": "TIMESTAMP",
+            "modified_by": "TEXT",
+            "modified_at": "TIMESTAMP",
+        },
+        "primary_key": ["id"],
+        "indexes": [],
+        "foreign_keys": {},
+    },
+    "units": {
+        "columns": {
+            "id": "UUID",
+            "property_id": "UUID",
+            "unit_number": "TEXT",
+            "floor_number": "SMALLINT",
+            "sq_ft": "INTEGER",
+            "occupancy_status": "TEXT",
+            "last_renovated": "DATE",
+            "last_occupied": "DATE",
+            "last_vacated": "DATE",
+            "created_at": "TIMESTAMP",
+            "modified_at": "TIMESTAMP",
+        },
+        "primary_key": ["id"],
+        "indexes": [["property_id"]],
+        "foreign_keys": {"property_id": ("properties", "property_id")},
+    },
+    "tenants": {
+        "columns": {
+            "id": "UUID",
+            "property_id": "UUID",
+            "unit_id": "UUID",
+            "business_name": "TEXT",
+            "primary_contact": "TEXT",
+            "email": "TEXT",
+            "phone": "TEXT",
+            "industry": "TEXT",
+            "annual_revenue": "TEXT",
+            "employee_count": "INTEGER",
+            "lease_start_date": "DATE",
+            "move_in_reason": "TEXT",
+        },
+        "primary_key": ["id"],
+        "indexes": [["property_id"], ["unit_id"]],
+        "foreign_keys": {
+            "property_id": ("properties", "property_id"),
+            "unit_id": ("units", "id"),
+        },
+    },
+    "leases": {
+        "columns": {
+            "id": "UUID",
+            "tenant_id": "UUID",
+            "unit_id": "UUID",
+            "property_id": "UUID",
+            "lease_start": "DATE",
+            "lease_end": "DATE",
+            "rent_start_date": "DATE",
+            "deposit_amount": MONEY,
+            "monthly_rent": MONEY,
+            "payment_timing": "TEXT",
+            "lease_status": "TEXT",
+            "auto_renew": "BOOLEAN",
+            "lease_type": "TEXT",
+            "late_fee_terms": "TEXT",
+            "early_termination_clause": "TEXT",
+            "pro_rated_start": "BOOLEAN",
+            "escalation_clause": "BOOLEAN",
+            "expense_reimbursement_clause": "BOOLEAN",
+            "escalation_type": "TEXT",
+            "escalation_rate": "NUMERIC(6, 4)",
+            "fixed_rent_commencement": "BOOLEAN",
+            "rent_deferral_months": "SMALLINT",
+            "free_rent_months": "SMALLINT",
+        },
+        "primary_key": ["id"],
+        "indexes": [["tenant_id"], ["unit_id"], ["property_id"]],
+        "foreign_keys": {
+            "tenant_id": ("tenants", "id"),
+            "unit_id": ("units", "id"),
+            "property_id": ("properties", "property_id"),
+        },
+    },
+    "payment_schedule": {
+        "columns": {
+            "id": "UUID",
+            "lease_id": "UUID",
+            "property_id": "UUID",
+            "unit_id": "UUID",
+            "tenant_id": "UUID",
+            "schd_dt": "DATE",
+            "pymnt_amt": MONEY,
+            "escal_type": "TEXT",
+            "is_prorated": "BOOLEAN",
+            "bill_period_start": "DATE",
+            "bill_period_end": "DATE",
+            "billing_basis": "TEXT",
+            "yr": "SMALLINT",
+            "mo_txt": "TEXT",
+        },
+        "primary_key": ["id"],
+        "indexes": [["lease_id"], ["schd_dt"]],
+        "foreign_keys": {"lease_id": ("leases", "id")},
+    },
+    "cust_invoices": {
+        "columns": {
+            "id": "UUID",
+            "invoice_date": "DATE",
+            "due_date": "DATE",
+            "tenant_id": "UUID",
+            "property_id": "UUID",
+            "unit_id": "UUID",
+            "lease_id": "UUID",
+            "billing_period_start": "DATE",
+            "billing_period_end": "DATE",
+            "amount_due": MONEY,
+            "status": "TEXT",
+            "payment_date": "DATE",
+            "description": "TEXT",
+            "gltran_id": "UUID",
+        },
+        "primary_key": ["id"],
+        "indexes": [["tenant_id"], ["lease_id"], ["property_id"], ["invoice_date"]],
+        "foreign_keys": {
+            "tenant_id": ("tenants", "id"),
+            "lease_id": ("leases", "id"),
+        },
+    },
+    "vend_invoices": {
+        "columns": {
+            "id": "UUID",
+            "invoice_date": "DATE",
+            "due_date": "DATE",
+            "property_id": "UUID",
+            "vendor_id": "UUID",
+            "vendor_name": "TEXT",
+            "amount_due": MONEY,
+            "status": "TEXT",
+            "payment_date": "DATE",
+            "description": "TEXT",
+            "gl_account": "INTEGER",
+            "gl_account_name": "TEXT",
+            "gl_class": "TEXT",
+            "gl_type": "TEXT",
+            "gltran_id": "UUID",
+        },
+        "primary_key": ["id"],
+        "indexes": [["vendor_id"], ["property_id"], ["invoice_date"]],
+        "foreign_keys": {
+            "vendor_id": ("vendors", "id"),
+            "property_id": ("properties", "property_id"),
+        },
+    },
+    "checkreg": {
+        "columns": {
+            "id": "UUID",
+            "invoice_id": "UUID",
+            "vendor_id": "UUID",
+            "check_number": "INTEGER",
+            "check_date": "DATE",
+            "amount": MONEY,
+            "property_id": "UUID",
+            "gltran_id": "UUID",
+            "created_by": "TEXT",
+            "created_at": "TIMESTAMP",
+            "modified_by": "TEXT",
+            "modified_at": "TIMESTAMP",
+        },
+        "primary_key": ["id"],
+        "indexes": [["invoice_id"], ["vendor_id"], ["check_date"]],
+        "foreign_keys": {
+            "invoice_id": ("vend_invoices", "id"),
+            "vendor_id": ("vendors", "id"),
+        },
+    },
+    "receipts": {
+        "columns": {
+            "id": "UUID",
+            "invoice_id": "UUID",
+            "tenant_id": "UUID",
+            "receipt_id": "INTEGER",
+            "receipt_date": "DATE",
+            "amount": MONEY,
+            "payment_method": "TEXT",
+            "property_id": "UUID",
+            "gltran_id": "UUID",
+            "created_by": "TEXT",
+            "created_at": "TIMESTAMP",
+            "modified_by": "TEXT",
+            "modified_at": "TIMESTAMP",
+        },
+        "primary_key": ["id"],
+        "indexes": [["invoice_id"], ["tenant_id"], ["receipt_date"]],
+        "foreign_keys": {
+            "invoice_id": ("cust_invoices", "id"),
+            "tenant_id": ("tenants", "id"),
+        },
+    },
+    "gltran": {
+        "columns": {
+            "id": "UUID",
+            "date": "DATE",
+            "amount": MONEY,
+            "debit_credit": "TEXT",
+            "account_id": "TEXT",
+            "property_id": "UUID",
+            "tenant_id": "UUID",
+            "vendor_id": "UUID",
+            "transaction_type": "TEXT",
+            "source_document": "UUID",
+            "batch_id": "UUID",
+            "cleared_in_bank": "BOOLEAN",
+            "created_by": "TEXT",
+            "created_at": "TIMESTAMP",
+            "modified_by": "TEXT",
+            "modified_at": "TIMESTAMP",
+        },
+        "primary_key": ["id"],
+        # The cleansed GL view joins on the dimensions and on (transaction_type, source_document)
+        "indexes": [
+            ["property_id"], ["tenant_id"], ["vendor_id"], ["source_document", "transaction_type"],
+            ["date"], ["account_id"],
+        ],
+        "foreign_keys": {
+            "property_id": ("properties", "property_id"),
+            "tenant_id": ("tenants", "id"),
+            "vendor_id": ("vendors", "id"),
+        },
+    },
+}
+
+
+def quote(identifier):
+    """Quote ``identifier`` for use in SQL."""
+
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def create_table_sql(name, columns):
+    """Return ``CREATE TABLE`` for ``name`` with ``columns`` (column -> type), without keys."""
+
+    definitions = ",\n    ".join(f"{quote(column)} {pg_type}" for column, pg_type in columns.items())
+    return f"CREATE TABLE {quote(name)} (\n    {definitions}\n)"
+
+
+def key_sql(name):
+    """Return the statements building ``name``'s primary key and indexes.
+
+    Tables without a registered schema get none.
+    """
+
+    table = TABLES.get(name)
+    if table is None:
+        return []
+    statements = []
+    if table["primary_key"]:
+        columns = ", ".join(quote(column) for column in table["primary_key"])
+        statements.append(
+            f"ALTER TABLE {quote(name)} ADD CONSTRAINT {quote(name + '_pkey')} PRIMARY KEY ({columns})"
+        )
+    for index in table["indexes"]:
+        index_name = quote(f"{name}_{'_'.join(index)}_idx")
+        columns = ", ".join(quote(column) for column in index)
+        statements.append(f"CREATE INDEX {index_name} ON {quote(name)} ({columns})")
+    return statements
+
+
+def foreign_key_sql(name, referenced=None, existing=()):
+    """Return the statements adding ``name``'s foreign keys.
+
+    Args:
+        referenced (Iterable[str], optional): Only add keys pointing at
+            these tables. The referenced tables must have their primary
+            keys already.
+        existing (Iterable[str]): Names of constraints that are already
+            in place and are skipped.
+    """
+
+    table = TABLES.get(name)
+    if table is None:
+        return []
+    existing = set(existing)
+    statements = []
+    for column, (target, target_column) in table["foreign_keys"].items():
+        constraint = f"{name}_{column}_fkey"
+        if (referenced is not None and target not in referenced) or constraint in existing:
+            continue
+        statements.append(
+            f"ALTER TABLE {quote(name)} ADD CONSTRAINT {quote(constraint)} "
+            f"FOREIGN KEY ({quote(column)}) REFERENCES {quote(target)} ({quote(target_column)})"
+        )
+    return statements
+
+
+def drop_foreign_key_sql(names):
+    """Return the statements dropping every foreign key on or pointing at the tables in ``names``.
+
+    Recreating a table otherwise has to lock the tables its keys connect
+    it to, which can deadlock with those tables being loaded concurrently.
+    """
+
+    statements = []
+    for name, table in TABLES.items():
+        for column, (target, _) in table["foreign_keys"].items():
+            if name in names or target in names:
+                statements.append(
+                    f"ALTER TABLE IF EXISTS {quote(name)} DROP CONSTRAINT IF EXISTS {quote(f'{name}_{column}_fkey')}"
+                )
+    return statements
+
+
+def upsert_sql(name, source, columns):
+    """Return the ``INSERT ... ON CONFLICT`` moving ``columns`` of ``source`` into ``name``.
+
+    Rows whose primary key is already in ``name`` are updated, but only
+    when a value differs, so unchanged rows leave no dead tuples. If
+    ``source`` holds a key more than once, one of its rows is used.
+
+    Raises:
+        KeyError: If ``name`` has no primary key to upsert on.
+    """
+
+    key = TABLES[name]["primary_key"]
+    if not key:
+        raise KeyError(f"{name!r} has no primary key")
+    quoted = [quote(column) for column in columns]
+    keys = ", ".join(quote(column) for column in key)
+    updates = [quote(column) for column in columns if column not in key]
+    statement = (
+        f"INSERT INTO {quote(name)} ({', '.join(quoted)})\n"
+        f"SELECT DISTINCT ON ({keys}) {', '.join(quoted)} FROM {quote(source)}\n"
+        f"ON CONFLICT ({keys}) "
+    )
+    if not updates:
+        return statement + "DO NOTHING"
+    assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in updates)
+    current = ", ".join(f"{quote(name)}.{column}" for column in updates)
+    excluded = ", ".join(f"EXCLUDED.{column}" for column in updates)
+    return statement + f"DO UPDATE SET {assignments}\nWHERE ({current}) IS DISTINCT FROM ({excluded})"
+
+
+def delete_missing_sql(name, source):
+    """Return the ``DELETE`` removing the rows of ``name`` whose key is not in ``source``."""
+
+    key = TABLES[name]["primary_key"]
+    match = " AND ".join(f"s.{quote(column)} = {quote(name)}.{quote(column)}" for column in key)
+    return f"DELETE FROM {quote(name)} WHERE NOT EXISTS (SELECT 1 FROM {quote(source)} s WHERE {match})"
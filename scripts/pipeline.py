@@ -0,0 +1,271 @@
+import hashlib
+import json
+import os
+import pickle
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from profiling import NullProfiler
+
+
+def _stage_of(node):
+    """Return the stage producing ``node`` (``"stage"`` or ``"stage.output"``)."""
+
+    return node.split(".", 1)[0]
+
+
+def _rows(value):
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(v) for v in value.values() if isinstance(v, pd.DataFrame))
+    return 0
+
+
+def content_hash(value):
+    """Return a stable hex digest of ``value``'s content.
+
+    DataFrames are hashed row by row with ``pd.util.hash_pandas_object``
+    together with their column names and dtypes, so equal frames hash
+    equally however they were built. Other values are hashed by their
+    pickled bytes.
+    """
+
+    digest = hashlib.sha256()
+    if isinstance(value, pd.DataFrame):
+        digest.update(json.dumps([[str(c), str(t)] for c, t in value.dtypes.items()]).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    else:
+        digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+class Stage:
+    """One step of a :class:`Pipeline`.
+
+    Args:
+        name (str): Unique stage name.
+        func (callable): Called as ``func(*inputs, rng=rng, **params)``.
+        inputs (tuple[str]): Stages or pipeline inputs whose values are
+            passed positionally. Outputs of multi-output stages are
+            referenced as ``"<stage>.<output>"``.
+        params (dict, optional): Keyword arguments for ``func``. They are
+            part of the cache key, so their ``str()`` must identify them.
+        outputs (tuple[str], optional): When set, ``func`` returns a dict
+            with these keys and each becomes a separate node.
+    """
+
+    def __init__(self, name, func, inputs=(), params=None, outputs=None):
+        if "." in name:
+            raise ValueError(f"stage names cannot contain '.': {name!r}")
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.params = dict(params or {})
+        self.outputs = tuple(outputs) if outputs else None
+
+
+class StageCache:
+    """Pickled stage outputs stored under ``<directory>/<stage>/<key>.pkl``.
+
+    Keys are content addresses (see :meth:`Pipeline.keys`), so entries never
+    go stale; an entry is simply no longer looked up once any of its inputs
+    change. Delete the directory to reclaim space.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, name, key):
+        return os.path.join(self.directory, name, f"{key}.pkl")
+
+    def __contains__(self, entry):
+        return os.path.exists(self.path(*entry))
+
+    def get(self, name, key):
+        with open(self.path(name, key), "rb") as f:
+            return pickle.load(f)
+
+    def put(self, name, key, value):
+        path = self.path(name, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary name first so concurrent runs never read a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+class Pipeline:
+    """A DAG of :class:`Stage` objects with content-addressed caching.
+
+    Every stage gets its own random generator, spawned from the run seed, a
+    caller-supplied ``spawn_key`` (e.g. the partition index) and the stage
+    name. A stage's output therefore only depends on its inputs, parameters
+    and seed, which is what makes it safe to cache and to run independent
+    stages concurrently.
+
+    Raises:
+        ValueError: If stage names are duplicated or the stages form a cycle.
+    """
+
+    def __init__(self, stages):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"duplicate stage: {stage.name!r}")
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done or name not in self.stages:
+                return
+            if name in visiting:
+                raise ValueError(f"pipeline has a cycle through {name!r}")
+            visiting.add(name)
+            for node in self.stages[name].inputs:
+                visit(_stage_of(node))
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    def keys(self, seed, spawn_key=(), input_keys=None):
+        """Return the cache key of every stage.
+
+        A key hashes the stage name and function, its parameters, the seed
+        and spawn key, the pandas version and the keys of its inputs, so
+        changing anything upstream of a stage changes its key (and only
+        those stages' keys).
+
+        Args:
+            input_keys (dict, optional): Pipeline input name -> content hash.
+
+        Raises:
+            ValueError: If a stage reads an input that is neither a stage
+                output nor in ``input_keys``.
+        """
+
+        keys = dict(input_keys or {})
+        for name in self.order:
+            stage = self.stages[name]
+            upstream = []
+            for node in stage.inputs:
+                source = node if node in keys else _stage_of(node)
+                if source not in keys:
+                    raise ValueError(f"stage {name!r} reads unknown input {node!r}")
+                upstream.append([node, keys[source]])
+            payload = {
+                "stage": name,
+                "func": stage.func.__qualname__,
+                "params": {k: str(v) for k, v in sorted(stage.params.items())},
+                "seed": seed,
+                "spawn_key": list(spawn_key),
+                "pandas": pd.__version__,
+                "inputs": upstream,
+            }
+            keys[name] = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        return keys
+
+    def stage_rng(self, name, seed, spawn_key=()):
+        return np.random.default_rng(
+            np.random.SeedSequence(seed, spawn_key=(*spawn_key, zlib.crc32(name.encode())))
+        )
+
+    def _plan(self, targets, inputs, keys, cache):
+        """Return stage -> ``"run"`` or ``"load"`` for the stages ``targets`` need."""
+
+        plan = {}
+
+        def visit(node):
+            name = _stage_of(node)
+            if node in inputs or name in plan:
+                return
+            if name not in self.stages:
+                raise ValueError(f"unknown stage or input: {node!r}")
+            if cache is not None and (name, keys[name]) in cache:
+                plan[name] = "load"
+                return
+            plan[name] = "run"
+            for upstream in self.stages[name].inputs:
+                visit(upstream)
+
+        for target in targets:
+            visit(target)
+        return plan
+
+    def _execute(self, name, action, args, key, rng, cache, profiler):
+        stage = self.stages[name]
+        with profiler.stage(name, rows_in=sum(_rows(arg) for arg in args)) as record:
+            if action == "load":
+                value = cache.get(name, key)
+                record.cached = True
+            else:
+                value = stage.func(*args, rng=rng, **stage.params)
+                if cache is not None:
+                    cache.put(name, key, value)
+            record.rows_out = _rows(value)
+        if stage.outputs is None:
+            return {name: value}
+        return {f"{name}.{output}": value[output] for output in stage.outputs}
+
+    def run(self, targets, inputs=None, seed=42, spawn_key=(), cache=None, threads=1, profiler=None,
+            input_keys=None):
+        """Compute ``targets`` and return them as a dict.
+
+        Stages whose key is already in ``cache`` are loaded instead of run,
+        and nothing upstream of them is touched. Stages whose inputs are
+        ready run concurrently on up to ``threads`` threads.
+
+        Args:
+            targets (list[str]): Stage or output names to return.
+            inputs (dict, optional): Values of the pipeline's external
+                inputs, keyed by name. They are hashed by content.
+            seed (int): Run seed every stage generator is spawned from.
+            spawn_key (tuple[int]): Extra entropy such as a partition index.
+            cache (StageCache, optional): Where stage outputs are reused from
+                and stored.
+            threads (int): Number of stages that may run at once.
+            profiler (StageProfiler, optional): Records every stage run or load.
+            input_keys (dict, optional): Keys to use for some inputs instead
+                of their content hash, e.g. for inputs carrying wall-clock
+                timestamps that should not invalidate the cache.
+        """
+
+        inputs = dict(inputs or {})
+        profiler = profiler or NullProfiler()
+        input_keys = {name: content_hash(value) for name, value in inputs.items()} | dict(input_keys or {})
+        keys = self.keys(seed, spawn_key, input_keys)
+        plan = self._plan(targets, inputs, keys, cache)
+
+        values = dict(inputs)
+        done = set(inputs)
+        pending = [name for name in self.order if name in plan]
+        with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+            running = {}
+            while pending or running:
+                for name in list(pending):
+                    needs = self.stages[name].inputs if plan[name] == "run" else ()
+                    if all(node in done or _stage_of(node) in done for node in needs):
+                        pending.remove(name)
+                        args = [values[node] for node in needs]
+                        rng = self.stage_rng(name, seed, spawn_key)
+                        future = executor.submit(
+                            self._execute, name, plan[name], args, keys[name], rng, cache, profiler
+                        )
+                        running[future] = name
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    values.update(future.result())
+                    done.add(running.pop(future))
+
+        return {target: values[target] for target in targets}
@@ -0,0 +1,243 @@
+import cProfile
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+MANIFEST_NAME = "run_manifest.json"
+
+
+def _current_rss_mb():
+    """Return the resident set size of this process in MB.
+
+    Reads ``/proc/self/statm`` where available and falls back to the
+    process's peak RSS elsewhere.
+    """
+
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class _RssSampler(threading.Thread):
+    """Track the highest RSS seen during each open window.
+
+    Every stage opens its own window, so stages running on several
+    threads do not reset each other's peak. Sampling RSS from a background
+    thread is cheap enough for production runs, unlike ``tracemalloc``,
+    which slows the generators several-fold.
+    """
+
+    def __init__(self, interval=0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def open(self):
+        """Start a window and return its token."""
+
+        token = object()
+        with self._lock:
+            self._windows[token] = _current_rss_mb()
+        return token
+
+    def close(self, token):
+        """End the window ``token`` and return its peak RSS in MB."""
+
+        with self._lock:
+            return max(self._windows.pop(token), _current_rss_mb())
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            rss = _current_rss_mb()
+            with self._lock:
+                for token, peak in self._windows.items():
+                    self._windows[token] = max(peak, rss)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class StageRecord:
+    """Measurements for one run of one stage; ``rows_out`` is set by the caller."""
+
+    def __init__(self, name, rows_in=0, label=None):
+        self.name = name
+        self.label = label
+        self.rows_in = rows_in
+        self.rows_out = 0
+        self.wall_s = 0.0
+        self.cpu_s = 0.0
+        self.peak_rss_mb = 0.0
+        self.cached = False
+        self.concurrent = False
+
+    def to_dict(self):
+        return {
+            "stage": self.name,
+            "label": self.label,
+            "rows_in": int(self.rows_in),
+            "rows_out": int(self.rows_out),
+            "wall_s": round(self.wall_s, 4),
+            "cpu_s": round(self.cpu_s, 4),
+            "peak_rss_mb": round(self.peak_rss_mb, 1),
+            "cached": self.cached,
+            "concurrent": self.concurrent,
+        }
+
+
+class StageProfiler:
+    """Record wall time, CPU time, peak RSS and row counts per pipeline stage.
+
+    Wrap each stage in :meth:`stage` and set ``rows_out`` on the yielded
+    record. Records from worker processes can be merged with
+    :meth:`extend`, and :meth:`write_manifest` aggregates everything into a
+    JSON run manifest.
+
+    Stages may run on several threads at once. A stage that overlapped
+    another is marked ``concurrent``: its ``cpu_s`` is then the CPU time of
+    its own thread only (work on library threads such as Arrow's pool is
+    not counted), and its ``peak_rss_mb`` is the process peak during its
+    run, which includes the memory of the stages running alongside it.
+    Stages that ran alone report process CPU time and their own peak.
+
+    Args:
+        label (str, optional): Tag stored on every record, e.g. the
+            partition a worker is generating.
+        profile_dir (str, optional): When set, every stage also runs under
+            cProfile and its stats are dumped to
+            ``<profile_dir>/<stage>[-<label>].prof``.
+    """
+
+    def __init__(self, label=None, profile_dir=None):
+        self.label = label
+        self.profile_dir = profile_dir
+        self.records = []
+        self.started_at = datetime.now()
+        self._sampler = None
+        self._lock = threading.Lock()
+        # Records of the stages currently running
+        self._running = set()
+
+    @contextmanager
+    def stage(self, name, rows_in=0):
+        record = StageRecord(name, rows_in, self.label)
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = _RssSampler()
+                self._sampler.start()
+            sampler = self._sampler
+            window = sampler.open()
+            if self._running:
+                record.concurrent = True
+                for other in self._running:
+                    other.concurrent = True
+            self._running.add(record)
+        profile = cProfile.Profile() if self.profile_dir else None
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        thread_cpu_start = time.thread_time()
+        if profile:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile:
+                profile.disable()
+            record.wall_s = time.perf_counter() - wall_start
+            cpu_s = time.process_time() - cpu_start
+            thread_cpu_s = time.thread_time() - thread_cpu_start
+            with self._lock:
+                self._running.discard(record)
+                record.cpu_s = thread_cpu_s if record.concurrent else cpu_s
+                record.peak_rss_mb = sampler.close(window)
+                self.records.append(record.to_dict())
+            if profile:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                suffix = f"-{self.label}" if self.label else ""
+                profile.dump_stats(os.path.join(self.profile_dir, f"{name}{suffix}.prof"))
+
+    def extend(self, records):
+        """Add records collected by another profiler, e.g. in a worker process."""
+
+        self.records.extend(records)
+
+    def close(self):
+        with self._lock:
+            if self._sampler is not None:
+                self._sampler.stop()
+                self._sampler = None
+
+    def summary(self):
+        """Aggregate records per stage, in the order stages first ran."""
+
+        stages = {}
+        for record in self.records:
+            total = stages.setdefault(record["stage"], {
+                "stage": record["stage"],
+                "runs": 0,
+                "cached": 0,
+                "rows_in": 0,
+                "rows_out": 0,
+                "wall_s": 0.0,
+                "cpu_s": 0.0,
+                "peak_rss_mb": 0.0,
+                "concurrent": 0,
+            })
+            total["runs"] += 1
+            total["cached"] += record.get("cached", False)
+            total["concurrent"] += record.get("concurrent", False)
+            total["rows_in"] += record["rows_in"]
+            total["rows_out"] += record["rows_out"]
+            total["wall_s"] = round(total["wall_s"] + record["wall_s"], 4)
+            total["cpu_s"] = round(total["cpu_s"] + record["cpu_s"], 4)
+            total["peak_rss_mb"] = max(total["peak_rss_mb"], record["peak_rss_mb"])
+        return list(stages.values())
+
+    def write_manifest(self, directory, parameters=None):
+        """Write ``run_manifest.json`` to ``directory`` and return its path.
+
+        The manifest holds the run parameters, per-stage totals and the
+        individual records. It is written to a temporary file first and
+        renamed, so readers never see a partial manifest.
+        """
+
+        self.close()
+        finished_at = datetime.now()
+        manifest = {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "finished_at": finished_at.isoformat(timespec="seconds"),
+            "wall_s": round((finished_at - self.started_at).total_seconds(), 3),
+            "parameters": parameters or {},
+            "stages": self.summary(),
+            "records": self.records,
+        }
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, MANIFEST_NAME)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(tmp_path, path)
+        return path
+
+
+class NullProfiler:
+    """Stand-in for :class:`StageProfiler` when no instrumentation is wanted."""
+
+    records = []
+
+    @contextmanager
+    def stage(self, name, rows_in=0):
+        yield StageRecord(name, rows_in)
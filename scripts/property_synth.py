@@ -0,0 +1,109 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from ids import hex_ids
+
+
+def _bandwidth(values):
+    """Silverman's rule-of-thumb kernel bandwidth for ``values``."""
+
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2:
+        return 0.0
+    iqr = np.subtract(*np.percentile(values, [75, 25]))
+    spread = min(values.std(ddof=1), iqr / 1.34) or values.std(ddof=1)
+    return 0.9 * spread * len(values) ** -0.2
+
+
+def _smoothed_sample(values, n, rng, log=False):
+    """Draw ``n`` values from a kernel-smoothed version of ``values``.
+
+    Listing values are resampled and perturbed with Gaussian noise, so the
+    output follows the listing's distribution without repeating its exact
+    values. ``log`` smooths in log space for skewed positive quantities.
+    """
+
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if log:
+        values = np.log(np.clip(values, 1, None))
+    sample = values[rng.integers(0, len(values), size=n)]
+    sample = sample + rng.normal(0, _bandwidth(values), size=n)
+    return np.exp(sample) if log else sample
+
+
+def _joint_sample(listing, columns, n, rng):
+    """Resample whole rows of ``columns`` so their combinations stay realistic."""
+
+    rows = listing[columns].dropna().reset_index(drop=True)
+    return rows.iloc[rng.integers(0, len(rows), size=n)].reset_index(drop=True)
+
+
+def synthesize_properties(listing, n, rng, faker_pool=None):
+    """Generate ``n`` synthetic properties that resemble ``listing``.
+
+    Type/Subtype and Market/City/State are resampled together so subtypes
+    stay consistent with types and cities with markets. Units, Floors,
+    square footage per unit, Occupancy, Year Built and Last Renovated follow
+    kernel-smoothed versions of the listing's marginals, with renovation
+    kept between construction and the current year. Everything is drawn
+    column-wise, so time and memory grow linearly with ``n``.
+
+    Args:
+        listing (pd.DataFrame): Property listing to learn distributions from,
+            with the columns of ``Enhanced_Property_Listing.xlsx``.
+        n (int): Number of properties to generate.
+        rng (np.random.Generator): Source of randomness.
+        faker_pool (FakerPool, optional): Pool used for street addresses.
+            When omitted, listing addresses are reused.
+
+    Raises:
+        ValueError: If ``n`` is negative or ``listing`` is empty.
+    """
+
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if listing.empty:
+        raise ValueError("listing must contain at least one property")
+
+    current_year = date.today().year
+    types = _joint_sample(listing, ["Type", "Subtype"], n, rng)
+    places = _joint_sample(listing, ["City", "State", "Market"], n, rng)
+
+    units = np.maximum(np.rint(_smoothed_sample(listing["Units"], n, rng, log=True)), 1).astype(np.int64)
+    floors = np.maximum(np.rint(_smoothed_sample(listing["Floors"], n, rng, log=True)), 1).astype(np.int64)
+    sq_ft_per_unit = _smoothed_sample(listing["Total Sq Ft"] / listing["Units"].clip(lower=1), n, rng, log=True)
+    total_sq_ft = np.maximum(np.rint(units * sq_ft_per_unit), units).astype(np.int64)
+    occupancy = np.clip(np.round(_smoothed_sample(listing["Occupancy"], n, rng), 2), 0.0, 1.0)
+    year_built = np.clip(np.rint(_smoothed_sample(listing["Year Built"], n, rng)), 1800, current_year).astype(np.int64)
+
+    last_renovated = np.clip(
+        np.rint(_smoothed_sample(listing["Last Renovated"], n, rng)).astype(np.int64), year_built, current_year
+    )
+
+    if faker_pool is not None:
+        address = pd.Series(faker_pool.sample("street_address", n, rng), dtype=object)
+    else:
+        address = listing["Address"].reset_index(drop=True).iloc[rng.integers(0, len(listing), size=n)].reset_index(drop=True)
+    street_number = address.str.extract(r"^(\d+)", expand=False).fillna(pd.Series(np.arange(n)).astype(str))
+
+    return pd.DataFrame({
+        "Address": address.to_numpy(),
+        "City": places["City"].to_numpy(),
+        "State": places["State"].to_numpy(),
+        "Type": types["Type"].to_numpy(),
+        "Status": listing["Status"].to_numpy()[rng.integers(0, len(listing), size=n)],
+        "Subtype": types["Subtype"].to_numpy(),
+        "Market": places["Market"].to_numpy(),
+        "Legal Entity": ("GCP-" + street_number + ", LLC").to_numpy(),
+        "Floors": floors,
+        "Units": units,
+        "Total Sq Ft": total_sq_ft,
+        "Reserve Requirement": listing["Reserve Requirement"].to_numpy()[rng.integers(0, len(listing), size=n)],
+        "Year Built": year_built,
+        "Last Renovated": last_renovated,
+        "Occupancy": occupancy,
+        "property_id": hex_ids(n, rng),
+    })
@@ -0,0 +1,59 @@
+import glob
+import hashlib
+import os
+
+import pandas as pd
+
+
+DEFAULT_CACHE_DIR = "data/cache/reference"
+
+
+def _cache_path(path, cache_dir):
+    """Return the cache file for ``path`` in its current version.
+
+    The name is keyed on the file's location, size and modification time
+    (and the pandas version the pickle is written with), so editing the
+    source file or upgrading pandas invalidates the cached copy.
+    """
+
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}:{pd.__version__}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(path)}-{digest}.pkl")
+
+
+def read_cached(path, reader, cache_dir=None):
+    """Read ``path`` with ``reader``, reusing a binary copy from earlier runs.
+
+    Parsing the Excel property listing dominates start-up time, so the
+    parsed frame is pickled under ``cache_dir`` and loaded from there while
+    the source file is unchanged. Stale copies of the same file are removed
+    when a new one is written.
+
+    Args:
+        path (str): Source file, e.g. the COA CSV or the property listing.
+        reader (callable): Function parsing ``path`` into a DataFrame, such
+            as ``pd.read_csv`` or ``pd.read_excel``.
+        cache_dir (str, optional): Cache directory. Defaults to
+            ``REFERENCE_CACHE_DIR`` or ``data/cache/reference``; an empty
+            string disables caching.
+    """
+
+    if cache_dir is None:
+        cache_dir = os.getenv("REFERENCE_CACHE_DIR", DEFAULT_CACHE_DIR)
+    if not cache_dir:
+        return reader(path)
+
+    cache_path = _cache_path(path, cache_dir)
+    if os.path.exists(cache_path):
+        return pd.read_pickle(cache_path)
+
+    df = reader(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    for stale in glob.glob(os.path.join(cache_dir, f"{glob.escape(os.path.basename(path))}-*.pkl")):
+        os.remove(stale)
+    # Write to a temporary name first so concurrent readers never see a partial file
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    df.to_pickle(tmp_path)
+    os.replace(tmp_path, cache_path)
+    return df
@@ -0,0 +1,190 @@
+import pandas as pd
+
+
+# Column kinds used in the table schemas below:
+#   "id"       hex ID that is (nearly) unique per row, stored as an
+#              Arrow-backed string (one contiguous buffer instead of a Python
+#              object per row)
+#   "key"      ID repeated across many rows, such as a property or tenant,
+#              stored as a categorical so each row holds a small integer code
+#   "category" low-cardinality label such as a status
+#   "datetime" date or timestamp, stored as datetime64[ns]
+# Anything else is passed to ``astype`` as is.
+KINDS = {
+    "id": "string[pyarrow]",
+    "key": "category",
+    "category": "category",
+}
+
+SCHEMAS = {
+    "tenants": {
+        "id": "id",
+        "property_id": "key",
+        "unit_id": "id",
+        "industry": "category",
+        "annual_revenue": "category",
+        "employee_count": "int32",
+        "lease_start_date": "datetime",
+        "move_in_reason": "category",
+    },
+    "units": {
+        "id": "id",
+        "property_id": "key",
+        "unit_number": "category",
+        "floor_number": "int16",
+        "sq_ft": "int32",
+        "occupancy_status": "category",
+        "last_renovated": "datetime",
+        "last_occupied": "datetime",
+        "last_vacated": "datetime",
+        "created_at": "datetime",
+        "modified_at": "datetime",
+    },
+    "leases": {
+        "id": "id",
+        "tenant_id": "key",
+        "unit_id": "id",
+        "property_id": "key",
+        "lease_start": "datetime",
+        "lease_end": "datetime",
+        "rent_start_date": "datetime",
+        "deposit_amount": "float64",
+        "monthly_rent": "float64",
+        "payment_timing": "category",
+        "lease_status": "category",
+        "auto_renew": "bool",
+        "lease_type": "category",
+        "late_fee_terms": "category",
+        "early_termination_clause": "category",
+        "pro_rated_start": "bool",
+        "escalation_clause": "bool",
+        "expense_reimbursement_clause": "bool",
+        "escalation_type": "category",
+        "escalation_rate": "float64",
+        "fixed_rent_commencement": "bool",
+        "rent_deferral_months": "int16",
+        "free_rent_months": "int16",
+    },
+    "payment_schedule": {
+        "id": "id",
+        "lease_id": "key",
+        "property_id": "key",
+        "unit_id": "key",
+        "tenant_id": "key",
+        "schd_dt": "datetime",
+        "pymnt_amt": "float64",
+        "escal_type": "category",
+        "is_prorated": "bool",
+        "bill_period_start": "datetime",
+        "bill_period_end": "datetime",
+        "billing_basis": "category",
+        "yr": "int16",
+        "mo_txt": "category",
+    },
+    "rent_escalations": {
+        "lease_id": "key",
+        "property_id": "key",
+        "lease_year": "int16",
+        "monthly_rent": "float64",
+    },
+    "cust_invoices": {
+        "id": "id",
+        "invoice_date": "datetime",
+        "due_date": "datetime",
+        "tenant_id": "key",
+        "property_id": "key",
+        "unit_id": "key",
+        "lease_id": "key",
+        "billing_period_start": "datetime",
+        "billing_period_end": "datetime",
+        "amount_due": "float64",
+        "status": "category",
+        "payment_date": "datetime",
+        "gltran_id": "id",
+    },
+    "vend_invoices": {
+        "id": "id",
+        "invoice_date": "datetime",
+        "due_date": "datetime",
+        "property_id": "key",
+        "vendor_id": "key",
+        "vendor_name": "category",
+        "amount_due": "float64",
+        "status": "category",
+        "payment_date": "datetime",
+        "description": "category",
+        "gl_account_name": "category",
+        "gl_class": "category",
+        "gl_type": "category",
+        "gltran_id": "id",
+    },
+    "checkreg": {
+        "id": "id",
+        "invoice_id": "id",
+        "vendor_id": "key",
+        "check_date": "datetime",
+        "amount": "float64",
+        "property_id": "key",
+        "gltran_id": "id",
+        "created_by": "category",
+        "created_at": "datetime",
+        "modified_by": "category",
+        "modified_at": "datetime",
+    },
+    "receipts": {
+        "id": "id",
+        "invoice_id": "id",
+        "tenant_id": "key",
+        "receipt_date": "datetime",
+        "amount": "float64",
+        "payment_method": "category",
+        "property_id": "key",
+        "gltran_id": "id",
+        "created_by": "category",
+        "created_at": "datetime",
+        "modified_by": "category",
+        "modified_at": "datetime",
+    },
+    "gltran": {
+        "id": "id",
+        "date": "datetime",
+        "amount": "float64",
+        "debit_credit": "category",
+        "account_id": "category",
+        "property_id": "key",
+        "tenant_id": "key",
+        "vendor_id": "key",
+        "transaction_type": "category",
+        "source_document": "id",
+        "batch_id": "id",
+        "cleared_in_bank": "bool",
+        "created_by": "category",
+        "created_at": "datetime",
+        "modified_by": "category",
+        "modified_at": "datetime",
+    },
+}
+
+
+def apply_schema(df, table):
+    """Cast ``df`` to the compact dtypes registered for ``table``.
+
+    Columns missing from ``df`` are skipped and columns without a schema
+    entry are left as they are. Dates become ``datetime64[ns]`` whether
+    they arrive as ``datetime.date`` objects, strings or Timestamps.
+
+    Raises:
+        KeyError: If ``table`` has no registered schema.
+    """
+
+    schema = SCHEMAS[table]
+    casts = {}
+    df = df.copy()
+    for column, kind in schema.items():
+        if column not in df.columns:
+            continue
+        if kind == "datetime":
+            df[column] = pd.to_datetime(df[column]).astype("datetime64[ns]")
+        else:
+            casts[column] = KINDS.get(kind, kind)
+    return df.astype(casts)
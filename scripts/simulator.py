@@ -0,0 +1,211 @@
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from create_daily_transactions import DAILY_TABLES, OpenItems, load_state, simulate_days
+from create_historical_data import hist_dir
+from writers import DailyPartitionWriter
+
+KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
+# Each table is published to "<prefix>.<table>", e.g. "cre.gltran"
+SIMULATOR_TOPIC_PREFIX = os.getenv("SIMULATOR_TOPIC_PREFIX", "cre")
+
+def _records(df):
+    """Return ``df`` as one JSON document per row, with ISO dates."""
+
+    if df.empty:
+        return []
+    return df.to_json(orient="records", lines=True, date_format="iso").splitlines()
+
+
+class VirtualClock:
+    """Simulated calendar advancing ``speed`` days per wall-clock second.
+
+    Tick deadlines are measured from the start of the run, so slow ticks do
+    not make the clock drift; a speed of 0 runs as fast as possible.
+    """
+
+    def __init__(self, start, speed=1.0, sleep=time.sleep, monotonic=time.monotonic):
+        self.start = start
+        self.speed = speed
+        self._sleep = sleep
+        self._monotonic = monotonic
+
+    def ticks(self, days=None):
+        """Yield simulated days, forever or ``days`` times."""
+
+        began = self._monotonic()
+        tick = 0
+        while days is None or tick < days:
+            if self.speed > 0:
+                delay = began + tick / self.speed - self._monotonic()
+                if delay > 0:
+                    self._sleep(delay)
+            yield self.start + timedelta(days=tick)
+            tick += 1
+
+
+class JsonLinesSink:
+    """Write every emitted row to ``stream`` as ``{"table", "day", "record"}`` JSON."""
+
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+
+    def emit(self, day, tables):
+        for name, df in tables.items():
+            for record in _records(df):
+                self.stream.write(f'{{"table": "{name}", "day": "{day.isoformat()}", "record": {record}}}\n')
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class KafkaSink:
+    """Publish every emitted row to the ``<prefix>.<table>`` Kafka topic, keyed by property."""
+
+    def __init__(self, bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS, prefix=SIMULATOR_TOPIC_PREFIX):
+        # Imported here so the simulator runs without kafka-python installed
+        from kafka import KafkaProducer
+
+        self.producer = KafkaProducer(bootstrap_servers=bootstrap_servers, linger_ms=50)
+        self.prefix = prefix
+
+    def emit(self, day, tables):
+        for name, df in tables.items():
+            keys = df["property_id"].astype(str).tolist() if "property_id" in df.columns else [None] * len(df)
+            for key, record in zip(keys, _records(df)):
+                self.producer.send(
+                    f"{self.prefix}.{name}", value=record.encode(), key=key.encode() if key else None
+                )
+        self.producer.flush()
+
+    def close(self):
+        self.producer.close()
+
+
+class DailyPartitionSink:
+    """Commit every simulated day to the historical tables' daily partitions.
+
+    ``open_items`` (the simulator's :class:`OpenItems`) are committed when
+    the sink is closed, so later daily runs settle them.
+    """
+
+    def __init__(self, directory, fmt, open_items=None):
+        self.writer = DailyPartitionWriter(directory, fmt)
+        self.open_items = open_items
+
+    def emit(self, day, tables):
+        self.writer.write_day(day, tables)
+
+    def close(self):
+        if self.open_items is not None:
+            self.writer.write_days({}, open_items=self.open_items.tables())
+
+
+class PortfolioSimulator:
+    """Generate the portfolio's transactions one simulated day at a time.
+
+    Leases, tenants, vendors, the escalation state and the open items are
+    loaded once and kept in memory. Each tick runs the daily job for that
+    day: it bills the rent due, draws the day's vendor invoices and emits
+    them unpaid, holds the receipts, checks and GL entries settling them in
+    the open items, and emits the open items paid that day. Everything is
+    evaluated on the simulated day rather than the real date.
+
+    Args:
+        state (dict): Portfolio from ``create_daily_transactions.load_state``.
+        rng (np.random.Generator, optional): Source of randomness. Defaults
+            to the daily job's per-day generators.
+    """
+
+    def __init__(self, state, rng=None, min_vendor_invoices=5, max_vendor_invoices=15):
+        self.state = state
+        self.state.setdefault("open_items", OpenItems())
+        self.rng = rng
+        self.min_vendor_invoices = min_vendor_invoices
+        self.max_vendor_invoices = max_vendor_invoices
+
+    def open_items(self):
+        """Number of payments and GL entries waiting for their payment date."""
+
+        return self.state["open_items"].counts()
+
+    def tick(self, day):
+        """Return the tables emitted on ``day`` (name -> DataFrame).
+
+        Open items of days no run covered are emitted on the first tick.
+        """
+
+        by_day = simulate_days(
+            self.state, day, day, self.min_vendor_invoices, self.max_vendor_invoices, self.rng
+        )
+        return {
+            name: pd.concat([tables[name] for tables in by_day.values()], ignore_index=True)
+            for name in DAILY_TABLES
+        }
+
+    def run(self, clock, sink, days=None, log=sys.stderr):
+        """Emit every tick of ``clock`` to ``sink`` and return the rows emitted."""
+
+        total = 0
+        began = time.perf_counter()
+        try:
+            for day in clock.ticks(days):
+                tables = self.tick(day)
+                sink.emit(day, tables)
+                rows = sum(len(df) for df in tables.values())
+                total += rows
+                elapsed = time.perf_counter() - began
+                print(
+                    f"{day.isoformat()} rows={rows:<7} total={total:<9} "
+                    f"{total / elapsed if elapsed > 0 else 0:>10,.0f} rows/s open={self.open_items()}",
+                    file=log,
+                )
+        finally:
+            sink.close()
+        return total
+
+
+def make_sink(name, directory=hist_dir, fmt="csv", open_items=None):
+    """Return the sink called ``name``: ``"stdout"``, ``"kafka"`` or ``"daily"``.
+
+    The ``"daily"`` sink also commits ``open_items`` when closed.
+
+    Raises:
+        ValueError: If ``name`` is not a known sink.
+    """
+
+    if name == "stdout":
+        return JsonLinesSink()
+    if name == "kafka":
+        return KafkaSink()
+    if name == "daily":
+        return DailyPartitionSink(directory, fmt, open_items)
+    raise ValueError(f"unknown sink: {name!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream simulated CRE transactions day by day.")
+    parser.add_argument("--start", type=date.fromisoformat, default=None,
+                        help="first simulated day, YYYY-MM-DD (default: today)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="simulated days per second; 0 runs as fast as possible (default: 1)")
+    parser.add_argument("--days", type=int, default=None,
+                        help="stop after this many days (default: run forever)")
+    parser.add_argument("--sink", choices=["stdout", "kafka", "daily"], default="stdout",
+                        help="where to emit each day's rows (default: stdout)")
+    args = parser.parse_args(argv)
+
+    state = load_state(hist_dir)
+    sink = make_sink(args.sink, hist_dir, state["format"], state["open_items"])
+    clock = VirtualClock(args.start or date.today(), args.speed)
+    PortfolioSimulator(state).run(clock, sink, args.days)
+
+
+if __name__ == "__main__":
+    main()
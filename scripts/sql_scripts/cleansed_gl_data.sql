@@ -61,7 +61,7 @@ FROM gltran gl
 	LEFT JOIN properties p
 		ON gl.property_id = p.property_id
 	LEFT JOIN tenants t
-		ON gl.tenant_id::text = t.id
+		ON gl.tenant_id = t.id
 	LEFT JOIN vendors v
 		ON gl.vendor_id = v.id
 	LEFT JOIN combined_sources cs
@@ -0,0 +1,402 @@
+import glob
+import json
+import os
+import shutil
+from datetime import datetime
+
+import pandas as pd
+
+
+# Date column each table is partitioned on when writing with ``partition_by="year"``
+YEAR_COLUMNS = {
+    "leases": "lease_start",
+    "payment_schedule": "schd_dt",
+    "cust_invoices": "invoice_date",
+    "vend_invoices": "invoice_date",
+    "checkreg": "check_date",
+    "receipts": "receipt_date",
+    "gltran": "date",
+}
+
+# Directory name used for rows whose partition value is missing
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Per-day partitions appended by the daily jobs, and the manifest committing them
+DAILY_DIR = "_daily"
+DAILY_MANIFEST = "_manifest.json"
+# Rows the daily job carries over to its next run, committed with the manifest
+OPEN_ITEMS_DIR = "_open"
+
+
+class CsvWriter:
+    """Write each table to ``<directory>/<name>.csv``.
+
+    Appends add rows without a header, in the column order of the existing
+    file, so partial writes from several partitions line up.
+    """
+
+    format = "csv"
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def write(self, name, df, append=False):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{name}.csv")
+        if append and os.path.exists(path):
+            header = pd.read_csv(path, nrows=0).columns
+            df.reindex(columns=header).to_csv(path, mode="a", header=False, index=False)
+        else:
+            df.to_csv(path, index=False)
+
+
+class ParquetWriter:
+    """Write each table as a directory of Parquet files under ``<directory>/<name>/``.
+
+    Parquet keeps column types (dates, booleans, integers, decimals), so
+    readers do not have to re-infer them. Tables can be split into
+    Hive-style ``key=value`` subdirectories by ``property_id`` and/or
+    ``year``; the year comes from the table's date column in
+    ``YEAR_COLUMNS``. Partition keys a table does not have are skipped.
+    Every file keeps all of the table's columns, so files can be read on
+    their own. Each ``write`` adds new part files, so appends never rewrite
+    earlier data; appended rows are partitioned like the existing table.
+
+    Args:
+        directory (str): Output directory.
+        partition_by (list[str], optional): Any of ``"property_id"`` and
+            ``"year"``.
+        compression (str): Parquet codec, e.g. ``"snappy"``, ``"zstd"``,
+            ``"gzip"`` or ``"none"``.
+
+    Raises:
+        ValueError: If ``partition_by`` contains an unsupported key.
+    """
+
+    format = "parquet"
+    partition_keys = ("property_id", "year")
+
+    def __init__(self, directory, partition_by=None, compression="snappy"):
+        # Imported here so the CSV backend works without pyarrow installed
+        import pyarrow  # noqa: F401
+
+        partition_by = list(partition_by or [])
+        unknown = set(partition_by) - set(self.partition_keys)
+        if unknown:
+            raise ValueError(f"unsupported partition keys: {sorted(unknown)}")
+        self.directory = directory
+        self.partition_by = partition_by
+        self.compression = None if compression == "none" else compression
+
+    @staticmethod
+    def _existing_partition_keys(table_dir):
+        keys = []
+        while True:
+            subdirs = sorted(entry for entry in os.listdir(table_dir) if "=" in entry)
+            if not subdirs:
+                return keys
+            keys.append(subdirs[0].split("=", 1)[0])
+            table_dir = os.path.join(table_dir, subdirs[0])
+
+    def _partition_values(self, name, df, partition_by):
+        values = {}
+        for key in partition_by:
+            if key == "year" and name in YEAR_COLUMNS and YEAR_COLUMNS[name] in df.columns:
+                values[key] = pd.to_datetime(df[YEAR_COLUMNS[name]]).dt.year.astype("Int64")
+            elif key == "property_id" and key in df.columns:
+                values[key] = df[key]
+        return values
+
+    def write(self, name, df, append=False):
+        table_dir = os.path.join(self.directory, name)
+        partition_by = self.partition_by
+        if append and os.path.isdir(table_dir):
+            # Appends follow the layout the table was first written with
+            partition_by = self._existing_partition_keys(table_dir)
+        elif os.path.isdir(table_dir):
+            shutil.rmtree(table_dir)
+
+        values = self._partition_values(name, df, partition_by)
+        if not values or df.empty:
+            self._write_part(table_dir, df)
+            return
+
+        keys = pd.DataFrame(values, index=df.index)
+        for group, group_keys in keys.groupby(list(values), dropna=False, sort=True):
+            parts = [
+                f"{key}={NULL_PARTITION if pd.isna(value) else value}"
+                for key, value in zip(values, group)
+            ]
+            self._write_part(os.path.join(table_dir, *parts), df.loc[group_keys.index])
+
+    def _write_part(self, part_dir, df):
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, f"part-{len(os.listdir(part_dir)):05d}.parquet")
+        df.to_parquet(path, index=False, compression=self.compression)
+
+
+class DailyPartitionWriter:
+    """Append one day of rows per table as immutable per-day partition files.
+
+    Files go to ``<directory>/_daily/<table>/date=<day>/part-<version>.<format>``
+    and only become visible once ``_daily/_manifest.json`` lists them. The
+    manifest is replaced atomically after every file of the day is written,
+    so a crash leaves the previous snapshot intact (stray files of the
+    failed run are ignored and overwritten by the next one), and a write
+    costs O(rows of the day) however long the history is. Writing a day
+    again replaces its partition. Only one writer may run at a time.
+
+    Args:
+        directory (str): Directory holding the historical tables.
+        fmt (str): ``"csv"`` or ``"parquet"``.
+
+    Raises:
+        ValueError: If ``fmt`` is not a known format.
+    """
+
+    def __init__(self, directory, fmt=CsvWriter.format):
+        if fmt not in WRITERS:
+            raise ValueError(f"unknown output format: {fmt!r}")
+        self.directory = directory
+        self.format = fmt
+
+    def _write_file(self, path, df):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        if self.format == CsvWriter.format:
+            df.to_csv(tmp_path, index=False)
+        else:
+            df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def write_day(self, day, tables):
+        """Commit ``tables`` (name -> DataFrame) as the partition for ``day``.
+
+        Returns:
+            dict: The committed manifest.
+        """
+
+        return self.write_days({day: tables})
+
+    def write_days(self, days, open_items=None):
+        """Commit several days (day -> name -> DataFrame) in one manifest update.
+
+        ``open_items`` (name -> DataFrame), when given, replaces the rows the
+        daily job carries over to its next run, e.g. payments not yet due.
+        They are committed with the days but are not part of any table;
+        read them back with :func:`read_open_items`.
+        """
+
+        manifest = read_daily_manifest(self.directory)
+        version = manifest["version"] + 1
+        superseded = []
+        for day, tables in days.items():
+            key = day.isoformat()
+            files = {}
+            for name, df in tables.items():
+                files[name] = []
+                if df.empty:
+                    continue
+                relpath = os.path.join(DAILY_DIR, name, f"date={key}", f"part-{version:05d}.{self.format}")
+                self._write_file(os.path.join(self.directory, relpath), df)
+                files[name].append(relpath)
+            superseded.extend(p for paths in manifest["days"].get(key, {}).values() for p in paths)
+            manifest["days"][key] = files
+
+        if open_items is not None:
+            files = {}
+            for name, df in open_items.items():
+                files[name] = []
+                if df.empty:
+                    continue
+                relpath = os.path.join(DAILY_DIR, OPEN_ITEMS_DIR, name, f"part-{version:05d}.{self.format}")
+                self._write_file(os.path.join(self.directory, relpath), df)
+                files[name].append(relpath)
+            superseded.extend(p for paths in manifest.get("open_items", {}).values() for p in paths)
+            manifest["open_items"] = files
+
+        manifest["days"] = dict(sorted(manifest["days"].items()))
+        manifest["version"] = version
+        manifest["committed_at"] = datetime.now().isoformat(timespec="seconds")
+        path = os.path.join(self.directory, DAILY_DIR, DAILY_MANIFEST)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+        # Readers of the new manifest no longer reference the replaced files
+        for relpath in superseded:
+            if os.path.exists(os.path.join(self.directory, relpath)):
+                os.remove(os.path.join(self.directory, relpath))
+        return manifest
+
+
+def read_daily_manifest(directory):
+    """Return the committed daily partitions under ``directory``.
+
+    Pass the result to :func:`read_table` as ``manifest`` to read several
+    tables from the same snapshot while the daily job keeps appending.
+    """
+
+    path = os.path.join(directory, DAILY_DIR, DAILY_MANIFEST)
+    if not os.path.exists(path):
+        return {"version": 0, "days": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_open_items(directory, manifest=None):
+    """Return the open items (name -> DataFrame) committed with ``manifest``.
+
+    Tables without open items are left out.
+    """
+
+    if manifest is None:
+        manifest = read_daily_manifest(directory)
+    tables = {}
+    for name, files in manifest.get("open_items", {}).items():
+        frames = [_read_part(os.path.join(directory, relpath)) for relpath in files]
+        if frames:
+            tables[name] = pd.concat(frames, ignore_index=True)
+    return tables
+
+
+WRITERS = {
+    CsvWriter.format: CsvWriter,
+    ParquetWriter.format: ParquetWriter,
+}
+
+
+def get_writer(fmt, directory, **options):
+    """Return the writer for ``fmt`` (``"csv"`` or ``"parquet"``).
+
+    ``options`` are passed to the writer, e.g. ``partition_by`` and
+    ``compression`` for Parquet.
+
+    Raises:
+        ValueError: If ``fmt`` is not a known format.
+    """
+
+    if fmt not in WRITERS:
+        raise ValueError(f"unknown output format: {fmt!r}")
+    return WRITERS[fmt](directory, **options)
+
+
+def table_format(directory, name):
+    """Return the format ``name`` is stored in under ``directory``, or ``None``."""
+
+    if os.path.isdir(os.path.join(directory, name)):
+        return ParquetWriter.format
+    if os.path.exists(os.path.join(directory, f"{name}.csv")):
+        return CsvWriter.format
+    return None
+
+
+def _read_parquet(table_dir, columns=None):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    files = sorted(glob.glob(os.path.join(table_dir, "**", "*.parquet"), recursive=True))
+    if not files:
+        return pd.DataFrame(columns=columns)
+    # Parts written from different partitions may type an all-null column
+    # differently, so read them against a unified schema
+    schemas = [ds.dataset(path, format="parquet").schema for path in files]
+    schema = pa.unify_schemas(schemas, promote_options="permissive")
+    return ds.dataset(files, schema=schema, format="parquet").to_table(columns=columns).to_pandas()
+
+
+def table_files(directory, name, manifest=None):
+    """Return the files holding table ``name``, oldest first.
+
+    These are the CSV or Parquet files of the base table followed by the
+    daily partitions committed in ``manifest`` (the current one by default),
+    for readers that stream files instead of loading a DataFrame.
+
+    Raises:
+        FileNotFoundError: If the table does not exist in any format.
+    """
+
+    fmt = table_format(directory, name)
+    files = []
+    if fmt == CsvWriter.format:
+        files.append(os.path.join(directory, f"{name}.csv"))
+    elif fmt == ParquetWriter.format:
+        files.extend(sorted(glob.glob(os.path.join(directory, name, "**", "*.parquet"), recursive=True)))
+    if manifest is None:
+        manifest = read_daily_manifest(directory)
+    for day in manifest["days"].values():
+        files.extend(os.path.join(directory, relpath) for relpath in day.get(name, []))
+    if fmt is None and not files:
+        raise FileNotFoundError(f"no table {name!r} in {directory}")
+    return files
+
+
+def _read_part(path, parse_dates=None, columns=None):
+    if path.endswith(".csv"):
+        return pd.read_csv(path, parse_dates=parse_dates, usecols=columns)
+    return pd.read_parquet(path, columns=columns)
+
+
+def _read_daily(directory, name, manifest, parse_dates=None, columns=None):
+    frames = []
+    for files in manifest["days"].values():
+        for relpath in files.get(name, []):
+            frames.append(_read_part(os.path.join(directory, relpath), parse_dates, columns))
+    return frames
+
+
+def read_table(directory, name, parse_dates=None, columns=None, manifest=None):
+    """Read table ``name`` from ``directory`` in whichever format it was written.
+
+    Rows appended by :class:`DailyPartitionWriter` are included as of the
+    daily ``manifest`` (the current one by default).
+
+    Args:
+        directory (str): Directory the table was written to.
+        name (str): Table name, e.g. ``"leases"``.
+        parse_dates (list[str], optional): Columns to return as datetime64,
+            as with ``pd.read_csv``.
+        columns (list[str], optional): Only read these columns.
+        manifest (dict, optional): Snapshot from :func:`read_daily_manifest`.
+
+    Raises:
+        FileNotFoundError: If the table does not exist in any format.
+    """
+
+    if manifest is None:
+        manifest = read_daily_manifest(directory)
+    frames = _read_daily(directory, name, manifest, parse_dates, columns)
+
+    fmt = table_format(directory, name)
+    if fmt is None and not frames:
+        raise FileNotFoundError(f"no table {name!r} in {directory}")
+    if fmt == CsvWriter.format:
+        frames.insert(0, pd.read_csv(os.path.join(directory, f"{name}.csv"), parse_dates=parse_dates, usecols=columns))
+    elif fmt == ParquetWriter.format:
+        frames.insert(0, _read_parquet(os.path.join(directory, name), columns))
+
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    for column in parse_dates or []:
+        df[column] = pd.to_datetime(df[column])
+    return df
+
+
+def add_output_arguments(parser):
+    """Add ``--format``, ``--partition-by`` and ``--compression`` to ``parser``."""
+
+    parser.add_argument("--format", choices=sorted(WRITERS), default=CsvWriter.format,
+                        help="output format (default: csv)")
+    parser.add_argument("--partition-by", nargs="+", choices=ParquetWriter.partition_keys, default=None,
+                        help="partition Parquet tables by these keys")
+    parser.add_argument("--compression", default="snappy",
+                        help="Parquet compression codec (default: snappy)")
+
+
+def writer_from_args(args, directory):
+    """Build the writer selected by the arguments from :func:`add_output_arguments`."""
+
+    if args.format == ParquetWriter.format:
+        return ParquetWriter(directory, partition_by=args.partition_by, compression=args.compression)
+    return get_writer(args.format, directory)
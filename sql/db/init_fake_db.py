@@ -1,9 +1,14 @@
 import sqlite3
 import os
-import pandas as pd
+import sys
 
-DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'raw', 'synthetic', 'simulated', 'yardi')
-DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'data', 'fake_cashsight.db')
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+from writers import read_table, table_format  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT_DIR, 'data', 'raw', 'synthetic', 'simulated', 'yardi')
+DB_PATH = os.path.join(ROOT_DIR, 'data', 'fake_cashsight.db')
 
 TABLES = [
     'tenants', 'units', 'leases', 'payment_schedule', 'vendors',
@@ -15,11 +20,10 @@ def init_db():
     conn = sqlite3.connect(DB_PATH)
     try:
         for table in TABLES:
-            csv_path = os.path.join(DATA_DIR, f"{table}.csv")
-            if not os.path.exists(csv_path):
-                print(f"Warning: {csv_path} not found, skipping {table}.")
+            if table_format(DATA_DIR, table) is None:
+                print(f"Warning: {table} not found in {DATA_DIR}, skipping {table}.")
                 continue
-            df = pd.read_csv(csv_path)
+            df = read_table(DATA_DIR, table)
             df.to_sql(table, conn, if_exists='replace', index=False)
         print(f"Database created at {DB_PATH}")
     finally:
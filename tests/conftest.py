@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# The scripts import their sibling modules by name, as they do when run
+# from the ``scripts`` directory.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
@@ -0,0 +1,38 @@
+import importlib.util
+from pathlib import Path
+
+
+def load_module():
+    file_path = Path('benchmarks/bench_generators.py')
+    spec = importlib.util.spec_from_file_location('bench_generators', file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def result(stage, scale, wall_s, stage_rss_mb):
+    return {'stage': stage, 'scale': scale, 'wall_s': wall_s, 'stage_rss_mb': stage_rss_mb}
+
+
+def test_compare_flags_slowdowns_and_memory_growth():
+    module = load_module()
+    baseline = {'results': [
+        result('generate_units', 100, 1.0, 100.0),
+        result('generate_gltran', 100, 2.0, 200.0),
+        result('generate_leases', 100, 0.001, 0.0),
+    ]}
+    current = {'results': [
+        result('generate_units', 100, 1.1, 300.0),
+        result('generate_gltran', 100, 3.0, 210.0),
+        result('generate_leases', 100, 0.5, 50.0),
+        result('generate_receipts', 100, 9.0, 900.0),
+    ]}
+
+    regressions = module.compare(current, baseline, max_slowdown=1.25, max_memory_growth=1.25)
+    flagged = {(r['stage'], r['metric']) for r in regressions}
+    assert flagged == {('generate_units', 'stage_rss_mb'), ('generate_gltran', 'wall_s')}
+
+
+def test_stages_cover_every_generator():
+    module = load_module()
+    assert set(module.STAGES) == set(module.OUTPUT_TABLES)
@@ -59,3 +59,243 @@ def test_generate_cust_invoices_matches_schedule():
     cust = module.generate_cust_invoices(sched, leases, tenants)
     assert len(cust) == len(sched)
     assert set(cust["lease_id"]) == {"L1"}
+
+
+def test_generate_cust_invoices_description_and_empty_schedule():
+    module = load_module()
+    lease_start = pd.Timestamp("2024-01-15")
+    leases = pd.DataFrame([
+        {
+            "id": "L1",
+            "property_id": "P1",
+            "unit_id": "U1",
+            "tenant_id": "T1",
+            "lease_start": lease_start,
+            "rent_start_date": lease_start,
+            "lease_end": pd.Timestamp("2024-03-31"),
+            "monthly_rent": 1000,
+            "pro_rated_start": True,
+            "payment_timing": "In Advance",
+            "lease_type": "Commercial",
+        }
+    ])
+    tenants = pd.DataFrame([{"id": "T1", "business_name": "Tenant1"}])
+    sched = module.generate_lease_pymnt_sched(leases, months_out=3)
+    cust = module.generate_cust_invoices(sched, leases, tenants)
+    assert cust.iloc[0]["description"] == (
+        "Commercial rent due for Tenant1 covering Jan 2024 (prorated) — billed in advance"
+    )
+    assert (cust["due_date"] > cust["invoice_date"]).all()
+
+    empty = module.generate_cust_invoices(sched.iloc[:0], leases, tenants)
+    assert empty.empty
+    assert list(empty.columns) == list(cust.columns)
+
+
+def test_generate_vendor_invoices_gl_lookup_and_dates():
+    module = load_module()
+    properties = module.properties_df.head(1).copy()
+    vendors = pd.DataFrame([
+        {"id": "V1", "service_type": "Engineering Services", "name": "Vend 1"},
+    ])
+    leases = pd.DataFrame([
+        {
+            "id": "L1",
+            "property_id": properties.iloc[0]["property_id"],
+            "lease_start": pd.Timestamp("2024-01-01"),
+        },
+    ])
+    inv = module.generate_vendor_invoices(vendors, properties, leases, module.coa_df, 20, 20)
+    assert len(inv) == 20
+    assert set(inv["gl_account"]) == {60225}
+    assert set(inv["gl_account_name"]) == {"engineering fees"}
+    assert (pd.to_datetime(inv["invoice_date"]) >= pd.Timestamp("2024-01-01")).all()
+    assert (inv["due_date"] > inv["invoice_date"]).all()
+
+
+def test_generate_gltran_pairs_and_gltran_ids():
+    module = load_module()
+    cust = pd.DataFrame([
+        {"id": "C1", "property_id": "P1", "tenant_id": "T1", "amount_due": 100.0, "status": "Paid"},
+        {"id": "C2", "property_id": "P1", "tenant_id": "T1", "amount_due": 50.0, "status": "Unpaid"},
+    ])
+    vend = pd.DataFrame([
+        {"id": "VI1", "property_id": "P1", "vendor_id": "V1", "amount_due": 75.0, "status": "Paid",
+         "gl_account_name": "engineering fees"},
+    ])
+    receipts = pd.DataFrame([
+        {"id": "R1", "property_id": "P1", "tenant_id": "T1", "amount": 100.0},
+    ])
+    checkreg = pd.DataFrame([
+        {"id": "K1", "property_id": "P1", "vendor_id": "V1", "amount": 75.0},
+    ])
+    gl = module.generate_gltran(cust, vend, receipts, checkreg, module.coa_df)
+    gltran = gl["gltran"]
+    assert len(gltran) == 8
+    assert list(gltran["debit_credit"]) == ["Debit", "Credit"] * 4
+    assert gltran.groupby("batch_id")["amount"].nunique().eq(1).all()
+    assert gltran.loc[gltran["transaction_type"] == "Check", "account_id"].iloc[1] == "cash - operating account"
+    assert gl["cust_invoices"]["gltran_id"].isna().tolist() == [False, True]
+    assert gl["checkreg"].iloc[0]["gltran_id"] in set(gltran["batch_id"])
+
+
+def test_generate_receipts_does_not_mutate_invoices():
+    module = load_module()
+    cust = pd.DataFrame([
+        {"id": f"C{i}", "property_id": "P1", "tenant_id": "T1", "amount_due": 100.0,
+         "status": "Paid" if i % 2 else "Unpaid", "invoice_date": pd.Timestamp("2024-01-01").date(),
+         "due_date": pd.Timestamp("2024-01-10").date(), "payment_date": None}
+        for i in range(10)
+    ])
+    receipts = module.generate_receipts(cust)
+    assert len(receipts) == 5
+    assert cust["payment_date"].isna().all()
+    assert (pd.to_datetime(receipts["receipt_date"]) >= pd.Timestamp("2024-01-10")).all()
+    assert (pd.to_datetime(receipts["receipt_date"]) <= pd.Timestamp("2024-05-09")).all()
+
+    cust = module.apply_payment_dates(cust, receipts, "receipt_date")
+    assert cust["payment_date"].notna().tolist() == [bool(i % 2) for i in range(10)]
+
+
+def daily_state(rng):
+    import create_synthetic_sample_data as module
+
+    properties = module.load_portfolio(3, rng)
+    units = module.generate_units(properties, rng)
+    tenants = module.generate_tenants(properties, units, rng, allow_empty=True)
+    leases = module.generate_leases(properties, tenants, units, rng)
+    return {
+        'properties': properties,
+        'vendors': module.generate_vendors(module.generate_user(rng=rng), num_vendors=5, rng=rng),
+        'leases': leases,
+        'tenants': tenants,
+        'escalations': module.generate_rent_escalations(leases, rng),
+    }
+
+
+def test_simulate_days_groups_rows_by_simulated_day():
+    import numpy as np
+    from datetime import date
+
+    import create_daily_transactions as daily
+    import create_synthetic_sample_data as module
+
+    rng = np.random.default_rng(5)
+    state = daily_state(rng)
+    leases = state['leases']
+
+    by_day = daily.simulate_days(state, date(2025, 2, 27), date(2025, 3, 2), min_vendor_invoices=1,
+                                 max_vendor_invoices=2, rng=rng)
+    assert list(by_day) == [date(2025, 2, 27), date(2025, 2, 28), date(2025, 3, 1), date(2025, 3, 2)]
+
+    for day, tables in by_day.items():
+        assert set(tables) == set(daily.DAILY_TABLES)
+        vend = tables['vend_invoices']
+        assert (pd.to_datetime(vend['invoice_date']) == pd.Timestamp(day)).all()
+        assert vend.groupby('property_id', observed=True).size().between(1, 2).all()
+        assert set(tables['checkreg']['invoice_id']) <= set(vend['id'])
+        assert (pd.to_datetime(tables['gltran']['date']) == pd.Timestamp(day)).all()
+        if day.day != 1:
+            assert tables['cust_invoices'].empty
+
+    expected = module.lease_pymnt_sched_between(leases, state['escalations'], date(2025, 3, 1),
+                                                months_out=daily.HISTORY_MONTHS)
+    assert len(by_day[date(2025, 3, 1)]['cust_invoices']) == len(expected) > 0
+
+
+def test_simulate_days_settles_open_items_on_their_payment_date():
+    import numpy as np
+    import pytest
+    from datetime import date
+
+    import create_daily_transactions as daily
+
+    rng = np.random.default_rng(8)
+    state = daily_state(rng)
+    start, end = date(2025, 3, 1), date(2025, 4, 30)
+    by_day = daily.simulate_days(state, start, end, min_vendor_invoices=1, max_vendor_invoices=2, rng=rng)
+    assert list(by_day) == list(pd.date_range(start, end).date)
+
+    issued = {}
+    for day, tables in by_day.items():
+        for name in ['cust_invoices', 'vend_invoices']:
+            assert (tables[name]['status'] == 'Unpaid').all()
+            assert tables[name]['payment_date'].isna().all()
+            issued.update(dict.fromkeys(tables[name]['id'], day))
+        assert (pd.to_datetime(tables['checkreg']['check_date']) == pd.Timestamp(day)).all()
+        assert (pd.to_datetime(tables['receipts']['receipt_date']) == pd.Timestamp(day)).all()
+        assert (pd.to_datetime(tables['gltran']['date']) == pd.Timestamp(day)).all()
+        for name in ['checkreg', 'receipts']:
+            assert all(issued[invoice] < day for invoice in tables[name]['invoice_id'])
+
+    checks = pd.concat([tables['checkreg'] for tables in by_day.values()])
+    receipts = pd.concat([tables['receipts'] for tables in by_day.values()])
+    assert not checks.empty and not receipts.empty
+
+    # Invoices paid after the range stay open for later runs
+    open_items = state['open_items'].tables()
+    assert (pd.to_datetime(open_items['checkreg']['check_date']) > pd.Timestamp(end)).all()
+    assert state['settled_through'] == end
+
+    with pytest.raises(ValueError, match='before start'):
+        daily.simulate_days(state, end, start, rng=rng)
+    with pytest.raises(ValueError, match='before start'):
+        daily.backfill(end, start)
+
+
+def test_backfill_matches_single_day_runs(tmp_path):
+    import numpy as np
+    from datetime import date, timedelta
+
+    import create_daily_transactions as daily
+    from writers import CsvWriter, read_open_items, read_table
+
+    state = daily_state(np.random.default_rng(4))
+    for directory in ['single', 'backfill']:
+        writer = CsvWriter(str(tmp_path / directory))
+        for name in ['properties', 'vendors', 'leases', 'tenants']:
+            writer.write(name, state[name])
+        writer.write('rent_escalations', state['escalations'])
+
+    start, days = date(2025, 3, 1), 30
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        daily.backfill(day, day, str(tmp_path / 'single'))
+    daily.backfill(start, start + timedelta(days=days - 1), str(tmp_path / 'backfill'))
+
+    audit_columns = ['created_at', 'modified_at']
+    for name in daily.DAILY_TABLES:
+        single, bulk = (
+            read_table(str(tmp_path / directory), name).drop(columns=audit_columns, errors='ignore')
+            .sort_values('id', ignore_index=True)
+            for directory in ['single', 'backfill']
+        )
+        assert len(single) > 0
+        pd.testing.assert_frame_equal(single, bulk)
+
+    single, bulk = (read_open_items(str(tmp_path / directory)) for directory in ['single', 'backfill'])
+    assert list(single) == list(bulk) == list(daily.OPEN_ITEM_DATES)
+    for name in single:
+        assert sorted(single[name]['id']) == sorted(bulk[name]['id'])
+
+
+def test_invoices_paid_after_the_as_of_date_stay_open():
+    import numpy as np
+
+    module = load_module()
+    cust = pd.DataFrame([
+        {"id": f"C{i}", "property_id": "P1", "tenant_id": "T1", "amount_due": 100.0, "status": "Paid",
+         "invoice_date": pd.Timestamp("2024-01-01").date(), "due_date": pd.Timestamp("2024-01-10").date(),
+         "payment_date": None}
+        for i in range(200)
+    ])
+    as_of = pd.Timestamp("2024-01-15")
+    receipts = module.generate_receipts(cust, np.random.default_rng(3), as_of=as_of)
+    assert 0 < len(receipts) < len(cust)
+    receipt_date = pd.to_datetime(receipts["receipt_date"])
+    assert (receipt_date <= as_of).all()
+    assert (receipt_date == as_of).sum() < len(cust) - len(receipts)
+
+    cust = module.apply_payment_dates(cust, receipts, "receipt_date")
+    assert (cust["status"] == "Paid").sum() == len(receipts)
+    assert cust.loc[cust["status"] == "Unpaid", "payment_date"].isna().all()
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from faker_pool import FakerPool, random_dates_between
+
+
+def test_faker_pool_is_deterministic_and_order_independent():
+    first = FakerPool(seed=7, size=20)
+    second = FakerPool(seed=7, size=20)
+    first.pool("name")
+    assert list(first.pool("company")) == list(second.pool("company"))
+    assert list(first.pool("name")) == list(second.pool("name"))
+
+    values = first.sample("company", 50, np.random.default_rng(0))
+    assert len(values) == 50
+    assert set(values) <= set(first.pool("company"))
+
+
+def test_faker_pool_disk_cache(tmp_path):
+    pool = FakerPool(seed=7, size=10, cache_dir=str(tmp_path))
+    names = list(pool.pool("name"))
+    assert len(list(tmp_path.glob("name-*.npy"))) == 1
+
+    cached = FakerPool(seed=7, size=10, cache_dir=str(tmp_path))
+    cached._generate = None  # a cache hit must not call Faker
+    assert list(cached.pool("name")) == names
+
+
+def test_faker_pool_rejects_empty_size():
+    with pytest.raises(ValueError):
+        FakerPool(size=0)
+
+
+def test_random_dates_between_bounds():
+    rng = np.random.default_rng(0)
+    start = pd.Series(pd.to_datetime(["2024-01-01", "2024-06-01", "2024-03-05"]))
+    dates = random_dates_between(start, pd.Timestamp("2024-06-01"), rng)
+    assert (dates >= start).all()
+    assert (dates <= pd.Timestamp("2024-06-01")).all()
+    assert dates.iloc[1] == pd.Timestamp("2024-06-01")
+
+    scalar = random_dates_between("2024-01-01", "2024-01-31", rng, size=100)
+    assert len(scalar) == 100
+    assert scalar.between(pd.Timestamp("2024-01-01"), pd.Timestamp("2024-01-31")).all()
@@ -0,0 +1,36 @@
+import importlib.util
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+from ids import binary_ids, from_hex, hex_ids, to_hex
+
+
+def load_module():
+    file_path = Path('scripts/create_synthetic_sample_data.py')
+    spec = importlib.util.spec_from_file_location('synthetic', file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_hex_ids_are_seeded_uuid4_hex():
+    first = hex_ids(1000, np.random.default_rng(42))
+    second = hex_ids(1000, np.random.default_rng(42))
+    assert list(first) == list(second)
+    assert len(set(first)) == 1000
+    assert all(len(value) == 32 for value in first)
+    assert uuid.UUID(first[0]).version == 4
+    assert uuid.UUID(first[0]).hex == first[0]
+
+
+def test_binary_round_trip():
+    compact = binary_ids(100, np.random.default_rng(0))
+    assert compact.dtype == np.dtype("S16")
+    assert (from_hex(to_hex(compact)) == compact).all()
+    assert len(hex_ids(0, np.random.default_rng(0))) == 0
+
+
+def test_module_ids_are_reproducible():
+    assert list(load_module().uids(5)) == list(load_module().uids(5))
@@ -0,0 +1,204 @@
+import io
+import json
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import load_to_postgres as loader
+from writers import DailyPartitionWriter, get_writer
+
+
+class RecordingCursor:
+    """Stands in for a psycopg2 cursor and keeps what COPY would have received."""
+
+    def __init__(self, results=()):
+        self.statements = []
+        self.params = []
+        self.copied = []
+        self.results = list(results)
+        self.rowcount = -1
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+        self.params.append(params)
+
+    def fetchone(self):
+        return self.results.pop(0) if self.results else None
+
+    def fetchall(self):
+        return []
+
+    def copy_expert(self, statement, source, size=8192):
+        chunks = []
+        while True:
+            chunk = source.read(size)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        self.statements.append(statement)
+        self.copied.append(b''.join(chunks))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class RecordingConnection:
+    def __init__(self, results=()):
+        self.cursor_ = RecordingCursor(results)
+        self.commits = 0
+
+    def cursor(self):
+        return self.cursor_
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        pass
+
+
+def receipts():
+    return pd.DataFrame({
+        'id': ['a', 'b', 'c'],
+        'receipt_date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03']),
+        'amount': [1.5, 2.0, 3.25],
+        'payment_method': pd.Categorical(['ACH', 'Check', 'ACH']),
+        'note': ['x', None, 'z'],
+    })
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+def test_copy_table_streams_every_file_with_explicit_types(tmp_path, fmt):
+    get_writer(fmt, str(tmp_path)).write('receipts', receipts())
+    DailyPartitionWriter(str(tmp_path), fmt).write_day(date(2024, 1, 4), {'receipts': receipts().head(1)})
+
+    conn = RecordingConnection()
+    result = loader.copy_table(conn, str(tmp_path), 'receipts', chunk_rows=2)
+
+    statements = conn.cursor_.statements
+    create = statements[1]
+    assert '"id" UUID' in create
+    assert '"receipt_date" DATE' in create
+    assert '"amount" NUMERIC(14, 2)' in create
+    # Columns without a declared type are inferred
+    assert '"note" TEXT' in create
+    assert all(s.startswith('COPY "receipts"') for s in statements[2:4])
+    # Keys and indexes are only built once the rows are in
+    assert 'PRIMARY KEY ("id")' in statements[4]
+    analyze = statements.index('ANALYZE "receipts"')
+    assert all(s.startswith('CREATE INDEX') for s in statements[5:analyze])
+    # The watermark commits with the rows
+    assert statements[-1].startswith('INSERT INTO _load_watermarks')
+    assert conn.commits == 1
+
+    copied = pd.concat(pd.read_csv(io.BytesIO(data)) for data in conn.cursor_.copied)
+    assert copied['id'].tolist() == ['a', 'b', 'c', 'a']
+    assert copied['payment_method'].tolist() == ['ACH', 'Check', 'ACH', 'ACH']
+    assert pd.to_datetime(copied['receipt_date']).dt.date.tolist()[:3] == [
+        date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)
+    ]
+    assert result['rows'] == 4
+
+
+def load_receipts(directory):
+    """Fully load receipts (base table plus 2024-01-04) and return the watermark saved."""
+
+    get_writer('csv', directory).write('receipts', receipts())
+    DailyPartitionWriter(directory, 'csv').write_day(date(2024, 1, 4), {'receipts': receipts().head(1)})
+    conn = RecordingConnection()
+    assert loader.sync_table(conn, directory, 'receipts')['mode'] == 'full'
+    return json.loads(conn.cursor_.params[-1][2])
+
+
+def test_sync_table_upserts_only_new_daily_partitions(tmp_path):
+    watermark = load_receipts(str(tmp_path))
+    DailyPartitionWriter(str(tmp_path), 'csv').write_day(date(2024, 1, 5), {'receipts': receipts().tail(2)})
+
+    conn = RecordingConnection(results=[(watermark,)])
+    result = loader.sync_table(conn, str(tmp_path), 'receipts')
+
+    statements = conn.cursor_.statements
+    assert result['mode'] == 'delta'
+    assert pd.read_csv(io.BytesIO(conn.cursor_.copied[0]))['id'].tolist() == ['b', 'c']
+    assert len(conn.cursor_.copied) == 1
+    assert any('ON CONFLICT ("id") DO UPDATE' in s for s in statements)
+    # The table stays online: it is neither dropped nor pruned
+    assert not any(s.startswith(('DROP', 'DELETE')) for s in statements)
+    assert conn.commits == 1
+
+    # Nothing new: nothing is staged
+    conn = RecordingConnection(results=[(json.loads(conn.cursor_.params[-1][2]),)])
+    assert loader.sync_table(conn, str(tmp_path), 'receipts')['rows'] == 0
+    assert conn.cursor_.copied == []
+
+
+def test_sync_table_resyncs_when_a_loaded_partition_is_rewritten(tmp_path):
+    watermark = load_receipts(str(tmp_path))
+    DailyPartitionWriter(str(tmp_path), 'csv').write_day(date(2024, 1, 4), {'receipts': receipts().tail(1)})
+
+    conn = RecordingConnection(results=[(watermark,)])
+    result = loader.sync_table(conn, str(tmp_path), 'receipts')
+
+    assert result['mode'] == 'sync'
+    assert len(conn.cursor_.copied) == 2
+    assert any(s.startswith('DELETE FROM "receipts"') for s in conn.cursor_.statements)
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.connections = []
+
+    def raw_connection(self):
+        self.connections.append(RecordingConnection())
+        return self.connections[-1]
+
+
+def test_load_tables_loads_referenced_tables_first(tmp_path, monkeypatch):
+    for name in loader.tables:
+        pd.DataFrame({'id': ['a']}).to_csv(tmp_path / f'{name}.csv', index=False)
+    events, running, lock = [], set(), threading.Lock()
+    concurrency = []
+
+    def fake_copy_table(conn, directory, name, manifest, chunk_rows, progress):
+        with lock:
+            running.add(name)
+            concurrency.append(len(running))
+            events.append(('start', name))
+        time.sleep(0.01)
+        with lock:
+            running.discard(name)
+            events.append(('end', name))
+        return {'table': name, 'rows': 1, 'seconds': 0.01, 'index_seconds': 0.0, 'rows_per_s': 100.0}
+
+    monkeypatch.setattr(loader, 'copy_table', fake_copy_table)
+    engine = RecordingEngine()
+    results = loader.load_tables(loader.tables, str(tmp_path), engine=engine, foreign_keys=True, jobs=3,
+                                 stream=io.StringIO())
+
+    assert [result['table'] for result in results] == loader.tables
+    assert max(concurrency) <= 3
+    for name, references in loader.load_dependencies(loader.tables, foreign_keys=True).items():
+        for reference in references:
+            assert events.index(('end', reference)) < events.index(('start', name))
+    # Stale keys are dropped before and the keys between the tables added after the load
+    assert engine.connections[0].cursor_.statements[1].startswith('ALTER TABLE IF EXISTS')
+    assert any('FOREIGN KEY' in s for s in engine.connections[-1].cursor_.statements)
+
+
+def test_foreign_keys_only_reference_loaded_tables():
+    conn = RecordingConnection()
+    added = loader.add_foreign_keys(conn, ['vendors', 'vend_invoices', 'checkreg'])
+
+    statements = conn.cursor_.statements[1:]
+    assert added == len(statements) == 3
+    assert all('REFERENCES "vendors"' in s or 'REFERENCES "vend_invoices"' in s for s in statements)
+
+
+def test_quote_escapes_identifiers():
+    assert loader.quote('we"ird') == '"we""ird"'
@@ -0,0 +1,65 @@
+import importlib.util
+import pandas as pd
+from pathlib import Path
+
+
+def load_module():
+    file_path = Path('scripts/create_synthetic_sample_data.py')
+    spec = importlib.util.spec_from_file_location('synthetic', file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_generate_portfolio_partitions_keep_referential_integrity(tmp_path):
+    module = load_module()
+    module.generate_portfolio(module.CsvWriter(str(tmp_path)), scale=7, partition_size=3, months_out=3)
+
+    tables = {path.stem: pd.read_csv(path) for path in tmp_path.glob('*.csv')}
+    assert len(tables['properties']) == 7
+    assert tables['properties']['property_id'].is_unique
+
+    property_ids = set(tables['properties']['property_id'])
+    for name in ['units', 'tenants', 'leases', 'payment_schedule', 'vend_invoices']:
+        assert set(tables[name]['property_id']) <= property_ids
+
+    assert set(tables['tenants']['unit_id']) <= set(tables['units']['id'])
+    assert set(tables['leases']['tenant_id']) <= set(tables['tenants']['id'])
+    assert set(tables['cust_invoices']['lease_id']) <= set(tables['leases']['id'])
+    assert set(tables['receipts']['invoice_id']) <= set(tables['cust_invoices']['id'])
+    assert set(tables['checkreg']['invoice_id']) <= set(tables['vend_invoices']['id'])
+    assert set(tables['vend_invoices']['vendor_id']) <= set(tables['vendors']['id'])
+    assert tables['gltran']['id'].is_unique
+
+
+def test_generate_partition_without_occupied_units():
+    module = load_module()
+    properties = module.properties_df.head(2).copy()
+    properties['Occupancy'] = 0.0
+    vendors = module.generate_vendors(module.generate_user(), num_vendors=5)
+
+    tables = module.generate_partition(properties, vendors, months_out=3)
+    assert tables['tenants'].empty
+    assert tables['leases'].empty
+    assert tables['cust_invoices'].empty
+    assert not tables['vend_invoices'].empty
+
+
+def test_generate_portfolio_is_identical_for_any_worker_count(tmp_path):
+    # Worker processes unpickle the shard function by module name
+    import create_synthetic_sample_data as module
+
+    audit_columns = ['created_at', 'modified_at']
+    outputs = []
+    for workers in [1, 3]:
+        directory = tmp_path / f'workers-{workers}'
+        module.generate_portfolio(module.CsvWriter(str(directory)), scale=5, partition_size=2, months_out=3, workers=workers)
+        outputs.append({
+            path.stem: pd.read_csv(path).drop(columns=audit_columns, errors='ignore')
+            for path in directory.glob('*.csv')
+        })
+
+    single, sharded = outputs
+    assert single.keys() == sharded.keys()
+    for name in single:
+        pd.testing.assert_frame_equal(single[name], sharded[name])
@@ -1,4 +1,5 @@
 import importlib.util
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -58,3 +59,50 @@ def test_generate_lease_pymnt_sched_escalation():
     assert sched.iloc[12]['pymnt_amt'] == 1100
     assert sched.iloc[24]['pymnt_amt'] == 1210
 
+
+def test_generate_lease_pymnt_sched_free_rent_and_arrears():
+    module = load_module()
+    lease_start = pd.Timestamp('2023-01-01')
+    lease_end = pd.Timestamp('2023-12-31')
+    df = pd.DataFrame([{
+        'id': 'L1',
+        'property_id': 'P1',
+        'unit_id': 'U1',
+        'tenant_id': 'T1',
+        'lease_start': lease_start,
+        'rent_start_date': lease_start,
+        'lease_end': lease_end,
+        'monthly_rent': 1000,
+        'pro_rated_start': False,
+        'payment_timing': 'In Arrears',
+        'free_rent_months': 2,
+    }])
+    sched = module.generate_lease_pymnt_sched(df, months_out=12)
+    assert len(sched) == 10
+    assert sched.iloc[0]['bill_period_start'] == pd.Timestamp('2023-03-01')
+    assert sched.iloc[0]['schd_dt'] == pd.Timestamp('2023-04-01')
+    assert sched.iloc[-1]['bill_period_end'] == pd.Timestamp('2023-12-31')
+    assert set(sched['billing_basis']) == {'Arrears'}
+
+
+def test_lease_pymnt_sched_between_matches_full_schedule():
+    module = load_module()
+    rng = np.random.default_rng(3)
+    properties = module.load_portfolio(3, rng)
+    units = module.generate_units(properties, rng)
+    tenants = module.generate_tenants(properties, units, rng, allow_empty=True)
+    leases = module.generate_leases(properties, tenants, units, rng)
+    escalations = module.generate_rent_escalations(leases, rng)
+
+    full = module.generate_lease_pymnt_sched(leases, months_out=60, escalations=escalations, rng=rng)
+    start, end = pd.Timestamp('2024-02-15'), pd.Timestamp('2025-06-01')
+    expected = full[(full['schd_dt'] >= start) & (full['schd_dt'] <= end)]
+    targeted = module.lease_pymnt_sched_between(leases, escalations, start, end, months_out=60, rng=rng)
+
+    columns = ['lease_id', 'schd_dt', 'pymnt_amt', 'is_prorated', 'bill_period_start']
+    def normalize(df):
+        return df[columns].astype({'lease_id': str}).sort_values(columns[:2]).reset_index(drop=True)
+    assert not expected.empty
+    pd.testing.assert_frame_equal(normalize(targeted), normalize(expected))
+
+    assert module.lease_pymnt_sched_between(leases, escalations, pd.Timestamp('2024-03-02')).empty
@@ -0,0 +1,50 @@
+import pandas as pd
+
+import load_to_postgres
+from pg_schemas import TABLES, drop_foreign_key_sql, foreign_key_sql, key_sql, upsert_sql
+
+
+def test_every_loaded_table_is_declared():
+    assert set(load_to_postgres.tables) <= set(TABLES)
+
+
+def test_keys_and_indexes_use_declared_columns():
+    for name, table in TABLES.items():
+        columns = table['columns']
+        assert set(table['primary_key']) <= set(columns), name
+        for index in table['indexes']:
+            assert set(index) <= set(columns), name
+        for column, (target, target_column) in table['foreign_keys'].items():
+            assert column in columns, name
+            assert TABLES[target]['primary_key'] == [target_column], name
+            assert columns[column] == TABLES[target]['columns'][target_column], name
+
+
+def test_generated_columns_are_declared(tmp_path):
+    import create_synthetic_sample_data as module
+
+    module.generate_portfolio(module.CsvWriter(str(tmp_path)), scale=2, partition_size=2, months_out=3)
+    for name in load_to_postgres.tables:
+        columns = pd.read_csv(tmp_path / f'{name}.csv', nrows=0).columns
+        assert set(columns) <= set(TABLES[name]['columns']), name
+
+
+def test_key_sql():
+    statements = key_sql('checkreg')
+    assert statements[0] == 'ALTER TABLE "checkreg" ADD CONSTRAINT "checkreg_pkey" PRIMARY KEY ("id")'
+    assert 'CREATE INDEX "checkreg_invoice_id_idx" ON "checkreg" ("invoice_id")' in statements
+    assert key_sql('budget') == []
+    # Keys pointing at a reloaded table are dropped along with its own
+    assert 'ALTER TABLE IF EXISTS "gltran" DROP CONSTRAINT IF EXISTS "gltran_vendor_id_fkey"' in drop_foreign_key_sql(['vendors'])
+    assert foreign_key_sql('receipts', referenced=['cust_invoices']) == [
+        'ALTER TABLE "receipts" ADD CONSTRAINT "receipts_invoice_id_fkey" '
+        'FOREIGN KEY ("invoice_id") REFERENCES "cust_invoices" ("id")'
+    ]
+
+
+def test_upsert_sql_only_rewrites_changed_rows():
+    statement = upsert_sql('checkreg', '_stage_checkreg', ['id', 'amount'])
+    assert statement.startswith('INSERT INTO "checkreg" ("id", "amount")')
+    assert 'ON CONFLICT ("id") DO UPDATE SET "amount" = EXCLUDED."amount"' in statement
+    assert statement.endswith('WHERE ("checkreg"."amount") IS DISTINCT FROM (EXCLUDED."amount")')
+    assert upsert_sql('checkreg', '_stage_checkreg', ['id']).endswith('DO NOTHING')
@@ -0,0 +1,103 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from pipeline import Pipeline, Stage, StageCache, content_hash
+from profiling import StageProfiler
+
+
+def _frame(value, rng=None, **params):
+    return pd.DataFrame({'value': [value]})
+
+
+def test_pipeline_rejects_cycles_and_unknown_inputs():
+    with pytest.raises(ValueError, match='cycle'):
+        Pipeline([Stage('a', _frame, ['b']), Stage('b', _frame, ['a'])])
+
+    pipeline = Pipeline([Stage('a', _frame, ['missing'])])
+    with pytest.raises(ValueError, match='unknown input'):
+        pipeline.run(['a'])
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_sibling(rng=None):
+        barrier.wait()
+        return pd.DataFrame({'x': [rng.integers(100)]})
+
+    pipeline = Pipeline([
+        Stage('left', wait_for_sibling),
+        Stage('right', wait_for_sibling),
+        Stage('both', lambda l, r, rng=None: pd.concat([l, r]), ['left', 'right']),
+    ])
+    result = pipeline.run(['both'], threads=2)
+    assert len(result['both']) == 2
+
+
+def test_content_hash_ignores_index_but_not_values():
+    df = pd.DataFrame({'a': [1, 2]})
+    assert content_hash(df) == content_hash(df.set_axis([5, 6]))
+    assert content_hash(df) != content_hash(pd.DataFrame({'a': [1, 3]}))
+
+
+def test_changing_vendor_invoice_parameters_only_reruns_that_subtree(tmp_path):
+    import create_synthetic_sample_data as module
+
+    inputs = {
+        'properties': module.load_portfolio(2, module.partition_rng(1, 0)),
+        'vendors': module.generate_vendors(module.generate_user(rng=module.partition_rng(1, 1)), num_vendors=5),
+        'coa': module.get_coa(),
+    }
+    targets = list(module.PARTITION_TABLES.values())[:-1]
+    cache = StageCache(str(tmp_path))
+
+    def run(pipeline):
+        profiler = StageProfiler()
+        outputs = pipeline.run(targets, inputs, seed=1, cache=cache, profiler=profiler)
+        profiler.close()
+        return outputs, {r['stage'] for r in profiler.records if not r['cached']}
+
+    first, ran = run(module.build_pipeline(months_out=3))
+    assert ran == set(module.build_pipeline().stages)
+
+    again, ran = run(module.build_pipeline(months_out=3))
+    assert ran == set()
+    for node in targets:
+        pd.testing.assert_frame_equal(again[node], first[node])
+
+    _, ran = run(module.build_pipeline(months_out=3, min_vendor_invoices=5, max_vendor_invoices=10))
+    assert ran == {'vend_invoices', 'checkreg', 'gltran'}
+
+
+def test_generate_partition_is_identical_for_any_stage_thread_count():
+    import create_synthetic_sample_data as module
+
+    properties = module.load_portfolio(2, module.partition_rng(7, 0))
+    vendors = module.generate_vendors(module.generate_user(rng=module.partition_rng(7, 1)), num_vendors=5)
+    audit_columns = ['created_at', 'modified_at']
+    serial, threaded = (
+        module.generate_partition(properties, vendors, months_out=3, seed=7, threads=threads)
+        for threads in [1, 4]
+    )
+    for name in serial:
+        pd.testing.assert_frame_equal(
+            serial[name].drop(columns=audit_columns, errors='ignore'),
+            threaded[name].drop(columns=audit_columns, errors='ignore'),
+        )
+
+
+def test_stage_keys_change_with_the_as_of_date():
+    from datetime import date
+
+    import create_synthetic_sample_data as module
+
+    input_keys = {'properties': 'p', 'vendors': 'v', 'coa': 'c'}
+    first, later = (
+        module.build_pipeline(as_of=as_of).keys(seed=1, input_keys=input_keys)
+        for as_of in [date(2025, 1, 1), date(2025, 1, 2)]
+    )
+    assert all(first[name] != later[name] for name in first if name not in input_keys)
+    default = module.build_pipeline().keys(seed=1, input_keys=input_keys)
+    assert default == module.build_pipeline(as_of=module.today).keys(seed=1, input_keys=input_keys)
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+
+import pytest
+
+from profiling import MANIFEST_NAME, StageProfiler, _RssSampler
+
+
+def test_stage_records_time_memory_and_rows(tmp_path):
+    profiler = StageProfiler()
+    with profiler.stage('load', rows_in=3) as stage:
+        time.sleep(0.01)
+        stage.rows_out = 5
+    with profiler.stage('load', rows_in=2) as stage:
+        stage.rows_out = 1
+
+    first = profiler.records[0]
+    assert first['rows_in'] == 3
+    assert first['rows_out'] == 5
+    assert first['wall_s'] >= 0.01
+    assert first['peak_rss_mb'] > 0
+
+    path = profiler.write_manifest(str(tmp_path), parameters={'scale': 3})
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert path == str(tmp_path / MANIFEST_NAME)
+    assert manifest['parameters'] == {'scale': 3}
+    assert manifest['stages'] == [pytest.approx({
+        'stage': 'load',
+        'runs': 2,
+        'cached': 0,
+        'rows_in': 5,
+        'rows_out': 6,
+        'wall_s': manifest['stages'][0]['wall_s'],
+        'cpu_s': manifest['stages'][0]['cpu_s'],
+        'peak_rss_mb': max(r['peak_rss_mb'] for r in manifest['records']),
+        'concurrent': 0,
+    })]
+
+
+def test_rss_sampler_can_be_joined_after_stopping():
+    sampler = _RssSampler(interval=0.001)
+    sampler.start()
+    sampler.stop()
+    # Thread.join() calls Thread._stop(), which the sampler must not shadow
+    sampler.join(timeout=1)
+    assert not sampler.is_alive()
+
+
+def test_concurrent_stages_measure_their_own_thread():
+    profiler = StageProfiler()
+    barrier = threading.Barrier(2)
+
+    def spin(name, seconds):
+        with profiler.stage(name):
+            barrier.wait()
+            deadline = time.thread_time() + seconds
+            while time.thread_time() < deadline:
+                pass
+            barrier.wait()
+
+    threads = [threading.Thread(target=spin, args=(name, 0.05)) for name in ['a', 'b']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with profiler.stage('alone'):
+        pass
+    profiler.close()
+
+    records = {record['stage']: record for record in profiler.records}
+    assert records['a']['concurrent'] and records['b']['concurrent']
+    assert not records['alone']['concurrent']
+    # Each stage counts its own spinning, not the other thread's
+    for name in ['a', 'b']:
+        assert 0.05 <= records[name]['cpu_s'] < 0.09
+        assert records[name]['peak_rss_mb'] > 0
+
+
+def test_stage_is_recorded_when_it_raises():
+    profiler = StageProfiler()
+    with pytest.raises(ValueError):
+        with profiler.stage('broken'):
+            raise ValueError('boom')
+    profiler.close()
+    assert [r['stage'] for r in profiler.records] == ['broken']
+
+
+def test_generate_portfolio_writes_manifest_and_profiles(tmp_path):
+    import create_synthetic_sample_data as module
+
+    output_dir = tmp_path / 'out'
+    profile_dir = tmp_path / 'profiles'
+    module.generate_portfolio(
+        module.CsvWriter(str(output_dir)), scale=3, partition_size=2, months_out=3, profile_dir=str(profile_dir)
+    )
+
+    manifest = json.loads((output_dir / MANIFEST_NAME).read_text())
+    assert manifest['parameters']['partitions'] == 2
+    stages = {s['stage']: s for s in manifest['stages']}
+    for name in ['vendors', 'properties', 'units', 'leases', 'payment_schedule', 'gltran', 'write']:
+        assert name in stages
+    assert stages['properties']['rows_out'] == 3
+    assert stages['units']['runs'] == 2
+    assert stages['units']['rows_out'] == len(module.pd.read_csv(output_dir / 'units.csv'))
+
+    assert (profile_dir / 'gltran-partition-00001.prof').exists()
+    assert (profile_dir / 'vendors.prof').exists()
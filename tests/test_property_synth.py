@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from property_synth import synthesize_properties
+
+
+LISTING = pd.read_excel('data/raw/synthetic/Enhanced_Property_Listing.xlsx')
+
+
+def test_synthesize_properties_shape_and_domains():
+    props = synthesize_properties(LISTING, 2000, np.random.default_rng(0))
+    assert len(props) == 2000
+    assert list(props.columns) == list(LISTING.columns) + ['property_id']
+    assert props['property_id'].is_unique
+    assert set(props['Type']) <= set(LISTING['Type'])
+    assert set(zip(props['Type'], props['Subtype'])) <= set(zip(LISTING['Type'], LISTING['Subtype']))
+    assert props['Occupancy'].between(0, 1).all()
+    assert (props['Units'] >= 1).all()
+    assert (props['Last Renovated'] >= props['Year Built']).all()
+
+
+def test_synthesize_properties_follows_listing_marginals():
+    props = synthesize_properties(LISTING, 20000, np.random.default_rng(1))
+    assert props['Units'].median() == pytest.approx(LISTING['Units'].median(), rel=0.3)
+    assert props['Occupancy'].mean() == pytest.approx(LISTING['Occupancy'].mean(), abs=0.05)
+    assert props['Year Built'].median() == pytest.approx(LISTING['Year Built'].median(), abs=5)
+    shares = props['Type'].value_counts(normalize=True)
+    expected = LISTING['Type'].value_counts(normalize=True)
+    assert shares['Office'] == pytest.approx(expected['Office'], abs=0.03)
+
+
+def test_synthesize_properties_is_seeded():
+    first = synthesize_properties(LISTING, 10, np.random.default_rng(5))
+    second = synthesize_properties(LISTING, 10, np.random.default_rng(5))
+    pd.testing.assert_frame_equal(first, second)
+    with pytest.raises(ValueError):
+        synthesize_properties(LISTING, -1, np.random.default_rng(5))
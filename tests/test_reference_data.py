@@ -0,0 +1,36 @@
+import os
+
+import pandas as pd
+
+from reference_data import read_cached
+
+
+def test_read_cached_reuses_and_invalidates_binary_copy(tmp_path):
+    source = tmp_path / "coa.csv"
+    cache_dir = tmp_path / "cache"
+    source.write_text("acct_number,acct_name\n1000,Cash\n")
+    calls = []
+
+    def reader(path):
+        calls.append(path)
+        return pd.read_csv(path)
+
+    first = read_cached(str(source), reader, str(cache_dir))
+    second = read_cached(str(source), reader, str(cache_dir))
+    pd.testing.assert_frame_equal(first, second)
+    assert len(calls) == 1
+
+    source.write_text("acct_number,acct_name\n1000,Cash\n2000,Accounts Payable\n")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    updated = read_cached(str(source), reader, str(cache_dir))
+    assert len(updated) == 2
+    assert len(calls) == 2
+    assert len(list(cache_dir.glob("coa.csv-*.pkl"))) == 1
+
+
+def test_read_cached_disabled_with_empty_cache_dir(tmp_path):
+    source = tmp_path / "coa.csv"
+    source.write_text("acct_number,acct_name\n1000,Cash\n")
+    assert len(read_cached(str(source), pd.read_csv, "")) == 1
+    assert list(tmp_path.iterdir()) == [source]
@@ -0,0 +1,50 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from schemas import SCHEMAS, apply_schema
+
+
+def test_apply_schema_casts_registered_columns():
+    df = pd.DataFrame({
+        'id': ['a', 'b'],
+        'property_id': ['p1', 'p1'],
+        'receipt_date': [date(2024, 1, 1), None],
+        'payment_method': ['ACH', 'Check'],
+        'amount': [1.5, 2.0],
+        'note': ['x', 'y'],
+    })
+    result = apply_schema(df, 'receipts')
+
+    assert result['id'].dtype == 'string[pyarrow]'
+    assert isinstance(result['property_id'].dtype, pd.CategoricalDtype)
+    assert result['receipt_date'].dtype == 'datetime64[ns]'
+    assert result['receipt_date'].isna().tolist() == [False, True]
+    assert isinstance(result['payment_method'].dtype, pd.CategoricalDtype)
+    assert result['note'].tolist() == ['x', 'y']
+    # The input frame is left as it was
+    assert df['receipt_date'].iloc[0] == date(2024, 1, 1)
+
+
+def test_apply_schema_unknown_table():
+    with pytest.raises(KeyError):
+        apply_schema(pd.DataFrame(), 'budget')
+
+
+def test_generated_tables_follow_schema():
+    import create_synthetic_sample_data as module
+
+    properties = module.properties_df.head(3).copy()
+    vendors = module.generate_vendors(module.generate_user(count=2), num_vendors=5)
+    tables = module.generate_partition(properties, vendors, months_out=3)
+
+    for name, schema in SCHEMAS.items():
+        df = tables[name]
+        for column, kind in schema.items():
+            if column not in df.columns:
+                continue
+            if kind == 'datetime':
+                assert df[column].dtype == 'datetime64[ns]', (name, column)
+            elif kind in ('key', 'category'):
+                assert isinstance(df[column].dtype, pd.CategoricalDtype), (name, column)
@@ -0,0 +1,93 @@
+import io
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+import create_synthetic_sample_data as module
+from simulator import JsonLinesSink, PortfolioSimulator, VirtualClock
+
+
+def portfolio_state(seed=11):
+    rng = np.random.default_rng(seed)
+    properties = module.load_portfolio(2, rng)
+    units = module.generate_units(properties, rng)
+    tenants = module.generate_tenants(properties, units, rng, allow_empty=True)
+    leases = module.generate_leases(properties, tenants, units, rng)
+    return {
+        'properties': properties,
+        'vendors': module.generate_vendors(module.generate_user(rng=rng), num_vendors=5, rng=rng),
+        'leases': leases,
+        'tenants': tenants,
+        'escalations': module.generate_rent_escalations(leases, rng),
+    }
+
+
+def test_virtual_clock_keeps_pace_without_drift():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(round(seconds, 3))
+        now[0] += seconds + 0.1  # every tick overruns a little
+
+    clock = VirtualClock(date(2025, 1, 30), speed=2, sleep=sleep, monotonic=lambda: now[0])
+    assert list(clock.ticks(3)) == [date(2025, 1, 30), date(2025, 1, 31), date(2025, 2, 1)]
+    assert sleeps == [0.5, 0.4]
+
+
+def test_simulator_emits_payments_on_their_payment_date():
+    simulator = PortfolioSimulator(portfolio_state(), rng=np.random.default_rng(1),
+                                   min_vendor_invoices=1, max_vendor_invoices=2)
+    start = date(2025, 3, 1)
+    emitted = {}
+    for offset in range(40):
+        day = start + timedelta(days=offset)
+        emitted[day] = simulator.tick(day)
+
+    for day, tables in emitted.items():
+        assert (pd.to_datetime(tables['receipts']['receipt_date']) == pd.Timestamp(day)).all()
+        assert (pd.to_datetime(tables['checkreg']['check_date']) == pd.Timestamp(day)).all()
+        assert (pd.to_datetime(tables['gltran']['date']) == pd.Timestamp(day)).all()
+        assert (pd.to_datetime(tables['vend_invoices']['invoice_date']) == pd.Timestamp(day)).all()
+
+    checks = pd.concat([t['checkreg'] for t in emitted.values()])
+    assert not checks.empty
+    posted = set(pd.concat([t['gltran'] for t in emitted.values()])['source_document'].astype(str))
+    assert set(checks['id'].astype(str)) <= posted
+    assert simulator.open_items()['checkreg'] > 0
+
+
+def test_simulator_settles_open_invoices_after_the_real_date():
+    simulator = PortfolioSimulator(portfolio_state(), rng=np.random.default_rng(2),
+                                   min_vendor_invoices=1, max_vendor_invoices=2)
+    start = date.today() + timedelta(days=30)
+    issued, emitted = {}, {}
+    for offset in range(60):
+        day = start + timedelta(days=offset)
+        emitted[day] = tables = simulator.tick(day)
+        for name in ['cust_invoices', 'vend_invoices']:
+            assert (tables[name]['status'] == 'Unpaid').all()
+            issued.update(dict.fromkeys(tables[name]['id'], day))
+        for name in ['checkreg', 'receipts']:
+            assert all(issued[invoice] < day for invoice in tables[name]['invoice_id'])
+
+    payments = {name: pd.concat([t[name] for t in emitted.values()]) for name in ['checkreg', 'receipts']}
+    gltran = pd.concat([t['gltran'] for t in emitted.values()])
+    assert not payments['checkreg'].empty and not payments['receipts'].empty
+    posted = set(gltran['source_document'].astype(str))
+    for frame in payments.values():
+        assert set(frame['id'].astype(str)) <= posted
+        assert set(frame['invoice_id'].astype(str)) <= posted
+
+
+def test_json_lines_sink_writes_one_document_per_row():
+    stream = io.StringIO()
+    JsonLinesSink(stream).emit(date(2025, 3, 1), {
+        'receipts': pd.DataFrame({'id': ['r1', 'r2'], 'receipt_date': pd.to_datetime(['2025-03-01'] * 2)}),
+        'gltran': pd.DataFrame({'id': []}),
+    })
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line['record']['id'] for line in lines] == ['r1', 'r2']
+    assert lines[0]['table'] == 'receipts' and lines[0]['day'] == '2025-03-01'
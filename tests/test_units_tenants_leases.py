@@ -0,0 +1,41 @@
+import importlib.util
+import pandas as pd
+from pathlib import Path
+
+
+def load_module():
+    file_path = Path('scripts/create_synthetic_sample_data.py')
+    spec = importlib.util.spec_from_file_location('synthetic', file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_generate_units_exact_occupancy():
+    module = load_module()
+    properties = module.properties_df.head(5).copy()
+    units = module.generate_units(properties)
+    assert len(units) == properties['Units'].sum()
+    assert units['id'].is_unique
+
+    occupied = units[units['occupancy_status'] == 'Occupied'].groupby('property_id').size()
+    expected = (properties['Occupancy'] * properties['Units']).round().astype(int)
+    expected.index = properties['property_id']
+    assert occupied.reindex(expected.index, fill_value=0).tolist() == expected.tolist()
+    assert units.loc[units['occupancy_status'] == 'Occupied', 'last_vacated'].notna().all()
+    assert units.loc[units['occupancy_status'] == 'Vacant', 'last_vacated'].isna().all()
+
+
+def test_generate_tenants_and_leases_cover_occupied_units():
+    module = load_module()
+    properties = module.properties_df.head(5).copy()
+    units = module.generate_units(properties)
+    tenants = module.generate_tenants(properties, units)
+    leases = module.generate_leases(properties, tenants, units)
+
+    occupied = units[units['occupancy_status'] == 'Occupied']
+    assert set(tenants['unit_id']) == set(occupied['id'])
+    assert set(leases['unit_id']) == set(occupied['id'])
+    assert set(leases['tenant_id']) <= set(tenants['id'])
+    assert (pd.to_datetime(leases['rent_start_date']) >= pd.to_datetime(leases['lease_start'])).all()
+    assert leases['escalation_rate'].notna().eq(leases['escalation_type'] == 'Fixed %').all()
@@ -0,0 +1,125 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from writers import (
+    CsvWriter,
+    DailyPartitionWriter,
+    ParquetWriter,
+    get_writer,
+    read_daily_manifest,
+    read_open_items,
+    read_table,
+    table_format,
+)
+
+
+def sample_receipts():
+    return pd.DataFrame({
+        'id': ['a', 'b', 'c'],
+        'property_id': ['p1', 'p2', 'p1'],
+        'receipt_date': [date(2023, 5, 1), date(2024, 1, 31), date(2024, 2, 1)],
+        'amount': [100.5, 200.0, 300.25],
+        'cleared': [True, False, True],
+    })
+
+
+def test_parquet_writer_partitions_and_preserves_types(tmp_path):
+    writer = ParquetWriter(str(tmp_path), partition_by=['property_id', 'year'], compression='zstd')
+    df = sample_receipts()
+    writer.write('receipts', df)
+
+    assert (tmp_path / 'receipts' / 'property_id=p1' / 'year=2024').is_dir()
+    assert table_format(str(tmp_path), 'receipts') == 'parquet'
+
+    result = read_table(str(tmp_path), 'receipts').sort_values('id').reset_index(drop=True)
+    assert list(result.columns) == list(df.columns)
+    assert result['receipt_date'].tolist() == df['receipt_date'].tolist()
+    assert result['cleared'].dtype == bool
+    assert result['amount'].tolist() == df['amount'].tolist()
+
+
+def test_parquet_append_follows_existing_layout(tmp_path):
+    ParquetWriter(str(tmp_path), partition_by=['year']).write('receipts', sample_receipts())
+    # A writer without partitioning appends into the table's existing partitions
+    ParquetWriter(str(tmp_path)).write('receipts', sample_receipts().assign(id=['d', 'e', 'f']), append=True)
+
+    assert not list((tmp_path / 'receipts').glob('*.parquet'))
+    assert len(list((tmp_path / 'receipts' / 'year=2024').glob('*.parquet'))) == 2
+    assert len(read_table(str(tmp_path), 'receipts')) == 6
+
+    ParquetWriter(str(tmp_path)).write('receipts', sample_receipts())
+    assert len(read_table(str(tmp_path), 'receipts')) == 3
+
+
+def test_csv_writer_appends_in_file_column_order(tmp_path):
+    writer = get_writer('csv', str(tmp_path))
+    df = sample_receipts()
+    writer.write('receipts', df)
+    writer.write('receipts', df[df.columns[::-1]], append=True)
+
+    result = read_table(str(tmp_path), 'receipts', parse_dates=['receipt_date'])
+    assert len(result) == 6
+    assert result['id'].tolist() == ['a', 'b', 'c'] * 2
+    assert str(result['receipt_date'].dtype).startswith('datetime64')
+
+
+def test_writer_rejects_unknown_options(tmp_path):
+    with pytest.raises(ValueError):
+        get_writer('xlsx', str(tmp_path))
+    with pytest.raises(ValueError):
+        ParquetWriter(str(tmp_path), partition_by=['month'])
+    with pytest.raises(FileNotFoundError):
+        read_table(str(tmp_path), 'receipts')
+    assert isinstance(get_writer('csv', str(tmp_path)), CsvWriter)
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+def test_daily_partitions_append_and_replace_days(tmp_path, fmt):
+    get_writer(fmt, str(tmp_path)).write('receipts', sample_receipts())
+    daily = DailyPartitionWriter(str(tmp_path), fmt)
+    day_rows = sample_receipts().assign(id=['d', 'e', 'f'])
+
+    daily.write_day(date(2024, 3, 1), {'receipts': day_rows.head(1), 'gltran': day_rows.iloc[:0]})
+    snapshot = read_daily_manifest(str(tmp_path))
+    daily.write_day(date(2024, 3, 2), {'receipts': day_rows.iloc[1:2]})
+    # Re-running a day replaces its partition
+    daily.write_day(date(2024, 3, 2), {'receipts': day_rows.iloc[1:3]})
+
+    assert sorted(read_table(str(tmp_path), 'receipts')['id']) == ['a', 'b', 'c', 'd', 'e', 'f']
+    assert sorted(read_table(str(tmp_path), 'receipts', manifest=snapshot)['id']) == ['a', 'b', 'c', 'd']
+    assert len(list((tmp_path / '_daily' / 'receipts' / 'date=2024-03-02').iterdir())) == 1
+
+
+def test_daily_partitions_ignore_uncommitted_files(tmp_path):
+    daily = DailyPartitionWriter(str(tmp_path))
+    daily.write_day(date(2024, 3, 1), {'receipts': sample_receipts()})
+
+    # A run that crashed before committing leaves files the manifest does not list
+    stray = tmp_path / '_daily' / 'receipts' / 'date=2024-03-02' / 'part-00002.csv'
+    stray.parent.mkdir(parents=True)
+    sample_receipts().to_csv(stray, index=False)
+
+    assert read_daily_manifest(str(tmp_path))['version'] == 1
+    assert len(read_table(str(tmp_path), 'receipts')) == 3
+    with pytest.raises(FileNotFoundError):
+        read_table(str(tmp_path), 'gltran')
+
+
+def test_daily_open_items_are_committed_with_the_days(tmp_path):
+    daily = DailyPartitionWriter(str(tmp_path))
+    daily.write_days({date(2024, 3, 1): {'receipts': sample_receipts().head(1)}},
+                     open_items={'receipts': sample_receipts().iloc[1:], 'gltran': sample_receipts().iloc[:0]})
+    assert list(read_open_items(str(tmp_path))) == ['receipts']
+    assert list(read_open_items(str(tmp_path))['receipts']['id']) == ['b', 'c']
+    # Open items are not part of the table
+    assert list(read_table(str(tmp_path), 'receipts')['id']) == ['a']
+
+    # Days written without open items keep the committed ones
+    daily.write_day(date(2024, 3, 2), {'receipts': sample_receipts().iloc[1:2]})
+    assert len(read_open_items(str(tmp_path))['receipts']) == 2
+
+    daily.write_days({date(2024, 3, 3): {'receipts': sample_receipts().iloc[2:]}}, open_items={})
+    assert read_open_items(str(tmp_path)) == {}
+    assert not list((tmp_path / '_daily' / '_open' / 'receipts').iterdir())